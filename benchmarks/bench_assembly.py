@@ -0,0 +1,47 @@
+"""
+Benchmark of sub-assemblies.
+
+Re-evaluates a tree of 4^5 leaves after changing one of them: only the path
+from the leaf to the top is evaluated again. Then samples the max of 20
+contributors a million times.
+
+    python benchmarks/bench_assembly.py
+"""
+
+import time
+
+import dimstack as ds
+
+DEPTH = 5
+N = 10**6
+
+
+def tree(depth):
+    leaves = [ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.01), name=f"{i}").review() for i in range(4**depth)]
+    level = [ds.assembly.SubAssembly(dims=leaves[i * 4 : i * 4 + 4]) for i in range(4 ** (depth - 1))]
+    while len(level) > 1:
+        level = [ds.assembly.SubAssembly(dims=level[i * 4 : i * 4 + 4]) for i in range(len(level) // 4)]
+    return leaves, level[0]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    leaves, top = tree(DEPTH)
+    t_first = timed(top.evaluate)
+    leaves[0].dim.nominal = 1.001
+    t_again = timed(top.evaluate)
+    print(f"{4**DEPTH} leaves")
+    print(f"first evaluation:   {t_first * 1e3:10.3f} ms")
+    print(f"after one change:   {t_again * 1e3:10.3f} ms")
+
+    dims = [
+        ds.dim.Basic(nom=10 + i * 0.001, tol=ds.tol.Bilateral.symmetric(0.03), name=f"{i}").review() for i in range(20)
+    ]
+    t_max = timed(ds.assembly.Max(dims=dims).sample, N, 0)
+    print(f"{N} trials of the max of 20")
+    print(f"sample:             {t_max * 1e3:10.3f} ms")
@@ -0,0 +1,39 @@
+"""
+Latency of cheap `calc.aevaluate` requests while Monte Carlo simulations run.
+
+    python benchmarks/bench_async.py
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+import dimstack as ds
+
+
+def stack(n):
+    return ds.dim.ReviewedStack(
+        name="stack",
+        dims=[ds.dim.Basic(nom=i + 1, tol=ds.tol.Bilateral.symmetric(0.1)).review() for i in range(n)],
+    )
+
+
+async def main():
+    heavy = [
+        asyncio.create_task(ds.calc.aevaluate(stack(20), ds.calc.MonteCarlo, n=1000000, seed=seed)) for seed in range(3)
+    ]
+    latencies = []
+    small = stack(3)
+    while not all(task.done() for task in heavy):
+        start = time.perf_counter()
+        await ds.calc.aevaluate(small, ds.calc.RSS)
+        latencies.append(time.perf_counter() - start)
+    await asyncio.gather(*heavy)
+    print(f"{len(latencies)} RSS requests during 3 Monte Carlo simulations of 10^6 trials")
+    for q in (50, 90, 99):
+        print(f"p{q} latency:  {np.percentile(latencies, q) * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
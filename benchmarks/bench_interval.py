@@ -0,0 +1,26 @@
+"""
+Benchmark of `interval.worst_case` on a nonlinear closure of 60 contributors.
+
+    python benchmarks/bench_interval.py
+"""
+
+import time
+
+import numpy as np
+
+from dimstack.interval import worst_case
+
+N = 60
+
+
+if __name__ == "__main__":
+    w = np.random.default_rng(0).normal(size=N)
+
+    def func(x):
+        return sum(w[i] * x[i] for i in range(N)) + x[0] * x[1] - x[5] ** 2
+
+    start = time.perf_counter()
+    result = worst_case(func, np.ones(N), np.ones(N) * 1.1)
+    elapsed = time.perf_counter() - start
+    print(f"{N} contributors")
+    print(f"worst_case:  {elapsed:8.3f} s  ([{result.lower:.6f}, {result.upper:.6f}], tight: {result.tight})")
@@ -0,0 +1,86 @@
+"""
+Benchmark of the `kernels` backends against the Python loops they replace.
+
+    uv run cythonize -i src/dimstack/_ckernels.pyx   # optional, for the compiled backend
+    python benchmarks/bench_kernels.py
+"""
+
+import math
+import time
+
+import numpy as np
+
+import dimstack as ds
+from dimstack import _npkernels
+
+N = 10**5
+STACKS = 5000
+DIMS = 20
+
+
+def python_reduce(dir, median, half, a):
+    nominal = sum([d * m * s for d, m, s in zip(dir, median, a)])
+    t_wc = sum([abs(h * s) for h, s in zip(half, a)])
+    squares = 0
+    for h, s in zip(half, a):
+        squares += (h * s) * (h * s)
+    return nominal, t_wc, math.sqrt(squares)
+
+
+def timed(func, *args, repeat=5):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name, times):
+    reference = times[0]
+    print(name)
+    for label, t in zip(["python", "numpy", ds.kernels.BACKEND], times):
+        print(f"  {label:8s} {t * 1e3:10.3f} ms  ({reference / t:6.1f}x)")
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    columns = (rng.choice([-1.0, 1.0], N), rng.normal(0, 10, N), rng.uniform(0, 0.2, N), rng.uniform(0.5, 2, N))
+    lists = [c.tolist() for c in columns]
+    print(f"backend: {ds.kernels.BACKEND}")
+
+    report(
+        f"reduce of {N} dimensions",
+        [
+            timed(python_reduce, *lists),
+            timed(_npkernels.reduce, *columns),
+            timed(ds.kernels.reduce, *columns),
+        ],
+    )
+
+    offsets = np.arange(0, STACKS * DIMS + 1, DIMS)
+    segments = [c[: STACKS * DIMS] for c in columns]
+    segment_lists = [c.tolist() for c in segments]
+    report(
+        f"segment_reduce of {STACKS} stacks of {DIMS} dimensions",
+        [
+            timed(lambda: [python_reduce(*(c[i : i + DIMS] for c in segment_lists)) for i in offsets[:-1]]),
+            timed(_npkernels.segment_reduce, *segments, offsets),
+            timed(ds.kernels.segment_reduce, *segments, offsets),
+        ],
+    )
+
+    samples = rng.normal(size=N)
+
+    def python_accumulate(out, a, x):
+        for i in range(len(out)):
+            out[i] += a * x[i]
+
+    report(
+        f"accumulate of {N} trials",
+        [
+            timed(python_accumulate, [0.0] * N, 1.5, samples.tolist(), repeat=1),
+            timed(_npkernels.accumulate, np.zeros(N), 1.5, samples),
+            timed(ds.kernels.accumulate, np.zeros(N), 1.5, samples),
+        ],
+    )
@@ -0,0 +1,55 @@
+"""
+Memory footprint of the core objects.
+
+Builds N reviewed dimensions (each a `Basic` with a `Bilateral` tolerance and a
+`Normal` distribution), as a scenario family does, and reports the memory
+allocated per object.
+
+    python benchmarks/bench_memory.py
+
+On CPython 3.11, with per-instance `__dict__`s (before) and with `__slots__`
+and interned tolerances (after), in bytes per object:
+
+    Bilateral:                              144.0 -> 8.0
+    Basic + Bilateral:                      332.0 -> 148.0
+    Basic + Bilateral + Reviewed + Normal:  564.1 -> 300.0
+"""
+
+import gc
+import tracemalloc
+
+import dimstack as ds
+
+N = 10**5
+
+
+def measure(build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / N
+
+
+def tolerances():
+    return [ds.tol.Bilateral.symmetric(0.01 * (i % 10)) for i in range(N)]
+
+
+def basics():
+    return [ds.dim.Basic(nom=float(i), tol=ds.tol.Bilateral.symmetric(0.01 * (i % 10))) for i in range(N)]
+
+
+def reviewed():
+    return [
+        ds.dim.Basic(nom=float(i), tol=ds.tol.Bilateral.symmetric(0.01 * (i % 10))).review().assume_normal_dist(3)
+        for i in range(N)
+    ]
+
+
+if __name__ == "__main__":
+    print(f"{N} objects")
+    print(f"Bilateral:                              {measure(tolerances):8.1f} bytes / tolerance")
+    print(f"Basic + Bilateral:                      {measure(basics):8.1f} bytes / dimension")
+    print(f"Basic + Bilateral + Reviewed + Normal:  {measure(reviewed):8.1f} bytes / dimension")
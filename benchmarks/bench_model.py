@@ -0,0 +1,41 @@
+"""
+Benchmark of the analyses of a `model.Model` of 500 requirements sharing 5000 dimensions.
+
+    python benchmarks/bench_model.py
+"""
+
+import time
+
+import numpy as np
+
+import dimstack as ds
+
+DIMS = 5000
+REQUIREMENTS = 500
+
+
+def large_model(seed=0):
+    rng = np.random.default_rng(seed)
+    pool = [
+        ds.dim.Basic(nom=1 + i % 7, tol=ds.tol.Bilateral.symmetric(0.01), name=f"{i}").review().assume_normal_dist(3)
+        for i in range(DIMS)
+    ]
+    model = ds.model.Model()
+    for i in range(REQUIREMENTS):
+        dims = [pool[j] for j in rng.choice(len(pool), 30, replace=False)]
+        model.add(ds.dim.ReviewedStack(name=f"{i}", dims=dims), LL=0, UL=1000)
+    return model
+
+
+if __name__ == "__main__":
+    model = large_model()
+    print(f"{REQUIREMENTS} requirements, {DIMS} dimensions")
+    for name, analysis in [
+        ("WC", model.WC),
+        ("RSS", model.RSS),
+        ("SixSigma", model.SixSigma),
+        ("MonteCarlo", lambda: model.MonteCarlo(n=1000, seed=0)),
+    ]:
+        start = time.perf_counter()
+        analysis()
+        print(f"{name:12s} {(time.perf_counter() - start) * 1e3:10.3f} ms")
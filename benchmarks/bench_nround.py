@@ -0,0 +1,40 @@
+"""
+Benchmark of `utils.nround` on a large array against rounding each value with `Decimal`.
+
+    python benchmarks/bench_nround.py
+"""
+
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+from dimstack.utils import nround
+
+N = 10**6
+
+
+def decimal_nround(number, ndigits=5):
+    exp = Decimal("1.{}".format(ndigits * "0")) if ndigits else Decimal(1)
+    return type(number)(Decimal(number).quantize(exp, ROUND_HALF_UP))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    values = np.random.default_rng(0).normal(0, 100, N)
+
+    reference, t_decimal = timed(lambda x: np.array([decimal_nround(v) for v in x.tolist()]), values)
+    scalars, t_scalar = timed(lambda x: np.array([nround(v) for v in x.tolist()]), values)
+    vectorized, t_array = timed(nround, values)
+
+    assert np.array_equal(reference, scalars)
+    assert np.array_equal(reference, vectorized)
+    print(f"{N} values")
+    print(f"Decimal per value:  {t_decimal:8.3f} s")
+    print(f"nround per value:   {t_scalar:8.3f} s  ({t_decimal / t_scalar:6.1f}x)")
+    print(f"nround on array:    {t_array:8.3f} s  ({t_decimal / t_array:6.1f}x)")
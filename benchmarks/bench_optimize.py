@@ -0,0 +1,46 @@
+"""
+Benchmark of `optimize.center` on a model of 10 requirements sharing 100 contributors.
+
+    python benchmarks/bench_optimize.py
+"""
+
+import time
+
+import numpy as np
+
+import dimstack as ds
+
+CONTRIBUTORS = 100
+REQUIREMENTS = 10
+
+
+def large_model(seed=0):
+    rng = np.random.default_rng(seed)
+    dims = []
+    for i in range(CONTRIBUTORS):
+        dim = ds.dim.Basic(
+            nom=rng.choice([-1, 1]) * rng.uniform(1, 10),
+            tol=ds.tol.Bilateral.symmetric(rng.uniform(0.01, 0.05)),
+            name=f"d{i}",
+        )
+        dims.append(ds.dim.Reviewed(dim).assume_normal_dist_shifted(3, rng.uniform(-0.5, 0.5)))
+    model = ds.model.Model()
+    for r in range(REQUIREMENTS):
+        stack = [dims[i] for i in rng.choice(CONTRIBUTORS, 20, replace=False)]
+        nominal = sum(rdim.dim.dir * rdim.dim.nominal for rdim in stack)
+        model.add(ds.dim.ReviewedStack(name=f"r{r}", dims=stack), nominal - 0.08, nominal + 0.08)
+    return model
+
+
+if __name__ == "__main__":
+    model = large_model()
+    adjustable = {
+        rdim: sorted([rdim.dim.dir * rdim.dim.nominal * 0.99, rdim.dim.dir * rdim.dim.nominal * 1.01])
+        for rdim in model.dims
+    }
+    print(f"{len(adjustable)} adjustable nominals, {REQUIREMENTS} requirements")
+    for objective in ("yield", "ppm"):
+        start = time.perf_counter()
+        result = ds.optimize.center(model, adjustable, objective=objective)
+        elapsed = time.perf_counter() - start
+        print(f"center ({objective}):  {elapsed:8.3f} s  (joint yield {result.joint_yield_probability:.6f})")
@@ -0,0 +1,37 @@
+"""
+Benchmark of `pareto.Explorer.evolve` on a stack of 40 contributors.
+
+    python benchmarks/bench_pareto.py
+"""
+
+import time
+
+import numpy as np
+
+import dimstack as ds
+
+CONTRIBUTORS = 40
+
+
+def explorer(contributors, limit=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    dims = []
+    for i in range(contributors):
+        dim = ds.dim.Basic(
+            nom=rng.choice([-1, 1]) * rng.uniform(1, 10), tol=ds.tol.Bilateral.symmetric(0.05), name=f"d{i}"
+        )
+        dims.append(ds.dim.Reviewed(dim).assume_normal_dist(3))
+    rstack = ds.dim.ReviewedStack(name="gap", dims=dims)
+    nominal = sum(rdim.dim.dir * rdim.dim.nominal for rdim in rstack.dims)
+    costs = {rdim: ds.pareto.reciprocal(1, 0.01 * (i % 3 + 1)) for i, rdim in enumerate(rstack.dims)}
+    bounds = {rdim: (0.005, 0.1) for rdim in rstack.dims}
+    return ds.pareto.Explorer(rstack, nominal - limit, nominal + limit, costs, bounds)
+
+
+if __name__ == "__main__":
+    exp = explorer(CONTRIBUTORS)
+    start = time.perf_counter()
+    front = exp.evolve(population=4096, generations=30, seed=0)
+    elapsed = time.perf_counter() - start
+    print(f"{CONTRIBUTORS} contributors, population 4096, 30 generations")
+    print(f"evolve:  {elapsed:8.3f} s  ({len(front.tolerances)} designs on the front)")
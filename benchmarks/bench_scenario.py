@@ -0,0 +1,39 @@
+"""
+Benchmark of `scenario.Scenarios.evaluate` on a grid of ten thousand scenarios.
+
+    python benchmarks/bench_scenario.py
+"""
+
+import time
+
+import numpy as np
+
+import dimstack as ds
+
+LEVELS = 22
+
+
+def stack():
+    d1 = ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.1), name="housing")
+    d2 = ds.dim.Basic(nom=-5, tol=ds.tol.Bilateral.unequal(0.05, -0.02), name="shaft")
+    d3 = ds.dim.Basic(nom=-4.9, tol=ds.tol.Bilateral.symmetric(0.04), a=0.5, name="spacer")
+    return ds.dim.ReviewedStack(
+        name="gap",
+        dims=[ds.dim.Reviewed(d1), ds.dim.Reviewed(d2), ds.dim.Reviewed(d3, ds.dist.Uniform(-5.0, -4.8))],
+    )
+
+
+if __name__ == "__main__":
+    base = stack()
+    scenarios = ds.scenario.Scenarios(base)
+    tols = [ds.tol.Bilateral.symmetric(t) for t in np.linspace(0.01, 0.2, LEVELS)]
+    for i, rdim in enumerate(base.dims[:2]):
+        scenarios.vary(f"tol {i}", rdim, tols)
+    spacers = {str(t): {"tolerance": t, "distribution": ds.dist.Uniform(-4.9 - t.upper, -4.9 + t.upper)} for t in tols}
+    scenarios.vary("tol 2", base.dims[2], spacers)
+
+    start = time.perf_counter()
+    results = scenarios.evaluate(LL=0.05, UL=0.35)
+    elapsed = time.perf_counter() - start
+    print(f"{scenarios.size} scenarios")
+    print(f"evaluate:  {elapsed:8.3f} s  ({len(results)} results)")
@@ -0,0 +1,29 @@
+"""
+Benchmark of `selective.assemble` on ten million parts of each kind.
+
+    python benchmarks/bench_selective.py
+"""
+
+import time
+
+import dimstack as ds
+
+N = 10**7
+
+
+def spindle():
+    bore = ds.dim.Reviewed(ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.03), name="bore"))
+    shaft = ds.dim.Reviewed(ds.dim.Basic(nom=-9.98, tol=ds.tol.Bilateral.symmetric(0.03), name="shaft"))
+    spacer = ds.dim.Reviewed(ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.003), name="spacer"))
+    for rdim in (bore, shaft, spacer):
+        rdim.assume_normal_dist(3)
+    return ds.dim.ReviewedStack(name="spindle", dims=[bore, shaft, spacer]), bore, shaft
+
+
+if __name__ == "__main__":
+    stack, bore, shaft = spindle()
+    start = time.perf_counter()
+    result = ds.selective.assemble(stack, [bore, shaft], LL=1.0, UL=1.04, bins=4, n=N, seed=0)
+    elapsed = time.perf_counter() - start
+    print(f"{N} parts, 4 bins")
+    print(f"assemble:  {elapsed:8.3f} s  ({result.assemblies} assemblies)")
@@ -0,0 +1,34 @@
+"""
+Benchmark of `model.sample_block` for GD&T tolerances against bilateral ones.
+
+    python benchmarks/bench_tolerance.py
+"""
+
+import time
+
+import numpy as np
+
+import dimstack as ds
+
+N = 10**5
+DIMS = 50
+
+
+def stack(tol):
+    return [ds.dim.Basic(nom=10, tol=tol, name=str(i)).review() for i in range(DIMS)]
+
+
+def timed(rdims):
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    ds.model.sample_block(rdims, N, rng)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{DIMS} dimensions, {N} trials")
+    reference = timed(stack(ds.tol.Bilateral.symmetric(0.05)))
+    print(f"{'Bilateral':28s} {reference * 1e3:10.3f} ms")
+    for tol in [ds.tol.Position(0.1, "MMC", 0.02), ds.tol.Runout(0.06), ds.tol.Profile(0.1), ds.tol.Flatness(0.02)]:
+        t = timed(stack(tol))
+        print(f"{str(tol):28s} {t * 1e3:10.3f} ms  ({t / reference:6.1f}x)")
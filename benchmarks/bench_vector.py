@@ -0,0 +1,38 @@
+"""
+Benchmark of `vector.Loop.sample` on a spatial loop of 30 links.
+
+    python benchmarks/bench_vector.py
+"""
+
+import time
+
+import numpy as np
+
+import dimstack as ds
+
+N = 10**6
+LINKS = 30
+
+
+def normal(nom, tol, name):
+    return ds.dim.Basic(nom=nom, tol=ds.tol.Bilateral.symmetric(tol), name=name).review().assume_normal_dist(3)
+
+
+def spatial(links, seed=0):
+    rng = np.random.default_rng(seed)
+    chain = []
+    for i in range(links):
+        if i % 2:
+            chain.append(ds.vector.Rotation(normal(rng.uniform(-1, 1), 0.003, f"θ{i}"), axis=rng.normal(size=3)))
+        else:
+            chain.append(ds.vector.Translation(normal(rng.uniform(5, 20), 0.05, f"L{i}"), axis=rng.normal(size=3)))
+    return ds.vector.Loop(chain, measure=(0, 0, 1), name="spatial")
+
+
+if __name__ == "__main__":
+    loop = spatial(LINKS)
+    start = time.perf_counter()
+    loop.sample(N, seed=0)
+    elapsed = time.perf_counter() - start
+    print(f"{N} trials, {LINKS} links")
+    print(f"sample:  {elapsed:8.3f} s")
@@ -1,7 +1,50 @@
-from . import calc, dim, display, dist, plot, stats, tolerance, utils
+from . import (
+    assembly,
+    cache,
+    calc,
+    crn,
+    dim,
+    display,
+    dist,
+    drift,
+    interval,
+    model,
+    optimize,
+    pareto,
+    plot,
+    report,
+    scenario,
+    selective,
+    stats,
+    tolerance,
+    utils,
+    vector,
+)
 from . import tolerance as tol
 
 from .dim import Basic, Stack, Reviewed, ReviewedStack, Requirement
 from .dist import Normal, Uniform
 
-__all__ = ["dim", "stats", "display", "tolerance", "tol", "utils", "dist", "plot", "calc"]
+__all__ = [
+    "assembly",
+    "cache",
+    "dim",
+    "stats",
+    "display",
+    "tolerance",
+    "tol",
+    "utils",
+    "dist",
+    "drift",
+    "interval",
+    "model",
+    "optimize",
+    "pareto",
+    "plot",
+    "report",
+    "scenario",
+    "selective",
+    "calc",
+    "crn",
+    "vector",
+]
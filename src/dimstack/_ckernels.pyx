@@ -0,0 +1,70 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Compiled backend of `dimstack.kernels`. Build with `cythonize -i src/dimstack/_ckernels.pyx`."""
+
+from libc.math cimport fabs, sqrt
+
+import numpy as np
+
+
+def rss(x):
+    cdef double[::1] v = np.ascontiguousarray(x, dtype=float)
+    cdef double total = 0
+    cdef Py_ssize_t i
+    for i in range(v.shape[0]):
+        total += v[i] * v[i]
+    return sqrt(total)
+
+
+cdef void _reduce(
+    const double[::1] dir, const double[::1] median, const double[::1] half, const double[::1] a,
+    Py_ssize_t start, Py_ssize_t stop, double* out
+) noexcept nogil:
+    cdef double nominal = 0, wc = 0, squares = 0, t
+    cdef Py_ssize_t i
+    for i in range(start, stop):
+        t = half[i] * a[i]
+        nominal += dir[i] * median[i] * a[i]
+        wc += fabs(t)
+        squares += t * t
+    out[0] = nominal
+    out[1] = wc
+    out[2] = sqrt(squares)
+
+
+def reduce(dir, median, half, a):
+    cdef double[::1] d = np.ascontiguousarray(dir, dtype=float)
+    cdef double[::1] m = np.ascontiguousarray(median, dtype=float)
+    cdef double[::1] h = np.ascontiguousarray(half, dtype=float)
+    cdef double[::1] s = np.ascontiguousarray(a, dtype=float)
+    cdef double out[3]
+    _reduce(d, m, h, s, 0, d.shape[0], out)
+    return out[0], out[1], out[2]
+
+
+def segment_reduce(dir, median, half, a, offsets):
+    cdef double[::1] d = np.ascontiguousarray(dir, dtype=float)
+    cdef double[::1] m = np.ascontiguousarray(median, dtype=float)
+    cdef double[::1] h = np.ascontiguousarray(half, dtype=float)
+    cdef double[::1] s = np.ascontiguousarray(a, dtype=float)
+    cdef Py_ssize_t[::1] o = np.ascontiguousarray(offsets, dtype=np.intp)
+    cdef Py_ssize_t k = o.shape[0] - 1, j
+    result = np.empty((3, k))
+    cdef double[:, ::1] r = result
+    cdef double out[3]
+    with nogil:
+        for j in range(k):
+            _reduce(d, m, h, s, o[j], o[j + 1], out)
+            r[0, j] = out[0]
+            r[1, j] = out[1]
+            r[2, j] = out[2]
+    return result[0], result[1], result[2]
+
+
+def accumulate(out, double a, x):
+    cdef double[::1] o = out
+    cdef double[::1] v = np.ascontiguousarray(x, dtype=float)
+    cdef Py_ssize_t i
+    with nogil:
+        for i in range(o.shape[0]):
+            o[i] += a * v[i]
+    return out
@@ -0,0 +1,58 @@
+"""NumPy backend of `dimstack.kernels`."""
+
+import numpy as np
+
+
+def _sum(x: np.ndarray) -> float:
+    # a running sum (not pairwise) to add in stack order
+    return float(np.cumsum(x)[-1]) if len(x) else 0.0
+
+
+def rss(x: np.ndarray) -> float:
+    """Root sum square of x."""
+    x = np.asarray(x, dtype=float)
+    return float(np.sqrt(_sum(x * x)))
+
+
+def reduce(dir: np.ndarray, median: np.ndarray, half: np.ndarray, a: np.ndarray) -> tuple[float, float, float]:
+    """
+    Closure of one stack.
+
+    Args:
+        dir (np.ndarray): Direction of every dimension.
+        median (np.ndarray): Relative median of every dimension.
+        half (np.ndarray): Half of the total tolerance of every dimension.
+        a (np.ndarray): Sensitivity of every dimension.
+
+    Returns:
+        tuple[float, float, float]: The nominal, worst-case and root sum square tolerances of the closure.
+    """
+    dir, median, half, a = (np.asarray(x, dtype=float) for x in (dir, median, half, a))
+    t = half * a
+    return _sum(dir * median * a), _sum(np.abs(t)), float(np.sqrt(_sum(t * t)))
+
+
+def segment_reduce(
+    dir: np.ndarray, median: np.ndarray, half: np.ndarray, a: np.ndarray, offsets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    `reduce` of many stacks at once. The dimensions of stack i are at offsets[i]:offsets[i + 1].
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The nominal, worst-case and root sum square tolerances.
+    """
+    dir, median, half, a = (np.asarray(x, dtype=float) for x in (dir, median, half, a))
+    offsets = np.asarray(offsets, dtype=np.intp)
+    t = half * a
+    values = np.stack([dir * median * a, np.abs(t), t * t])
+    sums = np.zeros((3, len(offsets) - 1))
+    nonempty = offsets[1:] > offsets[:-1]
+    if nonempty.any():
+        sums[:, nonempty] = np.add.reduceat(values, offsets[:-1][nonempty], axis=1)
+    return sums[0], sums[1], np.sqrt(sums[2])
+
+
+def accumulate(out: np.ndarray, a: float, x: np.ndarray) -> np.ndarray:
+    """out += a * x, in place."""
+    out += a * x
+    return out
@@ -0,0 +1,457 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+import numpy as np
+from scipy.special import ndtr
+
+from . import calc
+from .dim import Basic, Reviewed, ReviewedStack
+from .display import display_df
+from .dist import Normal
+from .tolerance import Bilateral
+
+
+class SubAssembly:
+    """
+    A stack whose analysis result is a contributor of other stacks.
+
+    The contributors of a sub-assembly may be Basic or Reviewed dimensions,
+    other sub-assemblies, or operators (`Max`, `Min`, `Clearance`), so a
+    product tree forms a directed acyclic graph. A sub-assembly may be shared
+    by any number of parents.
+
+    The result of `method` is memoized. On every evaluation the contributors are
+    checked against the state they had when the result was computed, so only the
+    sub-assemblies downstream of a changed dimension are recomputed.
+
+    Args:
+        name (str, optional): The name of the sub-assembly. Defaults to "Sub-Assembly".
+        description (str, optional): The description of the sub-assembly. Defaults to "".
+        dims (list[Basic | Reviewed | SubAssembly | Operator], optional): The contributors. Defaults to [].
+        method (Callable, optional): The `calc` method used to evaluate the stack. Defaults to calc.SixSigma.
+    """
+
+    def __init__(
+        self,
+        name: str = "Sub-Assembly",
+        description: str = "",
+        dims: list["Basic | Reviewed | SubAssembly | Operator"] | None = None,
+        method: Callable[[ReviewedStack], Basic | Reviewed] = calc.SixSigma,
+    ):
+        self.name = name
+        self.description = description
+        self.dims = list(dims) if dims is not None else []
+        self.method = method
+        self._result = None
+        self._result_key = None
+        self.evaluations = 0
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.dims}"
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"SUB-ASSEMBLY: {self.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"SUB-ASSEMBLY: {self.name}")
+
+    def show(self):
+        return display_df(self.dict, f"SUB-ASSEMBLY: {self.name}")
+
+    def append(self, item: "Basic | Reviewed | SubAssembly | Operator"):
+        """Append a contributor to the sub-assembly."""
+        self.dims.append(item)
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        memo = {}
+        return [
+            _as_reviewed(item._evaluate(memo) if isinstance(item, (SubAssembly, Operator)) else item).dict
+            for item in self.dims
+        ]
+
+    @property
+    def result(self) -> Basic | Reviewed:
+        """The (memoized) result of the sub-assembly."""
+        return self.evaluate()
+
+    def evaluate(self) -> Basic | Reviewed:
+        """
+        Evaluate the sub-assembly with its `method`.
+
+        Sub-assemblies that are unchanged since their last evaluation return their
+        memoized result; a shared sub-assembly is checked only once per call.
+
+        Returns:
+            Basic | Reviewed: The result of `method`.
+        """
+        return self._evaluate({})
+
+    def _evaluate(self, memo) -> Basic | Reviewed:
+        if id(self) in memo:
+            return memo[id(self)]
+        contributors = [
+            item._evaluate(memo) if isinstance(item, (SubAssembly, Operator)) else item for item in self.dims
+        ]
+        key = (self.name, self.description, self.method, tuple(item.key for item in contributors))
+        if self._result is None or key != self._result_key:
+            stack = ReviewedStack(
+                name=self.name,
+                description=self.description,
+                dims=[_as_reviewed(item) for item in contributors],
+            )
+            self._result = self.method(stack)
+            self._result_key = key
+            self.evaluations += 1
+        memo[id(self)] = self._result
+        return self._result
+
+    def to_reviewed_stack(self) -> ReviewedStack:
+        """Convert the sub-assembly to a reviewed stack, with each child sub-assembly replaced by its result."""
+        memo = {}
+        return ReviewedStack(
+            name=self.name,
+            description=self.description,
+            dims=[
+                _as_reviewed(item._evaluate(memo) if isinstance(item, (SubAssembly, Operator)) else item)
+                for item in self.dims
+            ],
+        )
+
+    def sample(self, n: int, seed: int | None = None) -> np.ndarray:
+        """
+        Simulate the sub-assembly.
+
+        A dimension or sub-assembly that appears in several places of the tree is
+        sampled once and the same sample block is reused by every parent, so the
+        correlation between parents that share parts is preserved.
+
+        Args:
+            n (int): Number of trials.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+
+        Returns:
+            np.ndarray: The simulated values of the sub-assembly.
+        """
+        return self._sample(n, np.random.default_rng(seed), {})
+
+    def _sample(self, n: int, rng: np.random.Generator, memo) -> np.ndarray:
+        if id(self) in memo:
+            return memo[id(self)]
+        samples = np.zeros(n)
+        for item in self.dims:
+            samples += _sample(item, n, rng, memo)
+        memo[id(self)] = samples
+        return samples
+
+    def _canonical(self, memo) -> "_Canonical":
+        if id(self) not in memo:
+            memo[id(self)] = _Canonical.sum(_canonical(item, memo) for item in self.dims)
+        return memo[id(self)]
+
+
+def _as_reviewed(item: Basic | Reviewed) -> Reviewed:
+    if isinstance(item, Reviewed):
+        return item
+    return item.review()
+
+
+class Operator(ABC):
+    """
+    A nonlinear contributor of a sub-assembly: the combination of several paths.
+
+    A path is a Basic or Reviewed dimension, a sub-assembly (the sum of its
+    contributors) or another operator. Simulation combines whole sample blocks
+    of the paths with a single array operation, so a shared contributor keeps
+    its draws in every path. The closed-form evaluation carries every quantity
+    as a first-order canonical form (a mean, a sensitivity to every independent
+    contributor and an independent residual variance), and approximates the
+    max of two paths by a normal with Clark's exact moments.
+
+    Args:
+        name (str): The name of the operator.
+        description (str): The description of the operator.
+        dims (list[Basic | Reviewed | SubAssembly | Operator]): The paths.
+    """
+
+    title = "OPERATOR"
+
+    def __init__(self, name: str, description: str, dims: list["Basic | Reviewed | SubAssembly | Operator"]):
+        if not dims:
+            raise ValueError(f"{name} needs at least one path")
+        self.name = name
+        self.description = description
+        self.dims = list(dims)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.dims}"
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"{self.title}: {self.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"{self.title}: {self.name}")
+
+    def show(self):
+        return display_df(self.dict, f"{self.title}: {self.name}")
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        memo = {}
+        rows = [
+            _as_reviewed(item._evaluate(memo) if isinstance(item, (SubAssembly, Operator)) else item).dict
+            for item in self.dims
+        ]
+        return rows + [self._evaluate(memo).dict]
+
+    def moments(self) -> tuple[float, float]:
+        """Closed-form mean and variance."""
+        canonical = self._canonical({})
+        return float(canonical.mean), float(canonical.variance)
+
+    def evaluate(self, at: float = 3) -> Reviewed:
+        """
+        Closed-form normal approximation of the operator.
+
+        Args:
+            at (float, optional): Number of standard deviations of the resulting tolerance. Defaults to 3.
+
+        Returns:
+            Reviewed: A Reviewed dimension with the closed-form mean and standard deviation.
+        """
+        mean, variance = self.moments()
+        std_dev = float(np.sqrt(variance))
+        return Reviewed(
+            Basic(
+                nom=mean,
+                tol=Bilateral.symmetric(std_dev * at),
+                name=f"{self.name} - Closed-Form Approximation",
+                desc="(Clark's moments, assuming Normal Dist.)",
+            ),
+            distribution=Normal(mean, std_dev),
+        ).assume_normal_dist(at)
+
+    def _evaluate(self, memo) -> Reviewed:
+        if id(self) not in memo:
+            memo[id(self)] = self.evaluate()
+        return memo[id(self)]
+
+    def sample(self, n: int, seed: int | None = None) -> np.ndarray:
+        """
+        Simulate the operator exactly.
+
+        Args:
+            n (int): Number of trials.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+
+        Returns:
+            np.ndarray: The simulated values of the operator.
+        """
+        return self._sample(n, np.random.default_rng(seed), {})
+
+    def _sample(self, n: int, rng: np.random.Generator, memo) -> np.ndarray:
+        if id(self) not in memo:
+            memo[id(self)] = self._combine([_sample(item, n, rng, memo) for item in self.dims], rng)
+        return memo[id(self)]
+
+    def _canonical(self, memo) -> "_Canonical":
+        if id(self) not in memo:
+            memo[id(self)] = self._approximate([_canonical(item, memo) for item in self.dims])
+        return memo[id(self)]
+
+    @abstractmethod
+    def _combine(self, samples: list[np.ndarray], rng: np.random.Generator) -> np.ndarray:
+        """The exact operator on the sampled contributors."""
+
+    @abstractmethod
+    def _approximate(self, paths: list["_Canonical"]) -> "_Canonical":
+        """The canonical form of the operator on the canonical forms of the contributors."""
+
+
+class Max(Operator):
+    """
+    The longest of several paths, e.g. the contact of a part that rests on the
+    highest of several supports, or a conditional contact between alternative
+    paths.
+
+    >>> from dimstack.tolerance import Bilateral
+    >>> left = Reviewed(Basic(10, Bilateral.symmetric(0.03), name="left")).assume_normal_dist(3)
+    >>> right = Reviewed(Basic(10, Bilateral.symmetric(0.03), name="right")).assume_normal_dist(3)
+    >>> mean, variance = Max(dims=[left, right]).moments()
+    >>> round(mean, 6)
+    10.005642
+
+    Args:
+        dims (list[Basic | Reviewed | SubAssembly | Operator]): The paths.
+        name (str, optional): The name of the operator. Defaults to "Max".
+        description (str, optional): The description of the operator. Defaults to "".
+    """
+
+    title = "MAX"
+
+    def __init__(
+        self, dims: list["Basic | Reviewed | SubAssembly | Operator"], name: str = "Max", description: str = ""
+    ):
+        super().__init__(name, description, dims)
+
+    def _combine(self, samples: list[np.ndarray], rng: np.random.Generator) -> np.ndarray:
+        return np.maximum.reduce(samples)
+
+    def _approximate(self, paths: list["_Canonical"]) -> "_Canonical":
+        return _Canonical.fold(paths)
+
+
+class Min(Operator):
+    """
+    The shortest of several paths, e.g. the first of several stops a part meets.
+
+    Args:
+        dims (list[Basic | Reviewed | SubAssembly | Operator]): The paths.
+        name (str, optional): The name of the operator. Defaults to "Min".
+        description (str, optional): The description of the operator. Defaults to "".
+    """
+
+    title = "MIN"
+
+    def __init__(
+        self, dims: list["Basic | Reviewed | SubAssembly | Operator"], name: str = "Min", description: str = ""
+    ):
+        super().__init__(name, description, dims)
+
+    def _combine(self, samples: list[np.ndarray], rng: np.random.Generator) -> np.ndarray:
+        return np.minimum.reduce(samples)
+
+    def _approximate(self, paths: list["_Canonical"]) -> "_Canonical":
+        # min(x, y) = -max(-x, -y)
+        return _Canonical.fold([path.scaled(-1) for path in paths]).scaled(-1)
+
+
+class Clearance(Operator):
+    """
+    The float of a part in a clearance fit.
+
+    The clearance is the sum of the contributors of the fit (e.g. a bore and a
+    negative shaft). A part with clearance is displaced by the fraction `takeup`
+    of it; a fit with interference has no float. With `takeup="random"`, the
+    fraction is uniform between 0 and 1 for every assembly.
+
+    >>> from dimstack.tolerance import Bilateral
+    >>> bore = Reviewed(Basic(10, Bilateral.symmetric(0.03), name="bore")).assume_normal_dist(3)
+    >>> shaft = Reviewed(Basic(-9.98, Bilateral.symmetric(0.03), name="shaft")).assume_normal_dist(3)
+    >>> bool(Clearance(dims=[bore, shaft]).sample(1000, seed=0).min() >= 0)
+    True
+
+    Args:
+        dims (list[Basic | Reviewed | SubAssembly | Operator]): The contributors of the clearance.
+        takeup (float | str, optional): Fraction of the clearance taken up, or "random". Defaults to 1.
+        name (str, optional): The name of the operator. Defaults to "Clearance".
+        description (str, optional): The description of the operator. Defaults to "".
+    """
+
+    title = "CLEARANCE"
+
+    def __init__(
+        self,
+        dims: list["Basic | Reviewed | SubAssembly | Operator"],
+        takeup: float | str = 1,
+        name: str = "Clearance",
+        description: str = "",
+    ):
+        if isinstance(takeup, str) and takeup != "random":
+            raise ValueError(f"Unknown takeup {takeup}")
+        super().__init__(name, description, dims)
+        self.takeup = takeup
+
+    def _combine(self, samples: list[np.ndarray], rng: np.random.Generator) -> np.ndarray:
+        clearance = np.maximum(np.sum(samples, axis=0), 0)
+        if self.takeup == "random":
+            return rng.random(len(clearance)) * clearance
+        return self.takeup * clearance
+
+    def _approximate(self, paths: list["_Canonical"]) -> "_Canonical":
+        clearance = _Canonical.maximum(_Canonical.sum(paths), _Canonical(0.0, {}, 0.0))
+        if self.takeup != "random":
+            return clearance.scaled(self.takeup)
+        # u * c with u ~ U(0, 1) independent of c: E[u] = 1/2, E[u²] = 1/3
+        mean = clearance.mean / 2
+        variance = (clearance.variance + clearance.mean**2) / 3 - mean**2
+        return _Canonical(mean, {}, 0.0).with_terms(clearance.scaled(0.5).terms, variance)
+
+
+class _Canonical:
+    """First-order canonical form: mean + Σ terms[k]·z_k + an independent residual, with z_k standard."""
+
+    __slots__ = ("mean", "residual", "terms")
+
+    def __init__(self, mean: float, terms: dict[int, float], residual: float):
+        self.mean = mean
+        self.terms = terms
+        self.residual = residual
+
+    @property
+    def variance(self) -> float:
+        return sum(t * t for t in self.terms.values()) + self.residual
+
+    def covariance(self, other: "_Canonical") -> float:
+        return sum(t * other.terms[k] for k, t in self.terms.items() if k in other.terms)
+
+    def scaled(self, c: float) -> "_Canonical":
+        return _Canonical(c * self.mean, {k: c * t for k, t in self.terms.items()}, c * c * self.residual)
+
+    def with_terms(self, terms: dict[int, float], variance: float) -> "_Canonical":
+        """The same mean with `terms`, and the rest of `variance` as residual."""
+        return _Canonical(self.mean, terms, max(variance - sum(t * t for t in terms.values()), 0.0))
+
+    @staticmethod
+    def sum(items) -> "_Canonical":
+        mean, terms, residual = 0.0, {}, 0.0
+        for item in items:
+            mean += item.mean
+            residual += item.residual
+            for k, t in item.terms.items():
+                terms[k] = terms.get(k, 0.0) + t
+        return _Canonical(mean, terms, residual)
+
+    @staticmethod
+    def fold(paths: list["_Canonical"]) -> "_Canonical":
+        """Max of several paths, pairwise; the widest paths come last, where the normal approximation loses least."""
+        paths = sorted(paths, key=lambda path: path.variance)
+        result = paths[0]
+        for path in paths[1:]:
+            result = _Canonical.maximum(result, path)
+        return result
+
+    @staticmethod
+    def maximum(x: "_Canonical", y: "_Canonical") -> "_Canonical":
+        """Clark's moments of max(x, y), with the sensitivities blended by the probability that each is larger."""
+        var_x, var_y = x.variance, y.variance
+        theta = np.sqrt(max(var_x + var_y - 2 * x.covariance(y), 0.0))
+        if theta <= 1e-12 * max(np.sqrt(var_x + var_y), abs(x.mean) + abs(y.mean), 1e-300):
+            return x if x.mean >= y.mean else y
+        alpha = (x.mean - y.mean) / theta
+        p = float(ndtr(alpha))
+        phi = float(np.exp(-alpha * alpha / 2) / np.sqrt(2 * np.pi))
+        mean = x.mean * p + y.mean * (1 - p) + theta * phi
+        second = (x.mean**2 + var_x) * p + (y.mean**2 + var_y) * (1 - p) + (x.mean + y.mean) * theta * phi
+        terms = {k: p * x.terms.get(k, 0.0) + (1 - p) * y.terms.get(k, 0.0) for k in x.terms.keys() | y.terms.keys()}
+        return _Canonical(mean, {}, 0.0).with_terms(terms, max(second - mean**2, 0.0))
+
+
+def _sample(item: "Basic | Reviewed | SubAssembly | Operator", n: int, rng: np.random.Generator, memo) -> np.ndarray:
+    if isinstance(item, (SubAssembly, Operator)):
+        return item._sample(n, rng, memo)
+    if id(item) not in memo:
+        rdim = _as_reviewed(item)
+        memo[id(item)] = rdim.dim.a * rdim.sample(n, random_state=rng)
+    return memo[id(item)]
+
+
+def _canonical(item: "Basic | Reviewed | SubAssembly | Operator", memo) -> _Canonical:
+    if isinstance(item, (SubAssembly, Operator)):
+        return item._canonical(memo)
+    if id(item) not in memo:
+        rdim = _as_reviewed(item)
+        mean, variance = rdim.distribution.moments()[:2]
+        a = rdim.dim.a
+        memo[id(item)] = _Canonical(a * mean, {id(item): a * float(np.sqrt(variance))}, 0.0)
+    return memo[id(item)]
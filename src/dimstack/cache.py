@@ -0,0 +1,208 @@
+import functools
+import inspect
+import pickle
+import sqlite3
+import threading
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable
+
+from .dim import Basic
+from .utils import digest
+
+# bump when a change outside a cached function (e.g. in the sampling of a distribution) changes its results
+CACHE_VERSION = 1
+MAX_BYTES = 256 * 1024**2
+DEFAULT_PATH = Path.home() / ".cache" / "dimstack" / "results.sqlite"
+
+try:
+    _PACKAGE_VERSION = metadata.version("dimstack")
+except metadata.PackageNotFoundError:
+    _PACKAGE_VERSION = "unknown"
+
+
+class ResultCache:
+    """
+    On-disk cache of analysis results, keyed by content hash.
+
+    Results are pickled into a SQLite database. When the database grows over
+    `max_bytes`, the least recently used results are evicted.
+
+    Args:
+        path (str | Path, optional): The database file. Defaults to DEFAULT_PATH.
+        max_bytes (int, optional): The size limit of the cached results. Defaults to MAX_BYTES.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_PATH, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, size INTEGER, used REAL)"
+        )
+
+    def __str__(self) -> str:
+        stats = self.stats
+        return (
+            f"ResultCache {self.path}: {stats['entries']} results, {stats['bytes']} bytes, "
+            f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions"
+        )
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Look up a result.
+
+        Returns:
+            tuple[bool, Any]: Whether the result was found, and the result.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self._db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """Store a result, evicting the least recently used results over the size limit."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(blob), len(blob), time.time()),
+            )
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for old, size in self._db.execute("SELECT key, size FROM results ORDER BY used").fetchall():
+                self._db.execute("DELETE FROM results WHERE key = ?", (old,))
+                self.evictions += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def clear(self):
+        """Remove every result."""
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Hits, misses and evictions since the cache was opened, and the number and size of the cached results."""
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_CACHE: ResultCache | None = None
+
+
+def enable(path: str | Path = DEFAULT_PATH, max_bytes: int = MAX_BYTES) -> ResultCache:
+    """
+    Cache the results of the `calc.MonteCarlo` and `calc.Moments` analyses on disk.
+
+    The closed-form analyses (`calc.WC`, `calc.RSS`, `calc.MRSS` and `calc.SixSigma`)
+    are cheaper than a cache lookup and are not cached.
+
+    Args:
+        path (str | Path, optional): The database file. Defaults to DEFAULT_PATH.
+        max_bytes (int, optional): The size limit of the cached results. Defaults to MAX_BYTES.
+
+    Returns:
+        ResultCache: The cache.
+    """
+    global _CACHE
+    disable()
+    _CACHE = ResultCache(path, max_bytes)
+    return _CACHE
+
+
+def disable():
+    """Stop caching results."""
+    global _CACHE
+    if _CACHE is not None:
+        _CACHE.close()
+    _CACHE = None
+
+
+def stats() -> dict[str, int] | None:
+    """The statistics of the enabled cache, or None."""
+    return None if _CACHE is None else _CACHE.stats
+
+
+def cached(func: Callable) -> Callable:
+    """
+    Cache the results of an analysis `func(stack, ...)` while the cache is enabled.
+
+    The key is the hash of the source of the function, the `key` of the stack and
+    the other arguments, so editing the function invalidates its results. Calls that cannot be keyed by content are not cached: a
+    stack without a `key`, a callable argument (e.g. a nonlinear `func`), or an
+    unseeded simulation (`seed=None`). A `progress` callback is not part of the key.
+    """
+    signature = inspect.signature(func)
+    source = _source(func)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _CACHE is None:
+            return func(self, *args, **kwargs)
+        key = _key(func, signature, source, self, args, kwargs)
+        if key is None:
+            return func(self, *args, **kwargs)
+        hit, result = _CACHE.get(key)
+        if hit:
+            return _renew_ids(result)
+        result = func(self, *args, **kwargs)
+        _CACHE.put(key, result)
+        return result
+
+    return wrapper
+
+
+def _source(func: Callable) -> str:
+    try:
+        return digest(inspect.getsource(func))
+    except (OSError, TypeError):
+        return _PACKAGE_VERSION
+
+
+def _key(func: Callable, signature: inspect.Signature, source: str, self, args, kwargs) -> str | None:
+    stack = getattr(self, "key", None)
+    if stack is None:
+        return None
+    bound = signature.bind(self, *args, **kwargs)
+    bound.apply_defaults()
+    arguments = {name: value for name, value in list(bound.arguments.items())[1:] if name != "progress"}
+    if "seed" in arguments and arguments["seed"] is None:
+        return None
+    if any(callable(value) for value in arguments.values()):
+        return None
+    return digest((CACHE_VERSION, source, func.__module__, func.__qualname__, stack, tuple(arguments.items())))
+
+
+def _renew_ids(result):
+    # a cached result is a new dimension, like a computed one
+    dim = getattr(result, "dim", result)
+    if isinstance(dim, Basic):
+        dim.id = Basic.newID()
+    return result
@@ -1,7 +1,20 @@
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import threading
+from typing import Any, Callable
+
+import numpy as np
+from scipy.stats import norm
+
+from .cache import cached
 from .dim import Basic, Stack, Reviewed, ReviewedStack
 from .stats import rss
 from .tolerance import Bilateral
-from .dist import Normal
+from .dist import Normal, from_moments
+from .interval import worst_case
+from .kernels import accumulate, reduce, segment_reduce
 
 
 def Closed(self: Stack | ReviewedStack) -> Basic:
@@ -36,7 +49,7 @@ def Closed(self: Stack | ReviewedStack) -> Basic:
     )
 
 
-def WC(self: Stack | ReviewedStack) -> Basic:
+def WC(self: Stack | ReviewedStack, func: Callable[[np.ndarray], np.ndarray] | None = None) -> Basic:
     """
     This is a simple WC calculation. This results in a Bilateral dimension with
     a tolerance that is the sum of the component tolerances. This is similar to
@@ -44,6 +57,12 @@ def WC(self: Stack | ReviewedStack) -> Basic:
     A Worst-Case analysis ensures with any combination of tolerances,
     the combined stackup of tolerances will be within the this resulting
     tolerance.
+
+    For a nonlinear stack, `func` maps the contributor values (absolute values,
+    in stack order along the first axis) to the closure, and the extremes are
+    found with `interval.worst_case` over the absolute bounds of the contributors
+    (the sensitivities `a` are then part of `func`). Use `interval.worst_case`
+    directly for the guaranteed enclosure and the extreme contributor combinations.
     """
 
     if isinstance(self, Stack):
@@ -51,8 +70,16 @@ def WC(self: Stack | ReviewedStack) -> Basic:
     elif isinstance(self, ReviewedStack):
         dims = [rdim.dim for rdim in self.dims]
 
-    mean = sum([dim.dir * dim.rel_median * dim.a for dim in dims])
-    t_wc = sum([abs((dim.tolerance.T / 2) * dim.a) for dim in dims])
+    if func is not None:
+        result = worst_case(func, [dim.abs_lower for dim in dims], [dim.abs_upper for dim in dims])
+        return Basic(
+            nom=(result.lower + result.upper) / 2,
+            tol=Bilateral.symmetric((result.upper - result.lower) / 2),
+            name=f"{self.name} - WC Analysis",
+            desc="(nonlinear)",
+        )
+
+    mean, t_wc, _ = reduce(*_columns(dims))
     tolerance = Bilateral.symmetric(t_wc)
     return Basic(
         nom=mean,
@@ -94,8 +121,7 @@ def RSS(self: Stack | ReviewedStack) -> Basic:
     elif isinstance(self, ReviewedStack):
         dims = [rdim.dim for rdim in self.dims]
 
-    d_g = sum([dim.dir * dim.rel_median * dim.a for dim in dims])
-    t_rss = rss([dim.dir * (dim.tolerance.T / 2) * dim.a for dim in dims])
+    d_g, _, t_rss = reduce(*_columns(dims))
     tolerance = Bilateral.symmetric(t_rss)
     return Basic(
         nom=d_g,
@@ -117,9 +143,7 @@ def MRSS(self: Stack | ReviewedStack) -> Basic:
     elif isinstance(self, ReviewedStack):
         dims = [rdim.dim for rdim in self.dims]
 
-    d_g = sum([dim.dir * dim.rel_median * dim.a for dim in dims])
-    t_wc = sum([abs(dim.dir * (dim.tolerance.T / 2) * dim.a) for dim in dims])
-    t_rss = rss([dim.dir * dim.a * (dim.tolerance.T / 2) for dim in dims])
+    d_g, t_wc, t_rss = reduce(*_columns(dims))
     n = len(self.dims)
     C_f = (0.5 * (t_wc - t_rss)) / (t_rss * (n**0.5 - 1)) + 1
     t_mrss = C_f * t_rss
@@ -132,6 +156,31 @@ def MRSS(self: Stack | ReviewedStack) -> Basic:
     )
 
 
+def batch(stacks: list[Stack | ReviewedStack]) -> dict[str, np.ndarray]:
+    """
+    Closed-form closures of many stacks at once.
+
+    The dimensions of all the stacks are reduced in a single call, so this is
+    the fast path for screening thousands of stacks.
+
+    Returns:
+        dict[str, np.ndarray]: The nominal and the WC, RSS and MRSS tolerances of every stack.
+    """
+    dims = [[rdim.dim for rdim in stack.dims] if isinstance(stack, ReviewedStack) else stack.dims for stack in stacks]
+    offsets = np.cumsum([0] + [len(d) for d in dims])
+    nominal, t_wc, t_rss = segment_reduce(*_columns([dim for d in dims for dim in d]), offsets)
+    n = np.diff(offsets)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        C_f = (0.5 * (t_wc - t_rss)) / (t_rss * (n**0.5 - 1)) + 1
+    return {"nominal": nominal, "WC": t_wc, "RSS": t_rss, "MRSS": C_f * t_rss}
+
+
+def _columns(dims: list[Basic]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Direction, relative median, half tolerance and sensitivity of the dimensions, in one pass."""
+    columns = np.array([(dim.dir, dim.rel_median, dim.tolerance.T / 2, dim.a) for dim in dims], dtype=float)
+    return tuple(columns.reshape(-1, 4).T)
+
+
 def SixSigma(self: ReviewedStack, at: float = 3) -> Reviewed:
     """
     "6 Sigma" calculation of a Dimension stackup with distribution information of
@@ -154,3 +203,257 @@ def SixSigma(self: ReviewedStack, at: float = 3) -> Reviewed:
         distribution=dist,
     ).assume_normal_dist(at)
     return dim
+
+
+@cached
+def MonteCarlo(
+    self: ReviewedStack,
+    n: int = 100000,
+    seed: int | None = None,
+    at: float = 3,
+    progress: Callable[[int, int], None] | None = None,
+) -> Reviewed:
+    """
+    Monte Carlo simulation of a Dimension stackup. Every contributor is sampled
+    from its distribution and the samples are summed (weighted by the sensitivity
+    `a`). The result is a Reviewed dimension with a Normal distribution fitted to
+    the simulated stack; the simulated values are kept as the distribution data.
+
+    Args:
+        n (int, optional): Number of trials. Defaults to 100000.
+        seed (int, optional): Seed of the random number generator. Defaults to None.
+        at (float, optional): Number of standard deviations of the resulting tolerance. Defaults to 3.
+        progress (Callable, optional): Called with (done, total) contributors after each contributor is sampled.
+
+    Returns:
+        Reviewed: The simulated stack result.
+    """
+    rng = np.random.default_rng(seed)
+    samples = np.zeros(n)
+    for i, rdim in enumerate(self.dims):
+        accumulate(samples, rdim.dim.a, rdim.sample(n, random_state=rng))
+        if progress is not None:
+            progress(i + 1, len(self.dims))
+    dist = Normal.fit(samples)
+    return Reviewed(
+        Basic(
+            nom=dist.mean,
+            tol=Bilateral.symmetric(dist.std_dev * at),
+            name=f"{self.name} - Monte Carlo Analysis",
+            desc=f"(n={n})",
+        ),
+        distribution=dist,
+    )
+
+
+@cached
+def Moments(
+    self: ReviewedStack,
+    func: Callable[[np.ndarray], np.ndarray] | None = None,
+    at: float = 3,
+) -> Reviewed:
+    """
+    Method of moments calculation of a Dimension stackup. The mean, variance,
+    skewness and kurtosis of every contributor's distribution are propagated
+    through the stack and a distribution with the same four moments (Normal, or
+    Johnson SU/SB) is fitted to the result. Unlike SixSigma, a stack of uniform,
+    screened or otherwise non-normal contributors keeps its real shape, at
+    closed-form cost.
+
+    For a nonlinear stack, `func` maps the contributor values (absolute values,
+    in stack order along the first axis) to the closure. The gradient and Hessian
+    of `func` at the contributor means are taken by finite differences and the
+    second-order Taylor terms are included in the propagated moments.
+
+    The resulting tolerance spans the quantiles of the fitted distribution that
+    correspond to ± `at` standard deviations of a normal distribution, so it is
+    asymmetric for a skewed result.
+
+    Args:
+        func (Callable, optional): The stack closure. Defaults to the sum of `a` times each contributor.
+        at (float, optional): Number of (normal equivalent) standard deviations of the resulting tolerance. Defaults to 3.
+
+    Returns:
+        Reviewed: A Reviewed dimension with the fitted distribution.
+    """
+    moments = np.array([rdim.distribution.moments() for rdim in self.dims], dtype=float)
+    mu, var, skewness, kurtosis = moments.T
+    k3 = skewness * var**1.5
+    k4 = kurtosis * var**2
+
+    if func is None:
+        g = np.array([rdim.dim.a for rdim in self.dims], dtype=float)
+        mean = g @ mu
+        variance = g**2 @ var
+        third = g**3 @ k3
+        fourth = g**4 @ k4
+    else:
+        g, H, f0 = _taylor(func, mu, np.sqrt(var))
+        HS = H * var  # H Σ, with Σ = diag(var)
+        HS2 = HS @ HS
+        gS = g * var
+        # cumulants of a quadratic form in normal variables, plus the first-order
+        # contribution of each contributor's own skewness and kurtosis
+        mean = f0 + 0.5 * np.trace(HS)
+        variance = g @ gS + 0.5 * np.trace(HS2)
+        third = 3 * gS @ H @ gS + np.trace(HS2 @ HS) + g**3 @ k3
+        fourth = 12 * gS @ H @ HS @ gS + 3 * np.trace(HS2 @ HS2) + g**4 @ k4
+
+    dist = from_moments(mean, variance, third / variance**1.5, fourth / variance**2)
+    if isinstance(dist, Normal):
+        lower, upper = mean - at * dist.std_dev, mean + at * dist.std_dev
+    else:
+        lower, upper = dist.ppf(norm.cdf([-at, at]))
+    if mean < 0:
+        tolerance = Bilateral(mean - lower, mean - upper)
+    else:
+        tolerance = Bilateral(upper - mean, lower - mean)
+    return Reviewed(
+        Basic(
+            nom=mean,
+            tol=tolerance,
+            name=f"{self.name} - Moments Analysis",
+            desc="(method of moments)" if func is None else "(second-order method of moments)",
+        ),
+        distribution=dist,
+    )
+
+
+def _taylor(func: Callable[[np.ndarray], np.ndarray], x: np.ndarray, scale: np.ndarray):
+    """Value, gradient and Hessian of func at x by central differences, in a single vectorized call."""
+    n = len(x)
+    h = np.where(scale > 0, scale, np.maximum(np.abs(x), 1)) * 1e-3
+    eye = np.eye(n) * h
+    i, j = np.triu_indices(n, 1)
+    points = np.hstack(
+        [
+            x[:, None],
+            x[:, None] + eye,
+            x[:, None] - eye,
+            x[:, None] + eye[:, i] + eye[:, j],
+            x[:, None] + eye[:, i] - eye[:, j],
+            x[:, None] - eye[:, i] + eye[:, j],
+            x[:, None] - eye[:, i] - eye[:, j],
+        ]
+    )
+    values = np.asarray(func(points), dtype=float)
+    f0 = values[0]
+    plus, minus = values[1 : n + 1], values[n + 1 : 2 * n + 1]
+    pp, pm, mp, mm = values[2 * n + 1 :].reshape(4, -1)
+    g = (plus - minus) / (2 * h)
+    H = np.diag((plus - 2 * f0 + minus) / h**2)
+    H[i, j] = H[j, i] = (pp - pm - mp + mm) / (4 * h[i] * h[j])
+    return g, H, f0
+
+
+class EvaluationCancelled(Exception):
+    """Raised in the worker of a cancelled `aevaluate` to stop it at its next progress report."""
+
+
+_INFLIGHT: "dict[Any, _Evaluation]" = {}
+
+
+async def aevaluate(
+    self,
+    method: Callable[..., Any],
+    *args,
+    executor: concurrent.futures.Executor | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    **kwargs,
+):
+    """
+    Evaluate `method(self, *args, **kwargs)` without blocking the event loop.
+
+    The evaluation runs in `executor` (the loop's default thread pool if None).
+    Identical concurrent requests (same method, same stack content and the same
+    arguments) share a single computation.
+
+    Cancelling the awaiting task cancels the computation once no other request
+    shares it: a computation that has not started is dropped, and a running one
+    that reports progress (e.g. `MonteCarlo`) stops at its next report. A request
+    made after a cancellation starts a new computation. Progress is reported on
+    the event loop with (done, total) and ends with (total, total) when the result
+    is ready; methods that do not report progress, run in a process pool or
+    return a cached result report (1, 1).
+
+    >>> stack = ReviewedStack(dims=[Basic(nom=1, tol=Bilateral.symmetric(0.1)).review()])
+    >>> asyncio.run(aevaluate(stack, RSS)).tolerance.upper
+    0.1
+
+    Args:
+        self (Stack | ReviewedStack): The stack (or any object `method` takes).
+        method (Callable): The analysis, e.g. `calc.RSS` or `calc.MonteCarlo`.
+        executor (concurrent.futures.Executor, optional): Where to run the analysis. Defaults to None.
+        progress (Callable, optional): Called with (done, total) on the event loop.
+
+    Returns:
+        The result of `method`.
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, method, getattr(self, "key", id(self)), args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = object()
+    evaluation = _INFLIGHT.get(key)
+    # a cancelled computation stays in flight until its done callback runs
+    if evaluation is None or evaluation.cancelled.is_set():
+        evaluation = _Evaluation(loop, executor, functools.partial(method, self, *args, **kwargs))
+        _INFLIGHT[key] = evaluation
+        evaluation.future.add_done_callback(functools.partial(_forget, key, evaluation))
+    evaluation.listeners.append(progress)
+    try:
+        return await asyncio.shield(evaluation.future)
+    except asyncio.CancelledError:
+        evaluation.listeners.remove(progress)
+        if not evaluation.listeners:
+            evaluation.cancel()
+        raise
+
+
+def _forget(key, evaluation: "_Evaluation", _):
+    if _INFLIGHT.get(key) is evaluation:
+        del _INFLIGHT[key]
+
+
+class _Evaluation:
+    """A computation running in an executor, shared by every request that awaits it."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, executor, call: functools.partial):
+        self.loop = loop
+        self.listeners: list[Callable[[int, int], None] | None] = []
+        self.total = 1
+        self.cancelled = threading.Event()
+        self.reports = "progress" in inspect.signature(call.func).parameters and not isinstance(
+            executor, concurrent.futures.ProcessPoolExecutor
+        )
+        if self.reports:
+            call = functools.partial(call, progress=self._report)
+        self.future = loop.run_in_executor(executor, call)
+        self.future.add_done_callback(self._done)
+
+    def _report(self, done: int, total: int):
+        # runs in the worker
+        if self.cancelled.is_set():
+            raise EvaluationCancelled()
+        self.loop.call_soon_threadsafe(self._notify, done, total)
+
+    def _notify(self, done: int, total: int):
+        # the completion is reported by _done, to every listener, once the result is ready
+        self.total = total
+        if done >= total:
+            return
+        for listener in self.listeners:
+            if listener is not None:
+                listener(done, total)
+
+    def _done(self, future: asyncio.Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        for listener in self.listeners:
+            if listener is not None:
+                listener(self.total, self.total)
+
+    def cancel(self):
+        self.cancelled.set()
+        self.future.cancel()
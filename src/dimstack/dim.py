@@ -1,13 +1,74 @@
-import itertools
-import logging
+import contextlib
+import contextvars
 import textwrap
+import threading
 from typing import Any
 
+import numpy as np
+
 from . import dist
-from .display import display_df
+from .display import display_df, format_number
+from .stats import C_p, C_pk
 from .tolerance import Bilateral
 from .utils import POSITIVE, nround, sign, sign_symbol
-from .stats import C_p, C_pk
+
+
+class IDAllocator:
+    """
+    Thread-safe allocator of sequential dimension IDs.
+
+    Args:
+        start (int, optional): The first ID. Defaults to 0.
+    """
+
+    def __init__(self, start: int = 0):
+        self._next = start
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self._lock:
+            id = self._next
+            self._next += 1
+        return id
+
+    def reset(self, start: int = 0):
+        """Restart the IDs at `start`."""
+        with self._lock:
+            self._next = start
+
+
+IDS = IDAllocator()
+_ID_SCOPE: contextvars.ContextVar[IDAllocator | None] = contextvars.ContextVar("id_scope", default=None)
+
+
+def new_id() -> int:
+    """Allocate a dimension ID from the current `id_scope`, or from the global `IDS`."""
+    scope = _ID_SCOPE.get()
+    return (IDS if scope is None else scope)()
+
+
+@contextlib.contextmanager
+def id_scope(start: int = 0):
+    """
+    Allocate the IDs of the dimensions created in this context from a private
+    counter, so they are deterministic whatever other threads or tasks create.
+
+    >>> with id_scope():
+    ...     [Basic(nom=1, tol=Bilateral.symmetric(0.1)).id for _ in range(3)]
+    [0, 1, 2]
+
+    Args:
+        start (int, optional): The first ID of the scope. Defaults to 0.
+
+    Yields:
+        IDAllocator: The allocator of the scope.
+    """
+    allocator = IDAllocator(start)
+    token = _ID_SCOPE.set(allocator)
+    try:
+        yield allocator
+    finally:
+        _ID_SCOPE.reset(token)
 
 
 class Basic:
@@ -22,7 +83,9 @@ class Basic:
         desc (str, optional): The description of the measurement. Defaults to "Dimension".
     """
 
-    newID = itertools.count().__next__
+    __slots__ = ("a", "description", "dir", "id", "name", "nominal", "tolerance")
+
+    newID = staticmethod(new_id)
 
     def __init__(
         self,
@@ -75,6 +138,11 @@ class Basic:
             "Abs. Bounds": f"[{nround(self.abs_lower)}, {nround(self.abs_upper)}]",
         }
 
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of everything that affects an analysis of this dimension."""
+        return (self.name, self.description, self.dir, self.nominal, self.tolerance.key, self.a)
+
     @property
     def nom_direction_sign(self) -> str:
         return sign_symbol(self.dir)
@@ -146,7 +214,7 @@ class Basic:
 
     def review(
         self,
-        distribution: dist.Uniform | dist.Normal | dist.NormalScreened | None = None,
+        distribution: dist.Uniform | dist.Normal | dist.NormalScreened | dist.Radial | dist.HalfNormal | None = None,
     ) -> "Reviewed":
         """Convert the dimension to a reviewed dimension."""
         return Reviewed(self, distribution)
@@ -167,13 +235,13 @@ class Stack:
         return f"{self.name}: {self.dims}"
 
     def _repr_html_(self):
-        return display_df(self.dict, f"DIMENSION STACK: {self.name}", dispmode="html")
+        return display_df(self.columns, f"DIMENSION STACK: {self.name}", dispmode="html")
 
     def _display_(self):
-        return display_df(self.dict, f"DIMENSION STACK: {self.name}")
+        return display_df(self.columns, f"DIMENSION STACK: {self.name}")
 
     def show(self, expand=False):
-        return display_df(self.dict, f"DIMENSION STACK: {self.name}")
+        return display_df(self.columns, f"DIMENSION STACK: {self.name}")
 
     def append(self, measurement: Basic):
         """Append a measurement to the stack."""
@@ -183,6 +251,28 @@ class Stack:
     def dict(self) -> list[dict[str, Any]]:
         return [dim.dict for dim in self.dims]
 
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the stack and all of its dimensions."""
+        return (self.name, self.description, tuple(dim.key for dim in self.dims))
+
+    @property
+    def columns(self) -> "dict[str, list[str]]":
+        """The table of `dict` by column, with each column of numbers rounded at once."""
+        dims = self.dims
+        lower = format_number([dim.abs_lower for dim in dims])
+        upper = format_number([dim.abs_upper for dim in dims])
+        return {
+            "ID": [str(dim.id) for dim in dims],
+            "Name": [str(dim.name) for dim in dims],
+            "Desc.": [str(dim.description) for dim in dims],
+            "±": [dim.nom_direction_sign for dim in dims],
+            "Nom.": format_number(np.array([dim.nominal for dim in dims])),
+            "Tol.": [str(dim.tolerance).ljust(14, " ") for dim in dims],
+            "Sens. (a)": [str(dim.a) for dim in dims],
+            "Abs. Bounds": [f"[{lo}, {up}]" for lo, up in zip(lower, upper)],
+        }
+
 
 class Reviewed:
     """Reviewed
@@ -192,17 +282,19 @@ class Reviewed:
         distribution (str, optional): The distribution of the measurement. Defaults to "Normal".
     """
 
+    __slots__ = ("dim", "distribution")
+
     dim: Basic
-    distribution: dist.Uniform | dist.Normal | dist.NormalScreened
+    distribution: dist.Uniform | dist.Normal | dist.NormalScreened | dist.Radial | dist.HalfNormal
 
     def __init__(
         self,
         dim: Basic,
-        distribution: dist.Uniform | dist.Normal | dist.NormalScreened | None = None,
+        distribution: dist.Uniform | dist.Normal | dist.NormalScreened | dist.Radial | dist.HalfNormal | None = None,
     ):
         self.dim = dim
         if distribution is None:
-            self.assume_normal_dist(6)
+            self.assume_tolerance_dist(6)
         else:
             self.distribution = distribution
 
@@ -231,12 +323,21 @@ class Reviewed:
             "μ_eff": nround(self.mean_eff),
             "σ_eff": nround(self.std_dev_eff),
             "Eff. Sigma": f"± {str(nround(self.process_sigma_eff))}σ",
-            "Yield Prob.": f"{nround(self.yield_probability*100, 8)}" if self.yield_probability is not None else "",
-            "Reject PPM": f"{nround(self.yield_loss_probability*1000000, 2)}"
+            "Yield Prob.": f"{nround(self.yield_probability * 100, 8)}" if self.yield_probability is not None else "",
+            "Reject PPM": f"{nround(self.yield_loss_probability * 1000000, 2)}"
             if self.yield_loss_probability is not None
             else "",
         }
 
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of everything that affects an analysis of this dimension."""
+        return (self.dim.key, self.distribution.key)
+
+    def sample(self, n: int, random_state=None):
+        """Draw n absolute values of the dimension from its distribution."""
+        return self.distribution.sample(n, random_state=random_state)
+
     def assume_normal_dist(self, target_process_sigma: float):
         """Assume a normal distribution."""
         mean = self.mean_eff
@@ -245,6 +346,17 @@ class Reviewed:
         # logging.warning(f"Assuming Normal Dist. for {self}")
         return self
 
+    def assume_tolerance_dist(self, target_process_sigma: float):
+        """
+        Assume the statistical model of the tolerance, e.g. the radial error of a
+        position tolerance, or a normal distribution for a Bilateral tolerance.
+        """
+        model = getattr(self.dim.tolerance, "distribution", None)
+        if model is None:
+            return self.assume_normal_dist(target_process_sigma)
+        self.distribution = model(self.dim, target_process_sigma)
+        return self
+
     def assume_normal_dist_shifted(self, target_process_sigma, shift) -> "Reviewed":
         """Assume a normal distribution with a shift"""
         self.assume_normal_dist(target_process_sigma)
@@ -291,6 +403,10 @@ class Reviewed:
                 (self.dim.abs_upper - self.distribution.mean), (self.distribution.mean - self.dim.abs_lower)
             )
             return (self.dim.tolerance.T * self.distribution.std_dev) / (2 * outer_shift)
+        if isinstance(self.distribution, (dist.Radial, dist.HalfNormal)):
+            # statistical models of GD&T tolerances: the spread about the middle of the tolerance
+            mean, variance = self.distribution.moments()[:2]
+            return float(np.sqrt(variance + (mean - self.mean_eff) ** 2))
         return 0
 
     @property
@@ -354,13 +470,13 @@ class ReviewedStack:
         return f"{self.name}: {self.dims}"
 
     def _repr_html_(self):
-        return display_df(self.dict, f"REVIEWED DIMENSION STACK: {self.name}", dispmode="html")
+        return display_df(self.columns, f"REVIEWED DIMENSION STACK: {self.name}", dispmode="html")
 
     def _display_(self):
-        return display_df(self.dict, f"REVIEWED DIMENSION STACK: {self.name}")
+        return display_df(self.columns, f"REVIEWED DIMENSION STACK: {self.name}")
 
     def show(self, expand=False):
-        return display_df(self.dict, f"REVIEWED DIMENSION STACK: {self.name}")
+        return display_df(self.columns, f"REVIEWED DIMENSION STACK: {self.name}")
 
     def append(self, measurement: Reviewed):
         """Append a measurement to the stack."""
@@ -370,6 +486,30 @@ class ReviewedStack:
     def dict(self) -> list[dict[str, Any]]:
         return [dim.dict for dim in self.dims]
 
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the stack and all of its dimensions."""
+        return (self.name, self.description, tuple(dim.key for dim in self.dims))
+
+    @property
+    def columns(self) -> "dict[str, list[str]]":
+        """The table of `dict` by column, with each column of numbers rounded at once."""
+        dims = self.dims
+        normal = [isinstance(dim.distribution, dist.Normal) for dim in dims]
+        yields = [dim.yield_probability for dim in dims]
+        return {
+            "Dim.": [f"{dim.dim}" for dim in dims],
+            "Dist.": [f"{dim.distribution}" for dim in dims],
+            "Shift (k)": format_number(np.array([dim.k for dim in dims])),
+            "C_p": format_number([dim.C_p if n else None for dim, n in zip(dims, normal)]),
+            "C_pk": format_number([dim.C_pk if n else None for dim, n in zip(dims, normal)]),
+            "μ_eff": format_number(np.array([dim.mean_eff for dim in dims])),
+            "σ_eff": format_number(np.array([dim.std_dev_eff for dim in dims])),
+            "Eff. Sigma": [f"± {sigma}σ" for sigma in format_number([dim.process_sigma_eff for dim in dims])],
+            "Yield Prob.": format_number([y * 100 for y in yields], 8),
+            "Reject PPM": format_number([(1 - y) * 1000000 for y in yields], 2),
+        }
+
     def to_basic_stack(self) -> Stack:
         """Convert the stack to a basic stack."""
         return Stack(
@@ -433,7 +573,9 @@ class Requirement:
                 "Distribution": str(self.distribution),
                 "Median": nround(self.median),
                 "Spec. Limits": f"[{nround(self.LL)}, {nround(self.UL)}]",
-                "Yield Prob.": f"{nround(self.yield_probability*100, 8)}" if self.yield_probability is not None else "",
+                "Yield Prob.": f"{nround(self.yield_probability * 100, 8)}"
+                if self.yield_probability is not None
+                else "",
                 "Reject PPM": f"{nround(self.R, 2)}",
             }
         ]
@@ -1,10 +1,15 @@
-from typing import Any, Iterable
+import contextlib
+import contextvars
+from typing import Any, Iterable, Mapping, Sequence
 from enum import Enum
 
+import numpy as np
 import pandas as pd
 from rich.console import Console
 from rich.table import Table
 
+from .utils import DECIMALS, nround
+
 
 class DisplayMode(Enum):
     """Display modes for the stack.
@@ -28,11 +33,17 @@ class DisplayMode(Enum):
 
 DISPLAY_MODE = DisplayMode.TEXT
 FIGSIZE = (6, 3)
+PAGE_SIZE = 500
+
+_DISPLAY_MODE: contextvars.ContextVar[DisplayMode | str | None] = contextvars.ContextVar("display_mode", default=None)
 
 
 def mode(dispmode: DisplayMode | str):
     """Set the display mode for the stack.
 
+    This is the default of every thread; use `context` to override it in one
+    thread or task only.
+
     Args:
         dispmode (DisplayMode | str): Display mode to set.
     """
@@ -40,40 +51,153 @@ def mode(dispmode: DisplayMode | str):
     DISPLAY_MODE = dispmode
 
 
-def display_df(data: Iterable[dict[Any, Any]], title: str = "", dispmode=None):
-    """Display a dataframe.
+def current_mode() -> DisplayMode | str:
+    """The display mode of the current context."""
+    dispmode = _DISPLAY_MODE.get()
+    return DISPLAY_MODE if dispmode is None else dispmode
+
+
+@contextlib.contextmanager
+def context(dispmode: DisplayMode | str):
+    """Set the display mode in the current context (thread or asyncio task) only.
+
+    >>> with context(DisplayMode.STRING):
+    ...     print(display_df([{"A": 1.0}]))
+      A
+    1.0
+
+    Args:
+        dispmode (DisplayMode | str): Display mode to set.
+    """
+    token = _DISPLAY_MODE.set(dispmode)
+    try:
+        yield
+    finally:
+        _DISPLAY_MODE.reset(token)
+
+
+def format_number(values: Sequence[float] | np.ndarray, ndigits: int = DECIMALS) -> list[str]:
+    """Format a column of numbers like `str(nround(value, ndigits))`.
+
+    The column is rounded at once instead of value by value. Integers are
+    formatted as they are and None is formatted as an empty cell.
 
     Args:
-        df (pd.DataFrame): _description_
+        values (Sequence[float | None] | np.ndarray): The numbers.
+        ndigits (int, optional): Number of decimals. Defaults to DECIMALS.
+
+    Returns:
+        list[str]: The formatted numbers.
+    """
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind in "iub":
+            return [str(value) for value in values.tolist()]
+        return [str(value) for value in nround(values, ndigits).tolist()]
+    rounded = nround(np.array([np.nan if value is None else value for value in values], dtype=float), ndigits)
+    return [
+        "" if value is None else str(value) if isinstance(value, int) else str(r)
+        for value, r in zip(values, rounded.tolist())
+    ]
+
+
+def display_df(
+    data: Iterable[dict[Any, Any]] | Mapping[str, Sequence[Any]],
+    title: str = "",
+    dispmode=None,
+    page: int = 0,
+    page_size: int | None = PAGE_SIZE,
+):
+    """Display a table.
+
+    The table is formatted column by column without pandas, except for the
+    HTML, NOTEBOOK and DF modes. Numeric arrays are rounded with `format_number`.
+    In the HTML and NOTEBOOK modes only one page of the table is rendered.
+
+    Args:
+        data (Iterable[dict] | Mapping[str, Sequence]): The rows of the table, or its columns.
+        title (str, optional): The title of the table. Defaults to "".
+        dispmode (DisplayMode | str, optional): The display mode. Defaults to `current_mode()`.
+        page (int, optional): The page to render in the HTML and NOTEBOOK modes. Defaults to 0.
+        page_size (int, optional): The number of rows of a page, None for all rows. Defaults to PAGE_SIZE.
     """
     if dispmode is None:
-        dispmode = DISPLAY_MODE
+        dispmode = current_mode()
+    if isinstance(dispmode, str):
+        try:
+            dispmode = DisplayMode(dispmode)
+        except ValueError:
+            return data
 
-    df = pd.DataFrame(data).astype(str)
+    columns = _columns(data)
 
     if dispmode == DisplayMode.TEXT:
         if title:
             print(f"{title}")
-        print(df.to_string(index=False))
+        print(_to_string(columns))
         print()
     elif dispmode == DisplayMode.STRING:
-        return df.to_string(index=False)
-    elif dispmode == DisplayMode.HTML:
-        return df.style.hide(axis="index").set_caption(title).set_properties(**{"text-align": "left"})
-    elif dispmode == DisplayMode.NOTEBOOK:
+        return _to_string(columns)
+    elif dispmode in (DisplayMode.HTML, DisplayMode.NOTEBOOK):
+        rows = len(next(iter(columns.values()), []))
+        if page_size is not None and rows > page_size:
+            start = page * page_size
+            stop = min(start + page_size, rows)
+            columns = {name: values[start:stop] for name, values in columns.items()}
+            title = f"{title} (rows {start + 1}-{stop} of {rows})"
+        df = pd.DataFrame(columns)
         return df.style.hide(axis="index").set_caption(title).set_properties(**{"text-align": "left"})
     # elif dispmode == "dict":
     #     print(df.to_dict())
     elif dispmode == DisplayMode.DF:
-        return df
+        return pd.DataFrame(columns)
     elif dispmode == DisplayMode.RICH:
         console = Console()
         table = Table(title=title)
-        for col in df.columns:
+        for col in columns:
             table.add_column(col)
-        for row in df.itertuples(index=False):
+        for row in zip(*columns.values()):
             table.add_row(*row)
         console.print(table)
         print()
     else:
         return data
+
+
+def _columns(data: Iterable[dict[Any, Any]] | Mapping[str, Sequence[Any]]) -> dict[str, list[str]]:
+    """The cells of a table as strings, by column."""
+    if isinstance(data, Mapping):
+        return {
+            str(name): ["NaN" if value == "nan" else value for value in format_number(values)]
+            if isinstance(values, np.ndarray)
+            else [_cell(value) for value in values]
+            for name, values in data.items()
+        }
+    rows = list(data)
+    names = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+    columns = {}
+    for name in names:
+        values = [row.get(name, np.nan) for row in rows]
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            # a numeric column with any float is a float column (as in a DataFrame)
+            values = np.asarray(values).tolist()
+        columns[str(name)] = [_cell(value) for value in values]
+    return columns
+
+
+def _cell(value: Any) -> str:
+    """A cell as a string, with missing values shown as `NaN` (as in a DataFrame)."""
+    if isinstance(value, float) and np.isnan(value):
+        return "NaN"
+    return str(value)
+
+
+def _to_string(columns: dict[str, list[str]]) -> str:
+    """Render the columns right-aligned, like `DataFrame.to_string(index=False)`."""
+    if not columns:
+        return "Empty DataFrame\nColumns: []\nIndex: []"
+    widths = [max(len(name), *(len(value) for value in values)) for name, values in columns.items()]
+    lines = [" ".join(name.rjust(width) for name, width in zip(columns, widths))]
+    lines.extend(" ".join(value.rjust(width) for value, width in zip(row, widths)) for row in zip(*columns.values()))
+    return "\n".join(lines)
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import norm, uniform
+from scipy.optimize import least_squares
+from scipy.special import ndtri
+from scipy.stats import johnsonsb, johnsonsu, norm, truncnorm, uniform
 
 from .utils import nround
 
@@ -19,6 +21,8 @@ class Uniform:
         upper (float): Upper limit.
     """
 
+    __slots__ = ("lower", "upper")
+
     def __init__(self, lower: float, upper: float):
         self.lower = lower
         self.upper = upper
@@ -26,9 +30,18 @@ class Uniform:
     def __str__(self) -> str:
         return f"Uniform Dist. [{nround(self.lower)}, {nround(self.upper)}]"
 
-    def sample(self, n: int):
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the distribution parameters."""
+        return ("Uniform", self.lower, self.upper)
+
+    def sample(self, n: int, random_state=None):
         # return np.random.uniform(self.lower, self.upper, n)
-        return uniform.rvs(loc=self.lower, scale=self.upper - self.lower, size=n)
+        return uniform.rvs(loc=self.lower, scale=self.upper - self.lower, size=n, random_state=random_state)
+
+    def moments(self) -> tuple[float, float, float, float]:
+        """Mean, variance, skewness and excess kurtosis."""
+        return ((self.lower + self.upper) / 2, (self.upper - self.lower) ** 2 / 12, 0.0, -1.2)
 
     def pdf(self, x: float):
         return uniform.pdf(x, loc=self.lower, scale=self.upper - self.lower)
@@ -36,6 +49,10 @@ class Uniform:
     def cdf(self, x: float):
         return uniform.cdf(x, loc=self.lower, scale=self.upper - self.lower)
 
+    def ppf(self, q: float | np.ndarray):
+        """Inverse of the cdf."""
+        return self.lower + (self.upper - self.lower) * np.asarray(q, dtype=float)
+
 
 class Normal:
     """Normal distribution.
@@ -45,6 +62,8 @@ class Normal:
         std_dev (float): Standard deviation.
     """
 
+    __slots__ = ("data", "mean", "std_dev")
+
     def __init__(self, mean: float, std_dev: float):
         self.mean = mean
         self.std_dev = std_dev
@@ -57,9 +76,18 @@ class Normal:
     def variance(self):
         return self.std_dev**2
 
-    def sample(self, n: int):
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the distribution parameters."""
+        return ("Normal", self.mean, self.std_dev)
+
+    def sample(self, n: int, random_state=None):
         # return np.random.normal(self.mean, self.std_dev, n)
-        return norm.rvs(loc=self.mean, scale=self.std_dev, size=n)
+        return norm.rvs(loc=self.mean, scale=self.std_dev, size=n, random_state=random_state)
+
+    def moments(self) -> tuple[float, float, float, float]:
+        """Mean, variance, skewness and excess kurtosis."""
+        return (self.mean, self.variance, 0.0, 0.0)
 
     def pdf(self, x: float):
         return norm.pdf(x, loc=self.mean, scale=self.std_dev)
@@ -67,6 +95,10 @@ class Normal:
     def cdf(self, x: float):
         return norm.cdf(x, loc=self.mean, scale=self.std_dev)
 
+    def ppf(self, q: float | np.ndarray):
+        """Inverse of the cdf."""
+        return self.mean + self.std_dev * ndtri(q)
+
     @classmethod
     def fit(cls, data: np.ndarray | list[float] | list[int] | list[np.float64] | pd.Series):
         mean, std_dev = norm.fit(data)
@@ -87,6 +119,8 @@ class NormalScreened:
 
     # https://en.wikipedia.org/wiki/Truncated_normal_distribution
 
+    __slots__ = ("lower", "mean", "std_dev", "upper")
+
     def __init__(self, mean: float, std_dev: float, lower: float, upper: float):
         self.mean = mean
         self.std_dev = std_dev
@@ -96,22 +130,326 @@ class NormalScreened:
     def __str__(self) -> str:
         return f"Normal Screened Dist. μ={nround(self.mean)}, σ={nround(self.std_dev)} [{nround(self.lower)}, {nround(self.upper)}]"
 
-    def sample(self, n: int):
-        numbers = norm.rvs(loc=self.mean, scale=self.std_dev, size=n)
-        # filter out numbers that are not between lower and upper
-        screenednumbers = np.extract((numbers >= self.lower) & (numbers <= self.upper), numbers)
-        return screenednumbers
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the distribution parameters."""
+        return ("NormalScreened", self.mean, self.std_dev, self.lower, self.upper)
+
+    def sample(self, n: int, random_state=None):
+        # draw from the truncated normal directly so that exactly n screened parts are returned
+        a = (self.lower - self.mean) / self.std_dev
+        b = (self.upper - self.mean) / self.std_dev
+        return truncnorm.rvs(a, b, loc=self.mean, scale=self.std_dev, size=n, random_state=random_state)
+
+    def moments(self) -> tuple[float, float, float, float]:
+        """Mean, variance, skewness and excess kurtosis of the screened (truncated) population."""
+        a = (self.lower - self.mean) / self.std_dev
+        b = (self.upper - self.mean) / self.std_dev
+        return tuple(float(m) for m in truncnorm.stats(a, b, loc=self.mean, scale=self.std_dev, moments="mvsk"))
+
+    def pdf(self, x: float | np.ndarray):
+        x = np.asarray(x, dtype=float)
+        inside = (x >= self.lower) & (x <= self.upper)
+        result = np.where(inside, norm.pdf(x, loc=self.mean, scale=self.std_dev), 0.0)
+        return result if result.ndim else float(result)
+
+    def cdf(self, x: float | np.ndarray):
+        x = np.asarray(x, dtype=float)
+        result = np.where(
+            x < self.lower, 0.0, np.where(x > self.upper, 1.0, norm.cdf(x, loc=self.mean, scale=self.std_dev))
+        )
+        return result if result.ndim else float(result)
+
+    def ppf(self, q: float | np.ndarray):
+        """Inverse of the cdf of the screened population."""
+        lower = norm.cdf(self.lower, loc=self.mean, scale=self.std_dev)
+        upper = norm.cdf(self.upper, loc=self.mean, scale=self.std_dev)
+        x = self.mean + self.std_dev * ndtri(lower + (upper - lower) * np.asarray(q, dtype=float))
+        return np.clip(x, self.lower, self.upper)
+
+
+class Johnson:
+    """Johnson distribution. A four parameter family that can represent any
+    combination of mean, variance, skewness and kurtosis.
+
+    SU is the unbounded family (heavier tails than the normal) and SB the bounded
+    family (lighter tails, bounded between loc and loc + scale).
+
+    Args:
+        family (str): "SU" or "SB".
+        gamma (float): First shape parameter.
+        delta (float): Second shape parameter.
+        loc (float): Location.
+        scale (float): Scale.
+    """
+
+    __slots__ = ("delta", "family", "gamma", "loc", "scale")
+
+    def __init__(self, family: str, gamma: float, delta: float, loc: float, scale: float):
+        self.family = family
+        self.gamma = gamma
+        self.delta = delta
+        self.loc = loc
+        self.scale = scale
+
+    def __str__(self) -> str:
+        return (
+            f"Johnson {self.family} Dist. γ={nround(self.gamma)}, δ={nround(self.delta)}, "
+            f"ξ={nround(self.loc)}, λ={nround(self.scale)}"
+        )
+
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the distribution parameters."""
+        return ("Johnson", self.family, self.gamma, self.delta, self.loc, self.scale)
+
+    @property
+    def _frozen(self):
+        family = johnsonsu if self.family == "SU" else johnsonsb
+        return family(self.gamma, self.delta, loc=self.loc, scale=self.scale)
+
+    def moments(self) -> tuple[float, float, float, float]:
+        """Mean, variance, skewness and excess kurtosis."""
+        mean, variance, skewness, kurtosis = _johnson_moments(self.family, self.gamma, self.delta)
+        return (self.loc + self.scale * mean, self.scale**2 * variance, skewness, kurtosis)
+
+    def sample(self, n: int, random_state=None):
+        return self._frozen.rvs(size=n, random_state=random_state)
 
     def pdf(self, x: float):
-        if x < self.lower:
-            return 0
-        elif x > self.upper:
-            return 0
-        return norm.pdf(x, loc=self.mean, scale=self.std_dev)
+        return self._frozen.pdf(x)
 
     def cdf(self, x: float):
-        if x < self.lower:
-            return 0
-        elif x > self.upper:
-            return 1
-        return norm.cdf(x, loc=self.mean, scale=self.std_dev)
+        return self._frozen.cdf(x)
+
+    def ppf(self, q: float | np.ndarray):
+        """Inverse of the cdf."""
+        return self._frozen.ppf(q)
+
+
+class Radial:
+    """Component of a radial (true position) error along the stack.
+
+    The feature is displaced from its true position by an isotropic 2D normal
+    error of standard deviation `std_dev` per axis, so the radial error is
+    Rayleigh distributed. Features outside the circular zone are rejected: the
+    zone radius is `radius`, plus half the bonus tolerance of the feature (its
+    departure from MMC or LMC, normal over [0, `bonus`]). The contributor is the
+    component of the error along the stack, x = r·cos(φ).
+
+    Args:
+        mean (float): True position.
+        std_dev (float): Standard deviation of the error along each axis.
+        radius (float): Radius of the tolerance zone without bonus.
+        bonus (float, optional): Largest bonus (diameter) of the tolerance zone. Defaults to 0.
+    """
+
+    __slots__ = ("bonus", "mean", "radius", "std_dev")
+
+    def __init__(self, mean: float, std_dev: float, radius: float, bonus: float = 0):
+        self.mean = mean
+        self.std_dev = std_dev
+        self.radius = radius
+        self.bonus = bonus
+
+    def __str__(self) -> str:
+        bonus = f" + {nround(self.bonus / 2)}" if self.bonus else ""
+        return f"Radial Dist. μ={nround(self.mean)}, σ={nround(self.std_dev)}, R={nround(self.radius)}{bonus}"
+
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the distribution parameters."""
+        return ("Radial", self.mean, self.std_dev, self.radius, self.bonus)
+
+    def _zones(self) -> tuple[np.ndarray, np.ndarray]:
+        """Zone radii and weights of the quadrature over the bonus."""
+        if not self.bonus:
+            return np.array([self.radius]), np.array([1.0])
+        return self.radius + self.bonus * np.clip(0.5 + _GH_NODES / 6, 0, 1) / 2, _GH_WEIGHTS
+
+    def sample(self, n: int, random_state=None):
+        return radial(self.mean, self.std_dev, self.radius, self.bonus, n, np.random.default_rng(random_state))
+
+    def moments(self) -> tuple[float, float, float, float]:
+        """Mean, variance, skewness and excess kurtosis."""
+        radii, weights = self._zones()
+        # r² / 2σ² is exponential, truncated at c = R² / 2σ²
+        c = radii**2 / (2 * self.std_dev**2)
+        small = c < 1e-8
+        c = np.where(small, 1.0, c)
+        s1 = np.where(small, radii**2 / (4 * self.std_dev**2), 1 - c * np.exp(-c) / -np.expm1(-c))
+        s2 = np.where(small, radii**4 / (12 * self.std_dev**4), (2 - np.exp(-c) * (c**2 + 2 * c + 2)) / -np.expm1(-c))
+        # x = r·cos(φ): E[cos²] = 1/2, E[cos⁴] = 3/8
+        variance = float(weights @ s1) * self.std_dev**2
+        fourth = 1.5 * float(weights @ s2) * self.std_dev**4
+        return (self.mean, variance, 0.0, fourth / variance**2 - 3 if variance > 0 else 0.0)
+
+    def pdf(self, x: float | np.ndarray):
+        d = np.asarray(x, dtype=float)[..., None] - self.mean
+        radii, weights = self._zones()
+        inside = np.sqrt(np.clip(radii**2 - d**2, 0, None))
+        density = norm.pdf(d, scale=self.std_dev) * (2 * norm.cdf(inside / self.std_dev) - 1)
+        result = (density / -np.expm1(-(radii**2) / (2 * self.std_dev**2))) @ weights
+        return result if result.ndim else float(result)
+
+    def _grid(self) -> tuple[np.ndarray, np.ndarray]:
+        # the density is negligible beyond 10σ
+        outer = min(self.radius + self.bonus / 2, 10 * self.std_dev)
+        x = np.linspace(self.mean - outer, self.mean + outer, 4097)
+        density = self.pdf(x)
+        total = np.concatenate([[0], np.cumsum((density[1:] + density[:-1]) / 2 * np.diff(x))])
+        return x, total / total[-1]
+
+    def cdf(self, x: float | np.ndarray):
+        grid, total = self._grid()
+        result = np.interp(x, grid, total)
+        return result if np.ndim(result) else float(result)
+
+    def ppf(self, q: float | np.ndarray):
+        """Inverse of the cdf."""
+        grid, total = self._grid()
+        return np.interp(q, total, grid)
+
+
+def radial(
+    mean: float | np.ndarray,
+    std_dev: float | np.ndarray,
+    radius: float | np.ndarray,
+    bonus: float | np.ndarray,
+    n: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Draw from `Radial` distributions, n draws for every (broadcast) set of parameters.
+
+    Args:
+        mean (float | np.ndarray): True positions.
+        std_dev (float | np.ndarray): Standard deviations of the error along each axis.
+        radius (float | np.ndarray): Radii of the tolerance zones without bonus.
+        bonus (float | np.ndarray): Largest bonuses (diameters) of the tolerance zones.
+        n (int): Number of draws per distribution.
+        rng (np.random.Generator): Random number generator.
+
+    Returns:
+        np.ndarray: The draws, shaped (..., n).
+    """
+    mean, std_dev, radius, bonus = (np.asarray(p, dtype=float)[..., None] for p in (mean, std_dev, radius, bonus))
+    shape = np.broadcast(mean, std_dev, radius, bonus).shape[:-1] + (n,)
+    if bonus.any():
+        radius = radius + bonus * np.clip(0.5 + rng.standard_normal(shape) / 6, 0, 1) / 2
+    # inverse cdf of the Rayleigh radius, truncated at the zone
+    accepted = -np.expm1(-(radius**2) / (2 * std_dev**2))
+    r = std_dev * np.sqrt(-2 * np.log1p(-rng.random(shape) * accepted))
+    return mean + r * np.cos(2 * np.pi * rng.random(shape))
+
+
+class HalfNormal:
+    """Half-normal distribution, screened at a width, e.g. the form error of a surface from its contact plane.
+
+    Args:
+        edge (float): The zero-error side of the zone, where the density is highest.
+        std_dev (float): Standard deviation of the underlying normal.
+        width (float): Signed width of the zone, from the edge.
+    """
+
+    __slots__ = ("edge", "std_dev", "width")
+
+    def __init__(self, edge: float, std_dev: float, width: float):
+        self.edge = edge
+        self.std_dev = std_dev
+        self.width = width
+
+    def __str__(self) -> str:
+        return f"Half-Normal Dist. [{nround(self.edge)}, {nround(self.edge + self.width)}], σ={nround(self.std_dev)}"
+
+    @property
+    def key(self) -> tuple:
+        """Hashable summary of the distribution parameters."""
+        return ("HalfNormal", self.edge, self.std_dev, self.width)
+
+    @property
+    def _frozen(self):
+        b = abs(self.width) / self.std_dev
+        a, b = (0, b) if self.width >= 0 else (-b, 0)
+        return truncnorm(a, b, loc=self.edge, scale=self.std_dev)
+
+    def sample(self, n: int, random_state=None):
+        return self._frozen.rvs(size=n, random_state=random_state)
+
+    def moments(self) -> tuple[float, float, float, float]:
+        """Mean, variance, skewness and excess kurtosis."""
+        return tuple(float(m) for m in self._frozen.stats(moments="mvsk"))
+
+    def pdf(self, x: float | np.ndarray):
+        return self._frozen.pdf(x)
+
+    def cdf(self, x: float | np.ndarray):
+        return self._frozen.cdf(x)
+
+    def ppf(self, q: float | np.ndarray):
+        """Inverse of the cdf."""
+        return self._frozen.ppf(q)
+
+
+# probabilists' Gauss-Hermite rule, used for the moments of the bounded Johnson family
+_GH_NODES, _GH_WEIGHTS = np.polynomial.hermite_e.hermegauss(96)
+_GH_WEIGHTS = _GH_WEIGHTS / np.sqrt(2 * np.pi)
+
+
+def _johnson_moments(family: str, gamma: float, delta: float) -> tuple[float, float, float, float]:
+    if family == "SU":
+        return tuple(float(m) for m in johnsonsu.stats(gamma, delta, moments="mvsk"))
+    y = 1 / (1 + np.exp(-(_GH_NODES - gamma) / delta))
+    mean = np.dot(_GH_WEIGHTS, y)
+    d = y - mean
+    variance = np.dot(_GH_WEIGHTS, d**2)
+    skewness = np.dot(_GH_WEIGHTS, d**3) / variance**1.5
+    kurtosis = np.dot(_GH_WEIGHTS, d**4) / variance**2 - 3
+    return (float(mean), float(variance), float(skewness), float(kurtosis))
+
+
+def from_moments(mean: float, variance: float, skewness: float = 0, kurtosis: float = 0) -> "Normal | Johnson":
+    """
+    Fit a distribution to the first four moments.
+
+    A Normal distribution is returned when the skewness and excess kurtosis are
+    negligible, otherwise the Johnson SU or SB distribution with the same moments
+    (SU above the lognormal line of the skewness-kurtosis plane, SB below it).
+
+    Args:
+        mean (float): Mean.
+        variance (float): Variance.
+        skewness (float, optional): Skewness. Defaults to 0.
+        kurtosis (float, optional): Excess kurtosis. Defaults to 0.
+
+    Returns:
+        Normal | Johnson: The fitted distribution.
+    """
+    if abs(skewness) < 1e-6 and abs(kurtosis) < 1e-6:
+        return Normal(mean, variance**0.5)
+
+    # every distribution has kurtosis >= skewness^2 - 2 (excess)
+    kurtosis = max(kurtosis, skewness**2 - 2 + 1e-6)
+    # lognormal line: skewness^2 = (w - 1)(w + 2)^2 and kurtosis = w^4 + 2w^3 + 3w^2 - 6
+    w = max(np.roots([1, 3, 0, -4 - skewness**2]).real)
+    family = "SU" if kurtosis > w**4 + 2 * w**3 + 3 * w**2 - 6 else "SB"
+
+    def residual(params):
+        _, _, s, k = _johnson_moments(family, params[0], params[1])
+        return [s - skewness, k - kurtosis]
+
+    best = None
+    for delta in [0.5, 1.0, 2.0, 5.0]:
+        fit = least_squares(
+            residual,
+            [-np.sign(skewness) * delta * 0.5, delta],
+            bounds=([-50, 0.05], [50, 100]),
+        )
+        if best is None or fit.cost < best.cost:
+            best = fit
+        if best.cost < 1e-14:
+            break
+    gamma, delta = best.x
+    m, v, _, _ = _johnson_moments(family, gamma, delta)
+    scale = (variance / v) ** 0.5
+    return Johnson(family, float(gamma), float(delta), float(mean - scale * m), float(scale))
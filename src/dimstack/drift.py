@@ -0,0 +1,214 @@
+"""
+Lot sequences with drifting process means.
+
+The shift `k` of a reviewed dimension is a static offset of its process. In
+production, the mean of a process moves: it wears linearly within a lot until
+the tool is reset, and it jumps from one batch of material to the next. Drift
+models give the offset of the mean of a contributor at every part of a
+sequence of lots, and `simulate` evaluates the closure of every part of the
+sequence for many trials at once, as (trials x parts) arrays.
+"""
+
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from . import dist
+from .dim import Basic, Reviewed, ReviewedStack
+from .display import display_df
+from .utils import nround
+
+
+class Linear:
+    """Linear drift of the mean, e.g. tool wear, reset every `reset` parts.
+
+    Args:
+        rate (float): Offset per part, in the signed absolute units of the dimension.
+        reset (int, optional): Number of parts between resets (tool changes). Defaults to every lot.
+    """
+
+    __slots__ = ("rate", "reset")
+
+    def __init__(self, rate: float, reset: int | None = None):
+        self.rate = rate
+        self.reset = reset
+
+    def __str__(self) -> str:
+        return f"Linear Drift {nround(self.rate)}/part, reset every {self.reset or 'lot'}"
+
+    def offsets(self, trials: int, lots: int, lot_size: int, rng: np.random.Generator) -> np.ndarray:
+        """Offset of the mean at every part of the sequence, broadcastable to (trials, lots, lot_size)."""
+        position = np.arange(lots * lot_size) % (self.reset or lot_size)
+        return (self.rate * position).reshape(1, lots, lot_size)
+
+
+class Batch:
+    """Random offset of the mean of every lot, e.g. batches of material.
+
+    Args:
+        std_dev (float): Standard deviation of the offsets.
+        mean (float, optional): Mean of the offsets. Defaults to 0.
+    """
+
+    __slots__ = ("mean", "std_dev")
+
+    def __init__(self, std_dev: float, mean: float = 0):
+        self.std_dev = std_dev
+        self.mean = mean
+
+    def __str__(self) -> str:
+        return f"Batch Offsets μ={nround(self.mean)}, σ={nround(self.std_dev)}"
+
+    def offsets(self, trials: int, lots: int, lot_size: int, rng: np.random.Generator) -> np.ndarray:
+        """Offset of the mean at every part of the sequence, broadcastable to (trials, lots, lot_size)."""
+        return rng.normal(self.mean, self.std_dev, (trials, lots, 1))
+
+
+Drift = Linear | Batch
+
+
+def simulate(
+    stack: ReviewedStack,
+    drifts: Mapping[Basic | Reviewed, Drift | Sequence[Drift]],
+    LL: float,
+    UL: float,
+    lots: int = 10,
+    lot_size: int = 1000,
+    trials: int = 100,
+    window: int | None = None,
+    seed: int | None = None,
+) -> "LotSequence":
+    """
+    Simulate a sequence of lots with drifting contributors.
+
+    Every part of a contributor is drawn from its distribution, moved by the
+    sum of the offsets of its drift models at the position of the part in the
+    sequence. Contributors without a drift model are stationary.
+
+    >>> from dimstack.tolerance import Bilateral
+    >>> housing = Reviewed(Basic(10, Bilateral.symmetric(0.1), name="housing")).assume_normal_dist(3)
+    >>> shaft = Reviewed(Basic(-9.8, Bilateral.symmetric(0.05), name="shaft")).assume_normal_dist(3)
+    >>> stack = ReviewedStack(dims=[housing, shaft])
+    >>> result = simulate(stack, {housing: Linear(-0.0001)}, LL=0.05, UL=0.35, lots=3, lot_size=1000, seed=0)
+    >>> result.worst_window[0] > 0
+    True
+
+    Args:
+        stack (ReviewedStack): The stack.
+        drifts (Mapping[Basic | Reviewed, Drift | Sequence[Drift]]): The drift models of the drifting contributors.
+        LL (float): Lower limit of the closure.
+        UL (float): Upper limit of the closure.
+        lots (int, optional): Number of lots. Defaults to 10.
+        lot_size (int, optional): Number of parts per lot. Defaults to 1000.
+        trials (int, optional): Number of simulated sequences. Defaults to 100.
+        window (int, optional): Number of consecutive parts of the worst window. Defaults to `lot_size`.
+        seed (int, optional): Seed of the random number generator. Defaults to None.
+
+    Returns:
+        LotSequence: The closures of every part of every trial.
+    """
+    rng = np.random.default_rng(seed)
+    models: dict[int, list[Drift]] = {}
+    for dim, drift in drifts.items():
+        models[_index(stack, dim)] = [drift] if hasattr(drift, "offsets") else list(drift)
+
+    shape = (trials, lots, lot_size)
+    closures = np.zeros(shape)
+    for j, rdim in enumerate(stack.dims):
+        x = np.reshape(rdim.sample(trials * lots * lot_size, random_state=rng), shape)
+        for model in models.get(j, []):
+            x = x + model.offsets(trials, lots, lot_size, rng)
+        closures += rdim.dim.a * x
+    return LotSequence(stack, closures, LL, UL, window or lot_size)
+
+
+def _index(stack: ReviewedStack, dim: Basic | Reviewed) -> int:
+    for i, rdim in enumerate(stack.dims):
+        if rdim is dim or rdim.dim is dim:
+            return i
+    raise ValueError(f"{dim} is not in {stack.name}")
+
+
+class LotSequence:
+    """
+    Result of `simulate`.
+
+    Args:
+        stack (ReviewedStack): The stack.
+        closures (np.ndarray): (trials x lots x lot size) closures.
+        LL (float): Lower limit of the closure.
+        UL (float): Upper limit of the closure.
+        window (int): Number of consecutive parts of the worst window.
+    """
+
+    def __init__(self, stack: ReviewedStack, closures: np.ndarray, LL: float, UL: float, window: int):
+        self.stack = stack
+        self.closures = closures
+        self.LL = LL
+        self.UL = UL
+        self.window = window
+
+    def __str__(self) -> str:
+        start, worst = self.worst_window
+        return (
+            f"{self.stack.name}: yield {nround(self.yield_probability * 100, 4)}%, "
+            f"worst window of {self.window} parts {nround(worst * 100, 4)}% at part {start}"
+        )
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"LOT SEQUENCE: {self.stack.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"LOT SEQUENCE: {self.stack.name}")
+
+    def show(self):
+        return display_df(self.dict, f"LOT SEQUENCE: {self.stack.name}")
+
+    @property
+    def passed(self) -> np.ndarray:
+        """Whether every part is within the limits."""
+        return (self.closures >= self.LL) & (self.closures <= self.UL)
+
+    @property
+    def yield_probability(self) -> float:
+        """Yield over all the lots."""
+        return float(self.passed.mean())
+
+    @property
+    def lot_yield_probabilities(self) -> np.ndarray:
+        """Expected yield of every lot."""
+        return self.passed.mean(axis=(0, 2))
+
+    @property
+    def window_yield_probabilities(self) -> np.ndarray:
+        """Expected yield of every window of consecutive parts, by first part."""
+        passed = self.passed.reshape(self.closures.shape[0], -1)
+        total = np.concatenate([np.zeros((len(passed), 1)), np.cumsum(passed, axis=1)], axis=1)
+        return (total[:, self.window :] - total[:, : -self.window]).mean(axis=0) / self.window
+
+    @property
+    def worst_window(self) -> tuple[int, float]:
+        """First part and expected yield of the window with the lowest yield."""
+        yields = self.window_yield_probabilities
+        start = int(np.argmin(yields))
+        return start, float(yields[start])
+
+    @property
+    def distribution(self) -> dist.Normal:
+        """Normal distribution fitted to all the closures, i.e. the effective distribution over time."""
+        return dist.Normal.fit(self.closures.ravel())
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        means = self.closures.mean(axis=(0, 2))
+        std_devs = self.closures.std(axis=(0, 2))
+        return [
+            {
+                "Lot": str(lot + 1),
+                "Mean": nround(float(mean)),
+                "σ": nround(float(std_dev)),
+                "Yield Prob.": f"{nround(float(y) * 100, 4)}",
+                "Reject PPM": f"{nround(float(1 - y) * 1000000, 2)}",
+            }
+            for lot, (mean, std_dev, y) in enumerate(zip(means, std_devs, self.lot_yield_probabilities))
+        ]
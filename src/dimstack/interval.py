@@ -0,0 +1,345 @@
+from typing import Callable
+
+import numpy as np
+from scipy.optimize import minimize
+
+from .utils import nround
+
+
+class Interval:
+    """
+    Closed interval [lower, upper], or an array of intervals.
+
+    Intervals support the arithmetic operators and the common NumPy functions
+    (sqrt, exp, log, sin, cos, arctan, abs, maximum, minimum, ...), so a stack
+    closure written with NumPy evaluates to an Interval that is guaranteed to
+    contain every value the closure can take when its inputs are intervals.
+
+    Args:
+        lower (float | np.ndarray): Lower bound(s).
+        upper (float | np.ndarray, optional): Upper bound(s). Defaults to lower.
+
+    >>> x = Interval(1, 2)
+    >>> x * x - x
+    Interval([-1.0, 3.0])
+    >>> x**2 - x
+    Interval([-1.0, 3.0])
+    """
+
+    __array_priority__ = 1000
+
+    def __init__(self, lower, upper=None):
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(lower if upper is None else upper, dtype=float)
+
+    def __repr__(self) -> str:
+        if self.lower.ndim == 0:
+            return f"Interval([{nround(float(self.lower))}, {nround(float(self.upper))}])"
+        return f"Interval(lower={self.lower!r}, upper={self.upper!r})"
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+    def __getitem__(self, index) -> "Interval":
+        return Interval(self.lower[index], self.upper[index])
+
+    @property
+    def shape(self) -> tuple:
+        return self.lower.shape
+
+    @property
+    def width(self):
+        """Width of the interval."""
+        return self.upper - self.lower
+
+    @property
+    def mid(self):
+        """Midpoint of the interval."""
+        return (self.lower + self.upper) / 2
+
+    def contains(self, x) -> np.ndarray:
+        """Whether x lies in the interval."""
+        return (self.lower <= x) & (x <= self.upper)
+
+    def __pos__(self) -> "Interval":
+        return self
+
+    def __neg__(self) -> "Interval":
+        return Interval(-self.upper, -self.lower)
+
+    def __add__(self, other) -> "Interval":
+        other = _as_interval(other)
+        return Interval(self.lower + other.lower, self.upper + other.upper)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Interval":
+        other = _as_interval(other)
+        return Interval(self.lower - other.upper, self.upper - other.lower)
+
+    def __rsub__(self, other) -> "Interval":
+        return _as_interval(other) - self
+
+    def __mul__(self, other) -> "Interval":
+        other = _as_interval(other)
+        products = np.stack(
+            [
+                self.lower * other.lower,
+                self.lower * other.upper,
+                self.upper * other.lower,
+                self.upper * other.upper,
+            ]
+        )
+        return Interval(products.min(axis=0), products.max(axis=0))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other) -> "Interval":
+        return self * _reciprocal(_as_interval(other))
+
+    def __rtruediv__(self, other) -> "Interval":
+        return _as_interval(other) * _reciprocal(self)
+
+    def __pow__(self, exponent) -> "Interval":
+        if isinstance(exponent, (int, np.integer)) or float(exponent).is_integer():
+            exponent = int(exponent)
+            if exponent == 0:
+                return Interval(np.ones_like(self.lower))
+            if exponent < 0:
+                return _reciprocal(self ** (-exponent))
+            lo, hi = self.lower**exponent, self.upper**exponent
+            if exponent % 2:
+                return Interval(lo, hi)
+            low = np.where(self.contains(0), 0.0, np.minimum(lo, hi))
+            return Interval(low, np.maximum(lo, hi))
+        return _monotonic(lambda x: np.power(x, exponent), np.maximum(self.lower, 0), self.upper)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in _BINARY:
+            return _BINARY[ufunc](*(_as_interval(x) for x in inputs))
+        if ufunc in _UNARY:
+            return _UNARY[ufunc](inputs[0])
+        return NotImplemented
+
+
+def _as_interval(x) -> Interval:
+    if isinstance(x, Interval):
+        return x
+    return Interval(x, x)
+
+
+def _reciprocal(x: Interval) -> Interval:
+    spans_zero = (x.lower <= 0) & (x.upper >= 0)
+    with np.errstate(divide="ignore"):
+        lower = np.where(spans_zero, -np.inf, 1 / x.upper)
+        upper = np.where(spans_zero, np.inf, 1 / x.lower)
+    return Interval(lower, upper)
+
+
+def _monotonic(f, lower, upper) -> Interval:
+    return Interval(f(lower), f(upper))
+
+
+def _abs(x: Interval) -> Interval:
+    lo, hi = np.abs(x.lower), np.abs(x.upper)
+    low = np.where(x.contains(0), 0.0, np.minimum(lo, hi))
+    return Interval(low, np.maximum(lo, hi))
+
+
+def _periodic_extrema(x: Interval, peak: float) -> np.ndarray:
+    """Whether the interval contains peak + 2πk for some integer k."""
+    k = np.ceil((x.lower - peak) / (2 * np.pi))
+    return peak + 2 * np.pi * k <= x.upper
+
+
+def _sin(x: Interval) -> Interval:
+    a, b = np.sin(x.lower), np.sin(x.upper)
+    lower = np.where(_periodic_extrema(x, -np.pi / 2), -1.0, np.minimum(a, b))
+    upper = np.where(_periodic_extrema(x, np.pi / 2), 1.0, np.maximum(a, b))
+    return Interval(lower, upper)
+
+
+def _cos(x: Interval) -> Interval:
+    return _sin(x + np.pi / 2)
+
+
+_UNARY = {
+    np.negative: lambda x: -x,
+    np.positive: lambda x: x,
+    np.square: lambda x: x**2,
+    np.sqrt: lambda x: _monotonic(np.sqrt, np.maximum(x.lower, 0), x.upper),
+    np.exp: lambda x: _monotonic(np.exp, x.lower, x.upper),
+    np.log: lambda x: _monotonic(np.log, x.lower, x.upper),
+    np.arctan: lambda x: _monotonic(np.arctan, x.lower, x.upper),
+    np.tanh: lambda x: _monotonic(np.tanh, x.lower, x.upper),
+    np.absolute: _abs,
+    np.sin: _sin,
+    np.cos: _cos,
+}
+
+_BINARY = {
+    np.add: lambda x, y: x + y,
+    np.subtract: lambda x, y: x - y,
+    np.multiply: lambda x, y: x * y,
+    np.true_divide: lambda x, y: x / y,
+    np.maximum: lambda x, y: Interval(np.maximum(x.lower, y.lower), np.maximum(x.upper, y.upper)),
+    np.minimum: lambda x, y: Interval(np.minimum(x.lower, y.lower), np.minimum(x.upper, y.upper)),
+}
+
+
+class WorstCase:
+    """
+    Result of a nonlinear worst-case search.
+
+    Args:
+        lower (float): Smallest closure found.
+        upper (float): Largest closure found.
+        argmin (np.ndarray): Contributor values of the smallest closure.
+        argmax (np.ndarray): Contributor values of the largest closure.
+        bound (Interval): Guaranteed enclosure of the closure.
+    """
+
+    def __init__(self, lower: float, upper: float, argmin: np.ndarray, argmax: np.ndarray, bound: Interval):
+        self.lower = lower
+        self.upper = upper
+        self.argmin = argmin
+        self.argmax = argmax
+        self.bound = bound
+
+    def __str__(self) -> str:
+        return f"[{nround(self.lower)}, {nround(self.upper)}] (guaranteed within {self.bound})"
+
+    @property
+    def tight(self) -> bool:
+        """Whether the guaranteed enclosure matches the attained extremes."""
+        scale = max(abs(self.lower), abs(self.upper), 1.0)
+        return bool(
+            abs(float(self.bound.lower) - self.lower) <= 1e-9 * scale
+            and abs(float(self.bound.upper) - self.upper) <= 1e-9 * scale
+        )
+
+
+def worst_case(
+    func: Callable[[np.ndarray], np.ndarray],
+    lower: np.ndarray,
+    upper: np.ndarray,
+    max_boxes: int = 1024,
+    rounds: int = 16,
+) -> WorstCase:
+    """
+    Find the extremes of a closure over a box of contributor values.
+
+    The closure is evaluated on the whole box with interval arithmetic, which
+    gives a guaranteed enclosure. The enclosure is tightened by bisecting the
+    boxes that can still hold an extreme (all boxes of a round in one vectorized
+    call). Attained extremes come from a search over the tolerance corners,
+    starting at the corner selected by the gradient sign and improved by
+    single-contributor flips, followed by a bounded gradient search that finds
+    extremes inside the box. The work grows polynomially with the number of
+    contributors.
+
+    `func` receives the contributor values with the contributors along the first
+    axis and must broadcast over any trailing axes, e.g.
+    `lambda x: x[0] * np.cos(x[1]) - x[2]`.
+
+    Args:
+        func (Callable): The closure.
+        lower (np.ndarray): Lower bound of every contributor.
+        upper (np.ndarray): Upper bound of every contributor.
+        max_boxes (int, optional): Largest number of boxes kept while tightening the enclosure. Defaults to 1024.
+        rounds (int, optional): Number of bisection rounds. Defaults to 16.
+
+    Returns:
+        WorstCase: The extremes, the contributor combinations and the guaranteed enclosure.
+    """
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+
+    min_value, argmin = _search(func, lower, upper, -1)
+    max_value, argmax = _search(func, lower, upper, 1)
+    bound = _enclose(func, lower, upper, min_value, max_value, max_boxes, rounds)
+    return WorstCase(min_value, max_value, argmin, argmax, bound)
+
+
+def _evaluate(func, points: np.ndarray) -> np.ndarray:
+    return np.asarray(func(points), dtype=float)
+
+
+def _search(func, lower: np.ndarray, upper: np.ndarray, sign: int) -> tuple[float, np.ndarray]:
+    n = len(lower)
+    mid = (lower + upper) / 2
+    h = np.maximum(upper - lower, 1e-12) / 4
+    eye = np.eye(n) * h
+    values = _evaluate(func, np.hstack([mid[:, None] + eye, mid[:, None] - eye]))
+    gradient = values[:n] - values[n:]
+
+    corner = np.where(sign * gradient >= 0, upper, lower)
+    best = sign * float(_evaluate(func, corner))
+    # single flips of the current corner, all evaluated in one call
+    for _ in range(n):
+        flips = np.repeat(corner[:, None], n, axis=1)
+        flips[np.arange(n), np.arange(n)] = np.where(corner == upper, lower, upper)
+        flipped = sign * _evaluate(func, flips)
+        i = int(np.argmax(flipped))
+        if flipped[i] <= best:
+            break
+        corner = flips[:, i]
+        best = float(flipped[i])
+
+    # bounded gradient search from the best corner, for extremes inside the box
+    fit = minimize(
+        lambda x: -sign * float(_evaluate(func, x)),
+        corner,
+        method="L-BFGS-B",
+        bounds=list(zip(lower, upper)),
+    )
+    if -fit.fun > best:
+        return sign * float(-fit.fun), fit.x
+    return sign * best, corner
+
+
+def _enclose_boxes(func, lo: np.ndarray, hi: np.ndarray) -> Interval:
+    enclosure = _as_interval(func(Interval(lo, hi)))
+    return Interval(
+        np.broadcast_to(enclosure.lower, lo.shape[1:]),
+        np.broadcast_to(enclosure.upper, lo.shape[1:]),
+    )
+
+
+def _bisect(lo: np.ndarray, hi: np.ndarray, axis: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    cols = np.arange(lo.shape[1])
+    split = (lo[axis, cols] + hi[axis, cols]) / 2
+    left_hi, right_lo = hi.copy(), lo.copy()
+    left_hi[axis, cols] = split
+    right_lo[axis, cols] = split
+    return np.hstack([lo, right_lo]), np.hstack([left_hi, hi])
+
+
+def _enclose(func, lower, upper, min_value, max_value, max_boxes: int, rounds: int) -> Interval:
+    n = len(lower)
+    lo, hi = lower[:, None], upper[:, None]
+    whole = _enclose_boxes(func, lo, hi)
+
+    # Interval arithmetic only overestimates through contributors that appear more
+    # than once in the closure. Bisecting each contributor once (one call for all)
+    # shows which ones tighten the enclosure; only those are bisected afterwards.
+    probe = _enclose_boxes(func, *_bisect(np.repeat(lo, n, axis=1), np.repeat(hi, n, axis=1), np.arange(n)))
+    probe_width = np.maximum(probe.upper[:n], probe.upper[n:]) - np.minimum(probe.lower[:n], probe.lower[n:])
+    gain = (whole.upper - whole.lower)[0] - probe_width
+    order = np.argsort(-gain)[: max(int((gain > 1e-12 * max(abs(max_value), 1.0)).sum()), 1)]
+
+    for depth in range(rounds + 1):
+        enclosure = _enclose_boxes(func, lo, hi)
+        # the discarded boxes are already within the attained extremes
+        bound = Interval(min(enclosure.lower.min(), min_value), max(enclosure.upper.max(), max_value))
+        keep = (enclosure.lower < min_value) | (enclosure.upper > max_value)
+        if not keep.any() or 2 * keep.sum() > max_boxes:
+            return bound
+        lo, hi = lo[:, keep], hi[:, keep]
+        lo, hi = _bisect(lo, hi, np.full(lo.shape[1], order[depth % len(order)]))
+    return bound
@@ -0,0 +1,23 @@
+"""
+Inner loops of the analyses.
+
+The reductions of `calc` and `stats` and the accumulation of Monte Carlo
+closures are implemented twice: as a compiled extension (`_ckernels.pyx`), and
+in NumPy. The extension is used when it is built:
+
+    uv run cythonize -i src/dimstack/_ckernels.pyx
+
+`BACKEND` tells which one was picked at import. Both sum in stack order, so the
+results are the same as the Python loops they replace.
+"""
+
+try:
+    from ._ckernels import accumulate, reduce, rss, segment_reduce
+
+    BACKEND = "cython"
+except ImportError:
+    from ._npkernels import accumulate, reduce, rss, segment_reduce
+
+    BACKEND = "numpy"
+
+__all__ = ["BACKEND", "accumulate", "reduce", "rss", "segment_reduce"]
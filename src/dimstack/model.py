@@ -0,0 +1,378 @@
+from typing import Any
+
+import numpy as np
+from scipy import sparse
+from scipy.stats import truncnorm
+
+from . import dist
+from .dim import Basic, Reviewed, ReviewedStack, Stack
+from .display import display_df
+from .tolerance import Bilateral
+from .utils import nround
+
+
+class Model:
+    """
+    A set of stacks over a shared pool of dimensions.
+
+    A real part often appears in several tolerance loops. Each stack registered
+    in the model is a requirement on its closure, and a dimension used by several
+    stacks is a single column of the model, so all requirements are evaluated
+    from the same sampled parts.
+
+    The stacks are stored as a sparse requirement x dimension sensitivity matrix
+    (the sensitivity `a` of each dimension in each stack, applied to its
+    absolute value), so the closed-form
+    analyses and the simulation of every requirement are sparse matrix products
+    instead of per-stack loops.
+
+    Args:
+        name (str, optional): The name of the model. Defaults to "Model".
+        description (str, optional): The description of the model. Defaults to "".
+    """
+
+    def __init__(self, name: str = "Model", description: str = ""):
+        self.name = name
+        self.description = description
+        self.dims: list[Reviewed] = []
+        self.stacks: list[Stack | ReviewedStack] = []
+        self.LL: list[float] = []
+        self.UL: list[float] = []
+        self._columns: dict[int, int] = {}
+        self._entries: list[tuple[int, int, float]] = []
+        self._sensitivities = None
+
+    def __str__(self) -> str:
+        return f"{self.name}: {len(self.stacks)} requirements over {len(self.dims)} dimensions"
+
+    def add(self, stack: Stack | ReviewedStack, LL: float, UL: float) -> int:
+        """
+        Register a stack and the limits of its closure.
+
+        Dimensions are pooled by identity: the same Basic dimension used in two
+        stacks is one dimension of the model. Basic dimensions without a review
+        are reviewed with the default distribution assumption.
+
+        Args:
+            stack (Stack | ReviewedStack): The stack.
+            LL (float): Lower limit of the stack closure.
+            UL (float): Upper limit of the stack closure.
+
+        Returns:
+            int: The index of the requirement.
+        """
+        row = len(self.stacks)
+        for item in stack.dims:
+            rdim = item if isinstance(item, Reviewed) else item.review()
+            column = self._columns.get(id(rdim.dim))
+            if column is None:
+                column = len(self.dims)
+                self._columns[id(rdim.dim)] = column
+                self.dims.append(rdim)
+            self._entries.append((row, column, rdim.dim.a))
+        self.stacks.append(stack)
+        self.LL.append(LL)
+        self.UL.append(UL)
+        self._sensitivities = None
+        return row
+
+    def column(self, dim: Basic | Reviewed) -> int:
+        """The column of a dimension in the model."""
+        if isinstance(dim, Reviewed):
+            dim = dim.dim
+        return self._columns[id(dim)]
+
+    @property
+    def sensitivities(self) -> sparse.csr_matrix:
+        """The requirement x dimension sensitivity matrix (`a`), applied to absolute values."""
+        if self._sensitivities is None:
+            rows, columns, values = zip(*self._entries) if self._entries else ((), (), ())
+            self._sensitivities = sparse.csr_matrix(
+                (values, (rows, columns)),
+                shape=(len(self.stacks), len(self.dims)),
+            )
+        return self._sensitivities
+
+    @property
+    def abs_medians(self) -> np.ndarray:
+        """Absolute median of every dimension of the pool."""
+        return np.array([rdim.dim.abs_median for rdim in self.dims], dtype=float)
+
+    @property
+    def half_tolerances(self) -> np.ndarray:
+        """Half of the total tolerance of every dimension of the pool."""
+        return np.array([rdim.dim.tolerance.T / 2 for rdim in self.dims], dtype=float)
+
+    @property
+    def std_devs_eff(self) -> np.ndarray:
+        """Effective standard deviation of every dimension of the pool."""
+        return np.array([rdim.std_dev_eff for rdim in self.dims], dtype=float)
+
+    def _results(self, nominals: np.ndarray, tolerances: np.ndarray, method: str, desc: str = "") -> list[Basic]:
+        return [
+            Basic(
+                nom=float(nominal),
+                tol=Bilateral.symmetric(float(tolerance)),
+                name=f"{stack.name} - {method} Analysis",
+                desc=desc,
+            )
+            for stack, nominal, tolerance in zip(self.stacks, nominals, tolerances)
+        ]
+
+    def WC(self) -> list[Basic]:
+        """
+        Worst-Case analysis of every requirement. See `calc.WC`.
+
+        Returns:
+            list[Basic]: A Bilateral dimension per requirement.
+        """
+        S = self.sensitivities
+        return self._results(S @ self.abs_medians, abs(S) @ self.half_tolerances, "WC")
+
+    def RSS(self) -> list[Basic]:
+        """
+        RSS analysis of every requirement. See `calc.RSS`.
+
+        Returns:
+            list[Basic]: A Bilateral dimension per requirement.
+        """
+        S = self.sensitivities
+        t_rss = np.sqrt(S.multiply(S) @ self.half_tolerances**2)
+        return self._results(S @ self.abs_medians, t_rss, "RSS", "(assuming inputs with Normal Dist. & uniform SD)")
+
+    def MRSS(self) -> list[Basic]:
+        """
+        Modified RSS analysis of every requirement. See `calc.MRSS`.
+
+        Returns:
+            list[Basic]: A Bilateral dimension per requirement.
+        """
+        S = self.sensitivities
+        T = self.half_tolerances
+        t_wc = abs(S) @ T
+        t_rss = np.sqrt(S.multiply(S) @ T**2)
+        n = np.diff(S.indptr)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            C_f = (0.5 * (t_wc - t_rss)) / (t_rss * (n**0.5 - 1)) + 1
+        return self._results(
+            S @ self.abs_medians, C_f * t_rss, "MRSS", "(assuming inputs with Normal Dist. & uniform SD)"
+        )
+
+    def SixSigma(self, at: float = 3) -> list[Reviewed]:
+        """
+        "6 Sigma" analysis of every requirement. See `calc.SixSigma`.
+
+        Unlike `calc.SixSigma`, the sensitivity `a` of each dimension also scales
+        its contribution to the mean and variance.
+
+        Args:
+            at (float, optional): Number of standard deviations of the resulting tolerances. Defaults to 3.
+
+        Returns:
+            list[Reviewed]: A Reviewed dimension per requirement.
+        """
+        S = self.sensitivities
+        std_devs = np.sqrt(S.multiply(S) @ self.std_devs_eff**2)
+        results = self._results(S @ self.abs_medians, std_devs * at, "'6 Sigma'", "(assuming inputs with Normal Dist.)")
+        return [Reviewed(result).assume_normal_dist(at) for result in results]
+
+    def MonteCarlo(self, n: int = 100000, seed: int | None = None, at: float = 3, chunk: int = 10000) -> list[Reviewed]:
+        """
+        Monte Carlo simulation of every requirement. See `calc.MonteCarlo`.
+
+        The mean and standard deviation of each closure are accumulated chunk by
+        chunk, merging the deviations of each chunk from its own mean so that a
+        small variation on a large nominal keeps its precision; the simulated
+        values are not kept.
+
+        Args:
+            n (int, optional): Number of trials. Defaults to 100000.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            at (float, optional): Number of standard deviations of the resulting tolerances. Defaults to 3.
+            chunk (int, optional): Number of trials per block. Defaults to 10000.
+
+        Returns:
+            list[Reviewed]: A Reviewed dimension per requirement.
+        """
+        rng = np.random.default_rng(seed)
+        means = np.zeros(len(self.stacks))
+        m2 = np.zeros(len(self.stacks))
+        count = 0
+        for start in range(0, n, chunk):
+            closures = self.closures(min(chunk, n - start), rng)
+            size = closures.shape[1]
+            chunk_means = closures.mean(axis=1)
+            delta = chunk_means - means
+            # Chan's parallel update of the mean and the sum of squared deviations
+            m2 += ((closures - chunk_means[:, None]) ** 2).sum(axis=1) + delta**2 * count * size / (count + size)
+            means += delta * size / (count + size)
+            count += size
+        std_devs = np.sqrt(m2 / n)
+        results = self._results(means, std_devs * at, "Monte Carlo", f"(n={n})")
+        return [
+            Reviewed(result, distribution=dist.Normal(float(mean), float(std_dev)))
+            for result, mean, std_dev in zip(results, means, std_devs)
+        ]
+
+    def sample(self, n: int, seed: int | np.random.Generator | None = None) -> np.ndarray:
+        """
+        Draw one block of absolute dimension values for the whole pool.
+
+        Args:
+            n (int): Number of trials.
+            seed (int | np.random.Generator, optional): Seed of the random number generator. Defaults to None.
+
+        Returns:
+            np.ndarray: (dimensions x trials) absolute values.
+        """
+        return sample_block(self.dims, n, np.random.default_rng(seed))
+
+    def closures(self, n: int, seed: int | np.random.Generator | None = None) -> np.ndarray:
+        """
+        Simulate the closure of every stack with a single sparse matrix product.
+
+        Args:
+            n (int): Number of trials.
+            seed (int | np.random.Generator, optional): Seed of the random number generator. Defaults to None.
+
+        Returns:
+            np.ndarray: (requirements x trials) simulated closures.
+        """
+        return np.asarray(self.sensitivities @ self.sample(n, seed))
+
+    def yield_probability(self, n: int = 100000, seed: int | None = None, chunk: int = 10000) -> "ModelYield":
+        """
+        Simulate the model and report the yield of every requirement and of the assembly.
+
+        The trials are processed in chunks so the sample block stays small for
+        large models.
+
+        Args:
+            n (int, optional): Number of trials. Defaults to 100000.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            chunk (int, optional): Number of trials per block. Defaults to 10000.
+
+        Returns:
+            ModelYield: Per-requirement and joint yield.
+        """
+        rng = np.random.default_rng(seed)
+        LL = np.array(self.LL, dtype=float)[:, None]
+        UL = np.array(self.UL, dtype=float)[:, None]
+        passed = np.zeros(len(self.stacks), dtype=np.int64)
+        joint = 0
+        for start in range(0, n, chunk):
+            closures = self.closures(min(chunk, n - start), rng)
+            ok = (closures >= LL) & (closures <= UL)
+            passed += ok.sum(axis=1)
+            joint += int(ok.all(axis=0).sum())
+        return ModelYield(self, passed / n, joint / n, n)
+
+
+class ModelYield:
+    """
+    Result of a model simulation.
+
+    Args:
+        model (Model): The simulated model.
+        yield_probabilities (np.ndarray): Yield of every requirement.
+        joint_yield_probability (float): Probability that every requirement of an assembly is met.
+        n (int): Number of trials.
+    """
+
+    def __init__(self, model: Model, yield_probabilities: np.ndarray, joint_yield_probability: float, n: int):
+        self.model = model
+        self.yield_probabilities = yield_probabilities
+        self.joint_yield_probability = joint_yield_probability
+        self.n = n
+
+    def __str__(self) -> str:
+        return f"{self.model.name}: joint yield {nround(self.joint_yield_probability * 100, 8)}% (n={self.n})"
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"MODEL YIELD: {self.model.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"MODEL YIELD: {self.model.name}")
+
+    def show(self):
+        return display_df(self.dict, f"MODEL YIELD: {self.model.name}")
+
+    @property
+    def yield_loss_probabilities(self) -> np.ndarray:
+        """Reject probability of every requirement."""
+        return 1 - self.yield_probabilities
+
+    @property
+    def joint_yield_loss_probability(self) -> float:
+        """Probability that an assembly fails at least one requirement."""
+        return 1 - self.joint_yield_probability
+
+    @property
+    def independent_yield_probability(self) -> float:
+        """Assembly yield if the requirements were independent (product of the requirement yields)."""
+        return float(np.prod(self.yield_probabilities))
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        rows = [
+            {
+                "Requirement": stack.name,
+                "Spec. Limits": f"[{nround(LL)}, {nround(UL)}]",
+                "Yield Prob.": f"{nround(float(y) * 100, 8)}",
+                "Reject PPM": f"{nround(float(1 - y) * 1000000, 2)}",
+            }
+            for stack, LL, UL, y in zip(self.model.stacks, self.model.LL, self.model.UL, self.yield_probabilities)
+        ]
+        rows.append(
+            {
+                "Requirement": "Joint",
+                "Spec. Limits": "",
+                "Yield Prob.": f"{nround(self.joint_yield_probability * 100, 8)}",
+                "Reject PPM": f"{nround(self.joint_yield_loss_probability * 1000000, 2)}",
+            }
+        )
+        return rows
+
+
+def sample_block(rdims: list[Reviewed], n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw absolute values for many dimensions at once.
+
+    Dimensions are grouped by distribution type and every group is drawn as a
+    single array; other distributions fall back to their own `sample`.
+
+    Args:
+        rdims (list[Reviewed]): The dimensions.
+        n (int): Number of trials.
+        rng (np.random.Generator): Random number generator.
+
+    Returns:
+        np.ndarray: (dimensions x trials) absolute values.
+    """
+    block = np.empty((len(rdims), n))
+    groups: dict[type, list[int]] = {}
+    for i, rdim in enumerate(rdims):
+        groups.setdefault(type(rdim.distribution), []).append(i)
+    for kind, index in groups.items():
+        dists = [rdims[i].distribution for i in index]
+        if kind is dist.Normal:
+            mean = np.array([d.mean for d in dists])[:, None]
+            std_dev = np.array([d.std_dev for d in dists])[:, None]
+            block[index] = mean + std_dev * rng.standard_normal((len(index), n))
+        elif kind is dist.Uniform:
+            lower = np.array([d.lower for d in dists])[:, None]
+            upper = np.array([d.upper for d in dists])[:, None]
+            block[index] = lower + (upper - lower) * rng.random((len(index), n))
+        elif kind is dist.NormalScreened:
+            mean = np.array([d.mean for d in dists])[:, None]
+            std_dev = np.array([d.std_dev for d in dists])[:, None]
+            a = (np.array([d.lower for d in dists])[:, None] - mean) / std_dev
+            b = (np.array([d.upper for d in dists])[:, None] - mean) / std_dev
+            block[index] = truncnorm.rvs(a, b, loc=mean, scale=std_dev, size=(len(index), n), random_state=rng)
+        elif kind is dist.Radial:
+            params = np.array([(d.mean, d.std_dev, d.radius, d.bonus) for d in dists], dtype=float).T
+            block[index] = dist.radial(*params, n, rng)
+        else:
+            for i in index:
+                block[i] = rdims[i].sample(n, random_state=rng)
+    return block
@@ -0,0 +1,265 @@
+from typing import Any, Mapping
+
+import numpy as np
+from scipy import optimize
+from scipy.special import expit, log_ndtr
+from scipy.stats import norm
+
+from . import dist
+from .dim import Basic, Reviewed
+from .display import display_df
+from .model import Model
+from .utils import nround, sign
+
+
+def center(
+    model: Model,
+    adjustable: Mapping[Basic | Reviewed, tuple[float, float]],
+    objective: str = "yield",
+    method: str = "auto",
+    n: int = 20000,
+    seed: int | None = 0,
+) -> "Centering":
+    """
+    Choose the nominals of some dimensions to maximize the yield of a model.
+
+    Moving the nominal of a dimension moves its process with it: the distribution
+    keeps its offset (shift `k`) from the nominal. Every requirement of the model
+    is taken into account, with the nominals bounded to the given ranges.
+
+    With the "normal" method, every closure is normal with the mean and variance
+    of its contributors (as in RSS), and the objective and its gradient are
+    closed-form. With the "simulation" method, the contributors are sampled once
+    and every candidate shifts the same samples (common random numbers); the
+    pass/fail indicator is smoothed so that the objective has a gradient.
+
+    >>> from dimstack.dim import ReviewedStack
+    >>> from dimstack.tolerance import Bilateral
+    >>> housing = Reviewed(Basic(10, Bilateral.symmetric(0.1), name="housing")).assume_normal_dist_shifted(3, 0.2)
+    >>> shaft = Reviewed(Basic(-9.8, Bilateral.symmetric(0.05), name="shaft")).assume_normal_dist(3)
+    >>> model = Model()
+    >>> model.add(ReviewedStack(name="gap", dims=[housing, shaft]), LL=0.1, UL=0.3)
+    0
+    >>> result = center(model, {housing: (9.9, 10.1)})
+    >>> round(float(result.nominals[0]), 3)
+    9.98
+
+    Args:
+        model (Model): The stacks and the limits of their closures.
+        adjustable (Mapping[Basic | Reviewed, tuple[float, float]]): The dimensions whose nominal (signed, as
+            `Basic(nom=...)`) may change, with the bounds of the nominal.
+        objective (str, optional): "yield" to maximize the joint yield, assuming independent requirements in
+            the normal method, or "ppm" to minimize the total reject PPM of the requirements. Defaults to "yield".
+        method (str, optional): "normal", "simulation", or "auto" for "normal" if every contributor is normal.
+            Defaults to "auto".
+        n (int, optional): Number of trials of the simulation method. Defaults to 20000.
+        seed (int, optional): Seed of the simulation method. Defaults to 0.
+
+    Returns:
+        Centering: The chosen nominals and the yields before and after.
+    """
+    if objective not in ("yield", "ppm"):
+        raise ValueError(f"Unknown objective {objective}")
+    if method == "auto":
+        method = "normal" if all(isinstance(rdim.distribution, dist.Normal) for rdim in model.dims) else "simulation"
+    if method not in ("normal", "simulation"):
+        raise ValueError(f"Unknown method {method}")
+
+    columns = np.array([model.column(dim) for dim in adjustable], dtype=int)
+    start = np.array([model.dims[j].dim.dir * model.dims[j].dim.nominal for j in columns], dtype=float)
+    bounds = [tuple(sorted(bound)) for bound in adjustable.values()]
+    for (lower, upper), nominal in zip(bounds, start):
+        if lower * upper < 0 or nominal * lower < 0:
+            raise ValueError("The bounds of a nominal cannot change its direction")
+
+    # closure shift per nominal shift: the sensitivity of the adjustable dimensions
+    C = model.sensitivities[:, columns].toarray()
+    LL = np.array(model.LL, dtype=float)
+    UL = np.array(model.UL, dtype=float)
+
+    if method == "normal":
+        moments = np.array([rdim.distribution.moments()[:2] for rdim in model.dims], dtype=float)
+        means = model.sensitivities @ moments[:, 0]
+        std_devs = np.sqrt(model.sensitivities.multiply(model.sensitivities) @ moments[:, 1])
+        objectives = _NormalObjective(means, std_devs, C, LL, UL)
+    else:
+        objectives = _SimulationObjective(np.asarray(model.closures(n, seed)), C, LL, UL)
+
+    fun = objectives.log_yield if objective == "yield" else objectives.reject
+    x0 = np.clip(start, [lower for lower, _ in bounds], [upper for _, upper in bounds])
+    if objective == "ppm":
+        # the reject probability is flat far from the optimum; start from the best log yield
+        x0 = _minimize(objectives.log_yield, x0, start, bounds).x
+    solution = _minimize(fun, x0, start, bounds)
+    return Centering(
+        model,
+        columns,
+        start,
+        solution.x,
+        objectives.yields(np.zeros(len(start))),
+        objectives.yields(solution.x - start),
+        method,
+        solution,
+    )
+
+
+def _minimize(fun, x0: np.ndarray, start: np.ndarray, bounds: list[tuple[float, float]]):
+    return optimize.minimize(lambda x: fun(x - start), x0, jac=True, method="L-BFGS-B", bounds=bounds)
+
+
+def _log_diff_ndtr(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """log(Φ(b) - Φ(a)) for a < b, without cancellation in either tail."""
+    upper = a > 0
+    a, b = np.where(upper, -b, a), np.where(upper, -a, b)
+    log_b = log_ndtr(b)
+    return log_b + np.log1p(-np.exp(np.minimum(log_ndtr(a) - log_b, 0)) + 1e-300)
+
+
+class _NormalObjective:
+    def __init__(self, means, std_devs, C, LL, UL):
+        self.means, self.std_devs, self.C, self.LL, self.UL = means, std_devs, C, LL, UL
+
+    def _standardized(self, shift: np.ndarray):
+        mean = self.means + self.C @ shift
+        return (self.LL - mean) / self.std_devs, (self.UL - mean) / self.std_devs
+
+    def log_yield(self, shift: np.ndarray) -> tuple[float, np.ndarray]:
+        a, b = self._standardized(shift)
+        log_yield = _log_diff_ndtr(a, b)
+        # d log(Φ(b) - Φ(a)) / d mean = (φ(a) - φ(b)) / (σ Y)
+        d_mean = (np.exp(norm.logpdf(a) - log_yield) - np.exp(norm.logpdf(b) - log_yield)) / self.std_devs
+        return -float(log_yield.sum()), -(self.C.T @ d_mean)
+
+    def reject(self, shift: np.ndarray) -> tuple[float, np.ndarray]:
+        a, b = self._standardized(shift)
+        reject = norm.cdf(a) + norm.sf(b)
+        d_mean = (norm.pdf(b) - norm.pdf(a)) / self.std_devs
+        return float(reject.sum()) * 1e6, (self.C.T @ d_mean) * 1e6
+
+    def yields(self, shift: np.ndarray) -> tuple[np.ndarray, float]:
+        a, b = self._standardized(shift)
+        yields = np.exp(_log_diff_ndtr(a, b))
+        return yields, float(np.prod(yields))
+
+
+class _SimulationObjective:
+    def __init__(self, closures, C, LL, UL):
+        self.closures, self.C, self.LL, self.UL = closures, C, LL, UL
+        # Silverman's bandwidth of the smoothed pass/fail indicator
+        std_devs = closures.std(axis=1)
+        self.h = np.maximum(1.06 * std_devs * closures.shape[1] ** -0.2, 1e-12)[:, None]
+
+    def _smoothed(self, shift: np.ndarray):
+        y = self.closures + (self.C @ shift)[:, None]
+        lower = expit((y - self.LL[:, None]) / self.h)
+        upper = expit((self.UL[:, None] - y) / self.h)
+        passed = lower * upper
+        # d passed / d closure
+        d_passed = passed * ((1 - lower) - (1 - upper)) / self.h
+        return passed, d_passed
+
+    def log_yield(self, shift: np.ndarray) -> tuple[float, np.ndarray]:
+        passed, d_passed = self._smoothed(shift)
+        joint = passed.prod(axis=0)
+        total = joint.sum() + 1e-300
+        # d joint / d closure_r = joint / passed_r * d passed_r
+        d_mean = (joint * d_passed / np.maximum(passed, 1e-300)).sum(axis=1)
+        return -float(np.log(total / passed.shape[1])), -(self.C.T @ d_mean) / total
+
+    def reject(self, shift: np.ndarray) -> tuple[float, np.ndarray]:
+        passed, d_passed = self._smoothed(shift)
+        return float((1 - passed).mean(axis=1).sum()) * 1e6, -(self.C.T @ d_passed.mean(axis=1)) * 1e6
+
+    def yields(self, shift: np.ndarray) -> tuple[np.ndarray, float]:
+        y = self.closures + (self.C @ shift)[:, None]
+        ok = (y >= self.LL[:, None]) & (y <= self.UL[:, None])
+        return ok.mean(axis=1), float(ok.all(axis=0).mean())
+
+
+class Centering:
+    """
+    Result of `center`.
+
+    Args:
+        model (Model): The centered model.
+        columns (np.ndarray): The columns of the adjustable dimensions in the model.
+        start (np.ndarray): The initial nominals.
+        nominals (np.ndarray): The chosen nominals.
+        before (tuple[np.ndarray, float]): The requirement and joint yields with the initial nominals.
+        after (tuple[np.ndarray, float]): The requirement and joint yields with the chosen nominals.
+        method (str): "normal" or "simulation".
+        solution (scipy.optimize.OptimizeResult): The result of the optimizer.
+    """
+
+    def __init__(self, model: Model, columns, start, nominals, before, after, method: str, solution):
+        self.model = model
+        self.columns = columns
+        self.start = start
+        self.nominals = nominals
+        self.yield_probabilities_before, self.joint_yield_probability_before = before
+        self.yield_probabilities, self.joint_yield_probability = after
+        self.method = method
+        self.solution = solution
+
+    def __str__(self) -> str:
+        return (
+            f"{self.model.name}: joint yield {nround(self.joint_yield_probability_before * 100, 8)}% -> "
+            f"{nround(self.joint_yield_probability * 100, 8)}% ({self.method})"
+        )
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"CENTERING: {self.model.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"CENTERING: {self.model.name}")
+
+    def show(self):
+        return display_df(self.dict, f"CENTERING: {self.model.name}")
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "Dim.": self.model.dims[j].dim.name,
+                "Nominal": nround(float(start)),
+                "Centered Nominal": nround(float(nominal)),
+                "Shift": nround(float(nominal - start)),
+            }
+            for j, start, nominal in zip(self.columns, self.start, self.nominals)
+        ]
+
+    def apply(self):
+        """Set the chosen nominals, moving the distribution of every adjusted dimension with its nominal."""
+        for j, start, nominal in zip(self.columns, self.start, self.nominals):
+            rdim = self.model.dims[j]
+            if rdim.dim.dir == 0:
+                # a zero nominal takes the direction of its bounds
+                rdim.dim.dir = sign(nominal)
+            rdim.dim.nominal = abs(float(nominal))
+            rdim.distribution = shifted(rdim.distribution, float(nominal - start))
+
+
+def shifted(distribution, delta: float):
+    """
+    A copy of a distribution moved by `delta`.
+
+    >>> str(shifted(dist.Uniform(1, 2), 0.5))
+    'Uniform Dist. [1.5, 2.5]'
+    """
+    if isinstance(distribution, dist.Normal):
+        return dist.Normal(distribution.mean + delta, distribution.std_dev)
+    if isinstance(distribution, dist.Uniform):
+        return dist.Uniform(distribution.lower + delta, distribution.upper + delta)
+    if isinstance(distribution, dist.NormalScreened):
+        return dist.NormalScreened(
+            distribution.mean + delta, distribution.std_dev, distribution.lower + delta, distribution.upper + delta
+        )
+    if isinstance(distribution, dist.Johnson):
+        return dist.Johnson(
+            distribution.family, distribution.gamma, distribution.delta, distribution.loc + delta, distribution.scale
+        )
+    if isinstance(distribution, dist.Radial):
+        return dist.Radial(distribution.mean + delta, distribution.std_dev, distribution.radius, distribution.bonus)
+    if isinstance(distribution, dist.HalfNormal):
+        return dist.HalfNormal(distribution.edge + delta, distribution.std_dev, distribution.width)
+    raise TypeError(f"Cannot shift {type(distribution).__name__}")
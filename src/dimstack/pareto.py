@@ -0,0 +1,293 @@
+import concurrent.futures
+import os
+from typing import Any, Callable, Mapping
+
+import numpy as np
+from scipy.stats import norm
+
+from .dim import Basic, Reviewed, ReviewedStack
+from .display import display_df
+from .tolerance import Bilateral
+from .utils import nround
+
+Cost = Callable[[np.ndarray], np.ndarray]
+
+MAX_GRID = 10**7
+CHUNK = 2**16
+
+
+def reciprocal(A: float, B: float, k: float = 1) -> Cost:
+    """
+    Reciprocal power cost model of a tolerance, A + B / t^k.
+
+    >>> float(reciprocal(1, 0.1)(np.array(0.05)))
+    3.0
+
+    Args:
+        A (float): Fixed cost.
+        B (float): Cost factor.
+        k (float, optional): Exponent. Defaults to 1.
+
+    Returns:
+        Cost: The cost of a ± tolerance t, element-wise.
+    """
+    return lambda t: A + B / np.asarray(t, dtype=float) ** k
+
+
+def exponential(A: float, B: float, m: float) -> Cost:
+    """
+    Exponential cost model of a tolerance, A + B·exp(-m·t).
+
+    Args:
+        A (float): Fixed cost.
+        B (float): Cost factor.
+        m (float): Decay rate.
+
+    Returns:
+        Cost: The cost of a ± tolerance t, element-wise.
+    """
+    return lambda t: A + B * np.exp(-m * np.asarray(t, dtype=float))
+
+
+def non_dominated(cost: np.ndarray, ppm: np.ndarray) -> np.ndarray:
+    """
+    Indices of the candidates that no other candidate beats in both cost and PPM.
+
+    >>> non_dominated(np.array([1.0, 2.0, 3.0, 2.0]), np.array([30.0, 10.0, 20.0, 20.0])).tolist()
+    [0, 1]
+
+    Args:
+        cost (np.ndarray): Cost of every candidate.
+        ppm (np.ndarray): Reject PPM of every candidate.
+
+    Returns:
+        np.ndarray: The indices of the Pareto front, by increasing cost.
+    """
+    order = np.lexsort((ppm, cost))
+    ppm = ppm[order]
+    # a candidate is kept if its PPM is lower than that of every cheaper candidate
+    best = np.minimum.accumulate(ppm)
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = ppm[1:] < best[:-1]
+    return order[keep]
+
+
+class Explorer:
+    """
+    Trade-off between the manufacturing cost and the reject PPM of a stack.
+
+    The candidates are vectors of ± tolerances of the varied dimensions. The
+    process of a dimension keeps its mean and capability when its tolerance
+    changes, so its standard deviation scales with the tolerance. The closure is
+    normal with the mean and variance of its contributors (as in RSS), so a whole
+    population of candidates is evaluated with a few array operations.
+
+    Args:
+        stack (ReviewedStack): The stack.
+        LL (float): Lower limit of the closure.
+        UL (float): Upper limit of the closure.
+        costs (Mapping[Basic | Reviewed, Cost]): The cost model of every varied dimension.
+        bounds (Mapping[Basic | Reviewed, tuple[float, float]]): The range of the ± tolerance of every varied dimension.
+    """
+
+    def __init__(
+        self,
+        stack: ReviewedStack,
+        LL: float,
+        UL: float,
+        costs: Mapping[Basic | Reviewed, Cost],
+        bounds: Mapping[Basic | Reviewed, tuple[float, float]],
+    ):
+        self.stack = stack
+        self.LL = LL
+        self.UL = UL
+        self.index = [self._index(dim) for dim in costs]
+        self.costs = list(costs.values())
+        self.bounds = np.array([sorted(bounds[dim]) for dim in costs], dtype=float)
+
+        rdims = stack.dims
+        moments = np.array([rdim.distribution.moments()[:2] for rdim in rdims], dtype=float)
+        a = np.array([rdim.dim.a for rdim in rdims], dtype=float)
+        self.mean = float(a @ moments[:, 0])
+        varied = np.zeros(len(rdims), dtype=bool)
+        varied[self.index] = True
+        self.fixed_variance = float(a[~varied] ** 2 @ moments[~varied, 1])
+        # variance per squared ± tolerance of the varied dimensions
+        half = np.array([rdims[j].dim.tolerance.T / 2 for j in self.index], dtype=float)
+        self.variance_rate = a[self.index] ** 2 * moments[self.index, 1] / half**2
+
+    def _index(self, dim: Basic | Reviewed) -> int:
+        for i, rdim in enumerate(self.stack.dims):
+            if rdim is dim or rdim.dim is dim:
+                return i
+        raise ValueError(f"{dim} is not in {self.stack.name}")
+
+    def evaluate(self, tolerances: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cost and reject PPM of candidates.
+
+        Args:
+            tolerances (np.ndarray): (candidates x varied dimensions) ± tolerances.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The cost and reject PPM of every candidate.
+        """
+        tolerances = np.atleast_2d(tolerances)
+        cost = np.zeros(len(tolerances))
+        for j, model in enumerate(self.costs):
+            cost += model(tolerances[:, j])
+        std_dev = np.sqrt(self.fixed_variance + tolerances**2 @ self.variance_rate)
+        ppm = (norm.cdf((self.LL - self.mean) / std_dev) + norm.sf((self.UL - self.mean) / std_dev)) * 1e6
+        return cost, ppm
+
+    def _front(self, tolerances: np.ndarray) -> np.ndarray:
+        cost, ppm = self.evaluate(tolerances)
+        return tolerances[non_dominated(cost, ppm)]
+
+    def _parallel_front(self, chunks, workers: int | None) -> np.ndarray:
+        # NumPy releases the GIL, so chunks are filtered in threads, then merged
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            fronts = list(executor.map(lambda chunk: self._front(chunk()), chunks))
+        return self._front(np.concatenate(fronts)) if fronts else np.empty((0, len(self.index)))
+
+    def grid(self, levels: int = 10, workers: int | None = None) -> "ParetoFront":
+        """
+        Evaluate every combination of `levels` tolerances (geometrically spaced) per varied dimension.
+
+        Args:
+            levels (int, optional): Number of tolerances per dimension. Defaults to 10.
+            workers (int, optional): Number of threads. Defaults to the executor default.
+
+        Returns:
+            ParetoFront: The non-dominated candidates.
+        """
+        values = np.array([np.geomspace(lower, upper, levels) for lower, upper in self.bounds])
+        shape = (levels,) * len(self.index)
+        size = levels ** len(self.index)
+        if size > MAX_GRID:
+            raise ValueError(f"{size} candidates, use `evolve` for this many dimensions")
+
+        def chunk(start: int) -> Callable[[], np.ndarray]:
+            def build() -> np.ndarray:
+                index = np.unravel_index(np.arange(start, min(start + CHUNK, size)), shape)
+                return np.stack([values[j, i] for j, i in enumerate(index)], axis=1)
+
+            return build
+
+        return ParetoFront(self, self._parallel_front([chunk(start) for start in range(0, size, CHUNK)], workers), size)
+
+    def evolve(
+        self,
+        population: int = 4096,
+        generations: int = 30,
+        seed: int | None = None,
+        size: int = 200,
+        workers: int | None = None,
+    ) -> "ParetoFront":
+        """
+        Evolve a population of candidates towards the Pareto front.
+
+        Every generation, the current front is mutated (log-normal steps and
+        crossover between front members) into a new population, and the front of
+        the front and the population is kept, thinned to `size` candidates evenly
+        spread along the front (in cost and log PPM).
+
+        Args:
+            population (int, optional): Number of candidates per generation. Defaults to 4096.
+            generations (int, optional): Number of generations. Defaults to 30.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            size (int, optional): Maximum number of candidates of the front. Defaults to 200.
+            workers (int, optional): Number of threads. Defaults to the executor default.
+
+        Returns:
+            ParetoFront: The non-dominated candidates.
+        """
+        rng = np.random.default_rng(seed)
+        log_lower, log_upper = np.log(self.bounds[:, 0]), np.log(self.bounds[:, 1])
+        chunks = workers or os.cpu_count() or 1
+
+        def sample(front: np.ndarray | None) -> np.ndarray:
+            if front is None or not len(front):
+                return np.exp(rng.uniform(log_lower, log_upper, (population, len(self.index))))
+            parents = np.log(front[rng.integers(len(front), size=(2, population))])
+            mix = rng.random((population, len(self.index))) < 0.5
+            children = np.where(mix, parents[0], parents[1])
+            step = 0.1 * (log_upper - log_lower) * rng.standard_normal(children.shape)
+            children += step * (rng.random(children.shape) < 2 / len(self.index))
+            return np.exp(np.clip(children, log_lower, log_upper))
+
+        front = None
+        evaluated = 0
+        for _ in range(generations):
+            candidates = sample(front)
+            if front is not None:
+                candidates = np.concatenate([front, candidates])
+            evaluated += population
+            parts = np.array_split(candidates, chunks)
+            front = self._thin(self._parallel_front([lambda part=part: part for part in parts], workers), size)
+        return ParetoFront(self, front, evaluated)
+
+    def _thin(self, front: np.ndarray, size: int) -> np.ndarray:
+        if len(front) <= size:
+            return front
+        cost, ppm = self.evaluate(front)
+        # evenly spaced along the front, in normalized cost and log PPM
+        points = np.stack([cost, np.log10(ppm + 1e-3)])
+        span = np.ptp(points, axis=1, keepdims=True)
+        steps = np.hypot(*np.diff(points / np.where(span > 0, span, 1), axis=1))
+        arc = np.concatenate([[0], np.cumsum(steps)])
+        keep = np.unique(np.searchsorted(arc, np.linspace(0, arc[-1], size)).clip(0, len(front) - 1))
+        return front[keep]
+
+
+class ParetoFront:
+    """
+    Non-dominated candidates of an `Explorer`, by increasing cost.
+
+    Args:
+        explorer (Explorer): The explorer.
+        tolerances (np.ndarray): (candidates x varied dimensions) ± tolerances.
+        evaluated (int): Number of evaluated candidates.
+    """
+
+    def __init__(self, explorer: Explorer, tolerances: np.ndarray, evaluated: int):
+        self.explorer = explorer
+        self.tolerances = tolerances
+        self.cost, self.ppm = explorer.evaluate(tolerances) if len(tolerances) else (np.empty(0), np.empty(0))
+        self.evaluated = evaluated
+
+    def __str__(self) -> str:
+        return f"{self.explorer.stack.name}: {len(self.tolerances)} Pareto candidates of {self.evaluated}"
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"PARETO FRONT: {self.explorer.stack.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"PARETO FRONT: {self.explorer.stack.name}")
+
+    def show(self):
+        return display_df(self.dict, f"PARETO FRONT: {self.explorer.stack.name}")
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        names = [self.explorer.stack.dims[j].dim.name for j in self.explorer.index]
+        return [
+            {
+                "Cost": nround(float(cost)),
+                "Reject PPM": nround(float(ppm), 2),
+                **{name: f"± {nround(float(t))}" for name, t in zip(names, tolerances)},
+            }
+            for cost, ppm, tolerances in zip(self.cost, self.ppm, self.tolerances)
+        ]
+
+    def cheapest(self, ppm: float) -> "dict[int, Bilateral]":
+        """
+        The cheapest candidate with at most `ppm` rejects.
+
+        Returns:
+            dict[int, Bilateral]: The tolerance of every varied dimension, by its position in the stack.
+        """
+        ok = np.flatnonzero(self.ppm <= ppm)
+        if not len(ok):
+            raise ValueError(f"No candidate has at most {ppm} reject PPM")
+        return {j: Bilateral.symmetric(float(t)) for j, t in zip(self.explorer.index, self.tolerances[ok[0]])}
@@ -1,4 +1,6 @@
+import collections
 import itertools
+import threading
 
 import numpy as np
 import plotly.express as px
@@ -7,14 +9,23 @@ from plotly.subplots import make_subplots
 
 from .dim import Basic, Stack, Reviewed, ReviewedStack
 from .dist import Normal, NormalScreened, Uniform
+from .stats import Histogram
 from .utils import nround
 
 
 class StackPlot:
-    """Plot a stack of dimensions. This is a wrapper around Plotly."""
+    """Plot a stack of dimensions. This is a wrapper around Plotly.
+
+    Stacks with more than `BATCH_THRESHOLD` dimensions are drawn with a few merged
+    traces instead of three traces per dimension, and with WebGL traces above
+    `WEBGL_THRESHOLD` dimensions.
+    """
 
     start_pos = 0
     color = None
+    BATCH_THRESHOLD = 50
+    WEBGL_THRESHOLD = 1000
+    PDF_POINTS = 200
 
     def __init__(self, title="Stack Plot", x_title="Distance"):
         colors = px.colors.qualitative.Antique
@@ -113,9 +124,14 @@ class StackPlot:
         xbins_size=0.1,
         start_pos: float | None = None,
         color=None,
+        points: int | None = None,
+        limits: tuple[float, ...] = (),
     ):
         """Add a distribution to the plot.
 
+        The pdf is drawn on an adaptive grid of a fixed number of points (see
+        `pdf_grid`), whatever the width of the range.
+
         Args:
             distribution (Union[Normal, Uniform, NormalScreened]): The distribution to plot
             name (str): name of the distribution
@@ -125,6 +141,8 @@ class StackPlot:
             xbins_size (float): size of the xbins
             start_pos (float): starting position
             color (str): color of the distribution
+            points (int): number of points of the curve. Defaults to `PDF_POINTS`.
+            limits (tuple[float, ...]): positions (e.g. spec limits) that are always part of the grid
 
         Returns:
             self (StackPlot): self
@@ -135,30 +153,124 @@ class StackPlot:
             color = self.color
         if legendgroup is None:
             legendgroup = name
+        if points is None:
+            points = self.PDF_POINTS
 
-        xrange = np.arange(start, stop, 0.001)
+        xrange, pdf = pdf_grid(distribution, start, stop, points, limits)
         self.fig.add_trace(
             go.Scatter(
                 line=dict(color=color, width=1),
                 name=f"{name} Distribution",
                 x=xrange + start_pos,
-                y=distribution.pdf(xrange),
+                y=pdf,
                 legendgroup=legendgroup,
             ),
             secondary_y=True,
         )
 
         if hasattr(distribution, "data") and distribution.data is not None:
-            self.fig.add_histogram(
-                x=distribution.data + start_pos,
-                histnorm="probability",
-                xbins=dict(size=xbins_size),
+            self.add_histogram(
+                Histogram.from_data(distribution.data, xbins_size),
                 name=f"{name} Data",
+                legendgroup=legendgroup,
+                start_pos=start_pos,
+                color=color,
+            )
+
+        return self
+
+    def add_histogram(
+        self,
+        histogram: Histogram,
+        name: str,
+        legendgroup: str | None = None,
+        start_pos: float | None = None,
+        color=None,
+        density: bool = False,
+    ):
+        """Add a histogram to the plot.
+
+        The histogram is binned before plotting and only the bars are sent to
+        Plotly, so the size of the figure does not depend on the number of samples.
+
+        Args:
+            histogram (Histogram): The binned samples
+            name (str): name of the histogram
+            legendgroup (str): the identifier for which group this item belongs to in the legend
+            start_pos (float): starting position
+            color (str): color of the histogram
+            density (bool): plot the probability density (on the same axis as the distributions)
+                instead of the probability of each bin
+
+        Returns:
+            self (StackPlot): self
+        """
+        if start_pos is None:
+            start_pos = self.start_pos
+        if color is None:
+            color = self.color
+        if legendgroup is None:
+            legendgroup = name
+
+        self.fig.add_trace(
+            go.Bar(
+                x=histogram.centers + start_pos,
+                y=histogram.density if density else histogram.probability,
+                width=histogram.widths,
+                name=name,
                 marker_color=color,
                 opacity=0.5,
                 legendgroup=legendgroup,
-            )
+            ),
+            secondary_y=density,
+        )
+        return self
+
+    def add_simulation(
+        self,
+        samples: np.ndarray | Histogram | Reviewed,
+        analytic: Reviewed | None = None,
+        name: str = "Simulation",
+        bins: int = 100,
+        start_pos: float | None = None,
+    ):
+        """Overlay a simulated stack result with the analytic result of a `calc` method.
 
+        Args:
+            samples (np.ndarray | Histogram | Reviewed): The simulated values, a histogram of them,
+                or a simulated result with its data (e.g. from `calc.MonteCarlo`)
+            analytic (Reviewed): the analytic result to compare with
+            name (str): name of the simulation
+            bins (int): number of bins when the samples are not binned yet
+            start_pos (float): starting position
+
+        Returns:
+            self (StackPlot): self
+        """
+        if start_pos is None:
+            start_pos = 0
+        if isinstance(samples, Reviewed):
+            samples = samples.distribution.data
+        if isinstance(samples, Histogram):
+            histogram = samples
+        else:
+            samples = np.asarray(samples, dtype=float)
+            histogram = Histogram.from_range(samples.min(), samples.max(), bins)
+            histogram.add(samples)
+
+        color = next(self.col_pal_iterator)
+        self.add_histogram(histogram, f"{name} Histogram", name, start_pos, color, density=True)
+        if analytic is not None:
+            self.add_distribution(
+                distribution=analytic.distribution,
+                name=analytic.dim.name,
+                legendgroup=name,
+                start=histogram.edges[0],
+                stop=histogram.edges[-1],
+                start_pos=start_pos,
+                color=color,
+                limits=(analytic.dim.abs_lower, analytic.dim.abs_upper),
+            )
         return self
 
     def add_reviewed(self, item: Reviewed):
@@ -181,34 +293,155 @@ class StackPlot:
             start_pos=this_start_pos,
         )
 
-    def add_stack(self, stack: Stack):
+    def add_dimensions(self, dims: list[Basic], name: str = "Stack", titles: list[str] | None = None):
+        """Add many dimensions to the plot with a few merged traces.
+
+        The coordinates of every segment are computed as arrays and the segments
+        of all dimensions are joined into one trace each (separated by None), so
+        the figure size grows linearly with the number of dimensions.
+
+        Args:
+            dims (list[Basic]): The dimensions to plot
+            name (str): name of the group of dimensions in the legend
+            titles (list[str]): Titles of the dimensions
+
+        Returns:
+            StackPlot: self
+        """
+        if titles is None:
+            titles = [
+                f"{item.id}: {item.nom_direction_sign}{nround(item.nominal)} {str(item.tolerance)}" for item in dims
+            ]
+        names = np.array([item.name for item in dims], dtype=object)
+        steps = np.array([item.nominal * item.dir for item in dims], dtype=float)
+        lower_tols = np.array([item.abs_lower_tol for item in dims], dtype=float)
+        upper_tols = np.array([item.abs_upper_tol for item in dims], dtype=float)
+        colors = [next(self.col_pal_iterator) for _ in dims]
+
+        new_pos = self.start_pos + np.cumsum(steps)
+        prev_pos = new_pos - steps
+        scatter = go.Scattergl if len(dims) > self.WEBGL_THRESHOLD else go.Scatter
+        legendgroup = f"{name}"
+
+        self.fig.add_trace(
+            scatter(
+                x=_segments(prev_pos, new_pos),
+                y=_segments(names, names),
+                mode="lines",
+                line=dict(color=self.color, width=2),
+                name=f"{name} Dimensions",
+                legendgroup=legendgroup,
+            )
+        )
+        self.fig.add_trace(
+            scatter(
+                x=new_pos,
+                y=names,
+                mode="markers+text",
+                marker=dict(size=10, color=colors),
+                text=titles,
+                textposition="bottom center",
+                name=f"{name} Nominals",
+                legendgroup=legendgroup,
+            )
+        )
+        self.fig.add_trace(
+            scatter(
+                x=_segments(new_pos + lower_tols, new_pos + upper_tols),
+                y=_segments(names, names),
+                mode="lines+markers",
+                line=dict(color="black"),
+                marker=dict(size=10, symbol="line-ns", line_width=2, line_color="black"),
+                name=f"{name} Tolerances",
+                opacity=0.5,
+                legendgroup=legendgroup,
+            )
+        )
+
+        self.start_pos = float(new_pos[-1]) if len(dims) else self.start_pos
+        return self
+
+    def add_stack(self, stack: Stack, batch: bool | None = None):
         """Add a stack of dimensions to the plot.
 
         Args:
             stack (Stack): A dimension stack item
+            batch (bool): draw the stack with merged traces. Defaults to True above `BATCH_THRESHOLD` dimensions.
 
         Returns:
             StackPlot: self
         """ """"""
+        if batch is None:
+            batch = len(stack.dims) > self.BATCH_THRESHOLD
+        if batch:
+            return self.add_dimensions(stack.dims, name=stack.name)
+
         for item in stack.dims:
             self.add_dimension(item)
             self.color = next(self.col_pal_iterator)
 
         return self
 
-    def add_reviewed_stack(self, stack: ReviewedStack):
+    def add_reviewed_stack(self, stack: ReviewedStack, batch: bool | None = None):
         """Add a stack of reviewed dimensions to the plot.
 
+        In a batch, the dimensions and their distributions are merged into a few
+        traces with one legend entry for the whole stack, so the dimensions cannot
+        be hidden one at a time. The histograms of distributions with data are
+        still drawn one per dimension, in the legend group of the stack.
+
         Args:
             stack (ReviewedStack): A reviewed dimension stack item
+            batch (bool): draw the stack with merged traces. Defaults to True above `BATCH_THRESHOLD` dimensions.
 
         Returns:
             StackPlot: self
         """ """"""
-        for item in stack.dims:
-            self.add_reviewed(item)
-            self.color = next(self.col_pal_iterator)
+        if batch is None:
+            batch = len(stack.dims) > self.BATCH_THRESHOLD
+        if not batch:
+            for item in stack.dims:
+                self.add_reviewed(item)
+                self.color = next(self.col_pal_iterator)
+            return self
+
+        start_pos = self.start_pos
+        dims = [item.dim for item in stack.dims]
+        titles = [
+            f"{item.dim.id}: {item.dim.nom_direction_sign}{nround(item.dim.nominal)} {str(item.dim.tolerance)} @ {item.distribution}"
+            for item in stack.dims
+        ]
+        self.add_dimensions(dims, name=stack.name, titles=titles)
+
+        # one merged trace for the distributions of every dimension
+        offsets = start_pos + np.concatenate([[0], np.cumsum([dim.nominal * dim.dir for dim in dims])[:-1]])
+        xs, ys = [], []
+        for item, offset in zip(stack.dims, offsets):
+            xrange, pdf = pdf_grid(item.distribution, item.dim.abs_lower, item.dim.abs_upper, self.PDF_POINTS // 2)
+            xs.append(np.append(xrange + offset, None))
+            ys.append(np.append(pdf, None))
+        scatter = go.Scattergl if len(dims) > self.WEBGL_THRESHOLD else go.Scatter
+        self.fig.add_trace(
+            scatter(
+                x=np.concatenate(xs),
+                y=np.concatenate(ys),
+                mode="lines",
+                line=dict(color=self.color, width=1),
+                name=f"{stack.name} Distributions",
+                legendgroup=f"{stack.name}",
+            ),
+            secondary_y=True,
+        )
 
+        for item, offset in zip(stack.dims, offsets):
+            if getattr(item.distribution, "data", None) is not None:
+                self.add_histogram(
+                    Histogram.from_data(item.distribution.data, item.dim.tolerance.T / 10),
+                    name=f"{item.dim.id}: {item.distribution} Data",
+                    legendgroup=stack.name,
+                    start_pos=float(offset),
+                    color=self.color,
+                )
         return self
 
     def add(self, item: Basic | Reviewed | Stack | ReviewedStack):
@@ -237,3 +470,86 @@ class StackPlot:
             raise TypeError(f"Cannot add {type(item)} to StackPlot")
 
         return self
+
+
+def _segments(start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+    """Interleave segment end points with None separators: [start0, stop0, None, start1, ...]."""
+    points = np.empty((len(start), 3), dtype=object)
+    points[:, 0] = start
+    points[:, 1] = stop
+    points[:, 2] = None
+    return points.ravel()
+
+
+def pdf_grid(
+    distribution: Normal | Uniform | NormalScreened,
+    start: float,
+    stop: float,
+    points: int = StackPlot.PDF_POINTS,
+    limits: tuple[float, ...] = (),
+) -> tuple[np.ndarray, np.ndarray]:
+    """Adaptive grid for drawing a pdf between start and stop.
+
+    A fixed budget of points is spread over the range, denser where the pdf bends
+    most (point density proportional to the square root of the curvature, which
+    minimizes the error of the drawn line segments). The ends of the range, the
+    given limits and the edges of bounded distributions are always part of the
+    grid, with a point on either side of a jump. Grids are cached by distribution
+    parameters, so contributors with identical distributions share them.
+
+    Args:
+        distribution (Normal | Uniform | NormalScreened): The distribution
+        start (float): start of the range
+        stop (float): end of the range
+        points (int): number of points of the grid
+        limits (tuple[float, ...]): positions to include in the grid
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: the grid and the pdf on the grid
+    """
+    key = getattr(distribution, "key", None)
+    if key is None:
+        return _pdf_grid(distribution, float(start), float(stop), points, tuple(limits))
+    key = (key, float(start), float(stop), points, tuple(limits))
+    with _PDF_GRIDS_LOCK:
+        grid = _PDF_GRIDS.get(key)
+        if grid is not None:
+            _PDF_GRIDS.move_to_end(key)
+            return grid
+    grid = _pdf_grid(distribution, *key[1:])
+    with _PDF_GRIDS_LOCK:
+        if len(_PDF_GRIDS) >= _PDF_GRIDS_SIZE:
+            _PDF_GRIDS.popitem(last=False)
+        _PDF_GRIDS[key] = grid
+    return grid
+
+
+_PDF_GRIDS: collections.OrderedDict = collections.OrderedDict()
+_PDF_GRIDS_SIZE = 1024
+_PDF_GRIDS_LOCK = threading.Lock()
+
+
+def _pdf_grid(distribution, start, stop, points, limits):
+    if stop <= start:
+        x = np.array([start])
+        return x, np.atleast_1d(distribution.pdf(x))
+
+    edges = [e for e in (getattr(distribution, "lower", None), getattr(distribution, "upper", None)) if e is not None]
+    fixed = [start, stop, *(x for x in (*limits, *edges) if start < x < stop)]
+
+    # pilot grid to measure the curvature of the pdf
+    pilot = np.linspace(start, stop, 4 * points)
+    density = np.sqrt(np.abs(np.gradient(np.gradient(distribution.pdf(pilot), pilot), pilot)))
+    # keep a share of the points uniform so flat regions are still drawn
+    density = density + density.mean() + np.finfo(float).tiny
+    cdf = np.concatenate([[0], np.cumsum((density[1:] + density[:-1]) / 2)])
+    x = np.interp(np.linspace(0, cdf[-1], max(points - 3 * len(fixed), 2)), cdf, pilot)
+
+    step = (stop - start) * 1e-9
+    jumps = [e + d for e in edges if start < e < stop for d in (-step, step)]
+    x = np.unique(np.concatenate([x, fixed, jumps]))
+    x = x[(x >= start) & (x <= stop)]
+    pdf = np.asarray(distribution.pdf(x), dtype=float)
+    x.flags.writeable = False
+    pdf.flags.writeable = False
+    return x, pdf
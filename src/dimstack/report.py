@@ -0,0 +1,216 @@
+import concurrent.futures
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import jinja2
+import plotly.offline
+from markupsafe import Markup
+
+from . import calc
+from .dim import Requirement, ReviewedStack, Stack
+from .display import DisplayMode, display_df
+from .plot import StackPlot
+from .utils import digest, nround
+
+MANIFEST = "manifest.json"
+PLOTLYJS = "plotly.min.js"
+
+# names and descriptions are escaped; the tables and figures are rendered HTML
+_ENV = jinja2.Environment(autoescape=True)
+
+_PAGE = _ENV.from_string(
+    """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{ name }}</title>
+<style>body { font-family: sans-serif; } table { border-collapse: collapse; margin-bottom: 1em; } td, th { padding: 2px 8px; }</style>
+</head>
+<body>
+<p><a href="index.html">Index</a></p>
+<h1>{{ name }}</h1>
+<p>{{ description }}</p>
+{% for table in tables %}{{ table }}
+{% endfor %}
+{{ figure }}
+{% if image %}<p><a href="{{ image }}">Static figure</a></p>{% endif %}
+</body>
+</html>
+"""
+)
+
+_INDEX = _ENV.from_string(
+    """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{ title }}</title>
+<style>body { font-family: sans-serif; } table { border-collapse: collapse; } td, th { padding: 2px 8px; text-align: left; }</style>
+</head>
+<body>
+<h1>{{ title }}</h1>
+<table>
+<tr><th>Stack</th><th>Dims.</th><th>WC Bounds</th><th>Reject PPM</th></tr>
+{% for entry in entries %}<tr><td><a href="{{ entry.file }}">{{ entry.name }}</a></td><td>{{ entry.dims }}</td><td>{{ entry.wc }}</td><td>{{ entry.ppm }}</td></tr>
+{% endfor %}</table>
+</body>
+</html>
+"""
+)
+
+
+def generate(
+    items: Iterable[Stack | ReviewedStack | tuple[Stack | ReviewedStack, float, float]],
+    path: str | Path,
+    title: str = "Tolerance Stack Report",
+    processes: int | None = None,
+    image_format: str | None = None,
+    progress: Callable[[int, int, str], None] | None = None,
+) -> list[Path]:
+    """
+    Generate a self-contained HTML review bundle for many stacks.
+
+    Every stack gets a page with its tables, the results of the `calc` analyses
+    and a `StackPlot` figure; an index page links them all. The pages are
+    rendered in a process pool. A manifest keeps the content hash of every
+    stack, and stacks that did not change since the last run into the same
+    directory are skipped.
+
+    Args:
+        items (Iterable): Stacks, or (stack, LL, UL) tuples to also report a Requirement on the stack result.
+        path (str | Path): Output directory of the bundle.
+        title (str, optional): Title of the index page. Defaults to "Tolerance Stack Report".
+        processes (int, optional): Number of worker processes. 0 renders in this process. Defaults to the CPU count.
+        image_format (str, optional): Also export static figures in this format (e.g. "png", requires kaleido).
+        progress (Callable, optional): Called with (done, total, stack name) as each stack is finished.
+
+    Returns:
+        list[Path]: The pages that were (re)rendered.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    if image_format is not None:
+        import kaleido  # noqa: F401  (static export needs kaleido; fail before starting the pool)
+
+    plotlyjs = path / PLOTLYJS
+    if not plotlyjs.exists():
+        plotlyjs.write_text(plotly.offline.get_plotlyjs(), encoding="utf-8")
+
+    manifest_path = path / MANIFEST
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+
+    jobs = []
+    entries = {}
+    slugs: set[str] = set()
+    for item in items:
+        stack, limits = (item[0], tuple(item[1:])) if isinstance(item, tuple) else (item, None)
+        slug = _slug(stack.name, slugs)
+        key = digest((stack.key, limits, image_format))
+        entries[slug] = manifest.get(slug) if manifest.get(slug, {}).get("hash") == key else None
+        if entries[slug] is None or not (path / entries[slug]["file"]).exists():
+            jobs.append((slug, key, stack, limits))
+
+    rendered = []
+    total = len(jobs)
+    for done, (slug, entry) in enumerate(_run(jobs, path, image_format, processes), start=1):
+        entries[slug] = entry
+        rendered.append(path / entry["file"])
+        if progress is not None:
+            progress(done, total, entry["name"])
+
+    manifest = {slug: entry for slug, entry in entries.items()}
+    manifest_path.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    (path / "index.html").write_text(_INDEX.render(title=title, entries=list(manifest.values())), encoding="utf-8")
+    return rendered
+
+
+def _run(jobs, path: Path, image_format: str | None, processes: int | None):
+    if processes == 0:
+        for slug, key, stack, limits in jobs:
+            yield slug, render(stack, limits, path, slug, key, image_format)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {
+            pool.submit(render, stack, limits, path, slug, key, image_format): slug for slug, key, stack, limits in jobs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], future.result()
+
+
+def render(
+    stack: Stack | ReviewedStack,
+    limits: tuple[float, float] | None,
+    path: Path,
+    slug: str,
+    key: str = "",
+    image_format: str | None = None,
+) -> dict[str, Any]:
+    """
+    Render the page of one stack.
+
+    Returns:
+        dict: The manifest entry of the page.
+    """
+    tables = []
+    if isinstance(stack, ReviewedStack):
+        tables.append(_table(stack.to_basic_stack().dict, f"DIMENSION STACK: {stack.name}"))
+        tables.append(_table(stack.dict, f"REVIEWED DIMENSION STACK: {stack.name}"))
+    else:
+        tables.append(_table(stack.dict, f"DIMENSION STACK: {stack.name}"))
+
+    wc = calc.WC(stack)
+    for result in [calc.Closed(stack), wc, calc.RSS(stack), calc.MRSS(stack)]:
+        tables.append(_table([result.dict], f"DIMENSION: {result.name}"))
+
+    ppm = ""
+    if isinstance(stack, ReviewedStack):
+        result = calc.SixSigma(stack)
+        tables.append(_table([result.dict], f"REVIEWED DIMENSION: {result.dim.name}"))
+        if limits is not None:
+            requirement = Requirement(stack.name, stack.description, result.distribution, *limits)
+            tables.append(_table(requirement.dict, f"REQUIREMENT: {requirement.name}"))
+            ppm = f"{nround(requirement.R, 2)}"
+
+    plot = StackPlot(title=stack.name).add(stack).add(calc.RSS(stack))
+    figure = plot.fig.to_html(full_html=False, include_plotlyjs=PLOTLYJS)
+    image = None
+    if image_format is not None:
+        image = f"{slug}.{image_format}"
+        plot.fig.write_image(path / image)
+
+    page = f"{slug}.html"
+    (path / page).write_text(
+        _PAGE.render(
+            name=stack.name,
+            description=stack.description,
+            tables=[Markup(table) for table in tables],
+            figure=Markup(figure),
+            image=image,
+        ),
+        encoding="utf-8",
+    )
+    return {
+        "name": stack.name,
+        "file": page,
+        "hash": key,
+        "dims": len(stack.dims),
+        "wc": f"[{nround(wc.abs_lower)}, {nround(wc.abs_upper)}]",
+        "ppm": ppm,
+    }
+
+
+def _table(data, title: str) -> str:
+    # a report page is not interactive, so every row is rendered
+    return display_df(data, title, dispmode=DisplayMode.HTML, page_size=None).to_html()
+
+
+def _slug(name: str, taken: set[str]) -> str:
+    base = re.sub(r"[^A-Za-z0-9_-]+", "-", name).strip("-").lower() or "stack"
+    slug, i = base, 1
+    while slug in taken:
+        i += 1
+        slug = f"{base}-{i}"
+    taken.add(slug)
+    return slug
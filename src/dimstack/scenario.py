@@ -0,0 +1,353 @@
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from . import crn, dist
+from .dim import Basic, Reviewed, ReviewedStack, Stack
+from .optimize import shifted
+from .tolerance import Bilateral
+
+FIELDS = ("nominal", "tolerance", "a", "distribution")
+CLOSED_FORM = ("Closed", "WC", "RSS", "MRSS")
+
+
+class Scenarios:
+    """
+    What-if variants of one stack, evaluated all at once.
+
+    Each factor changes some dimensions of the stack, with one set of changes
+    per level, and the scenarios are every combination of the factor levels.
+    The nominals, tolerances, sensitivities and distributions of the stack get
+    a leading scenario axis, so every `calc` method is evaluated for the whole
+    grid by broadcasting instead of once per copy of the stack.
+
+    >>> housing = Basic(nom=10, tol=Bilateral.symmetric(0.1), name="housing")
+    >>> shaft = Basic(nom=-9.8, tol=Bilateral.symmetric(0.05), name="shaft")
+    >>> scenarios = Scenarios(Stack(dims=[housing, shaft]))
+    >>> scenarios = scenarios.vary("housing tol", housing, [Bilateral.symmetric(t) for t in (0.05, 0.1)])
+    >>> scenarios.size
+    2
+
+    Args:
+        stack (Stack | ReviewedStack): The stack to vary.
+    """
+
+    def __init__(self, stack: Stack | ReviewedStack):
+        self.stack = stack
+        self.factors: dict[str, tuple[list[str], list[list[tuple[int, dict[str, Any]]]]]] = {}
+
+    def __str__(self) -> str:
+        factors = ", ".join(f"{name} ({len(labels)})" for name, (labels, _) in self.factors.items())
+        return f"{self.stack.name}: {self.size} scenarios of {factors}"
+
+    def vary(
+        self,
+        factor: str,
+        dim: Basic | Reviewed,
+        levels: Sequence[Any] | Mapping[str, Any],
+        field: str = "tolerance",
+    ) -> "Scenarios":
+        """
+        Add a factor, or the changes of one more dimension to an existing factor.
+
+        Args:
+            factor (str): The name of the factor, e.g. "bearing supplier".
+            dim (Basic | Reviewed): The dimension of the stack that changes.
+            levels (Sequence | Mapping[str, Any]): The value of `field` for every level, by label if a
+                mapping. A level may also be a mapping of several fields, e.g. {"tolerance": ..., "distribution": ...}.
+            field (str, optional): "nominal" (signed), "tolerance", "a" or "distribution". Defaults to "tolerance".
+
+        Returns:
+            Scenarios: self
+        """
+        index = self._index(dim)
+        if isinstance(levels, Mapping):
+            labels, values = [str(label) for label in levels], list(levels.values())
+        else:
+            values = list(levels)
+            labels = [str(value) for value in values]
+        changes = [dict(value) if isinstance(value, Mapping) else {field: value} for value in values]
+        for change in changes:
+            unknown = set(change) - set(FIELDS)
+            if unknown:
+                raise ValueError(f"Cannot vary {unknown}, only {FIELDS}")
+            if "distribution" in change and not isinstance(self.stack, ReviewedStack):
+                raise ValueError("Only the dimensions of a ReviewedStack have a distribution")
+            if (
+                isinstance(self.stack, ReviewedStack)
+                and "tolerance" in change
+                and "distribution" not in change
+                and not isinstance(self.stack.dims[index].distribution, dist.Normal)
+            ):
+                raise ValueError(
+                    f"Cannot rescale the {type(self.stack.dims[index].distribution).__name__} distribution of "
+                    f"{self.stack.dims[index].dim.name} to a new tolerance, vary its distribution too"
+                )
+
+        if factor not in self.factors:
+            self.factors[factor] = (labels, [[] for _ in labels])
+        elif self.factors[factor][0] != labels:
+            raise ValueError(f"The levels of {factor} are {self.factors[factor][0]}, not {labels}")
+        for level, change in zip(self.factors[factor][1], changes):
+            level.append((index, change))
+        return self
+
+    def _index(self, dim: Basic | Reviewed) -> int:
+        for i, item in enumerate(self.stack.dims):
+            if item is dim or getattr(item, "dim", None) is dim:
+                return i
+        raise ValueError(f"{dim} is not in {self.stack.name}")
+
+    @property
+    def size(self) -> int:
+        """The number of scenarios."""
+        return int(np.prod([len(labels) for labels, _ in self.factors.values()], dtype=int))
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """The number of levels of every factor."""
+        return tuple(len(labels) for labels, _ in self.factors.values())
+
+    @property
+    def grid(self) -> pd.DataFrame:
+        """The level of every factor in every scenario."""
+        index = np.unravel_index(np.arange(self.size), self.shape)
+        return pd.DataFrame(
+            {name: np.asarray(labels, dtype=object)[i] for (name, (labels, _)), i in zip(self.factors.items(), index)}
+        )
+
+    def arrays(self) -> dict[str, Any]:
+        """
+        The scenario x dimension arrays of the stack.
+
+        Returns:
+            dict[str, Any]: "dir", "nominal", "upper", "lower" and "a" arrays, and for a reviewed stack the
+                "distribution" array of indices into the "distributions" list.
+        """
+        reviewed = isinstance(self.stack, ReviewedStack)
+        dims = [rdim.dim for rdim in self.stack.dims] if reviewed else self.stack.dims
+        size = self.size
+        base = {
+            "dir": [dim.dir for dim in dims],
+            "nominal": [dim.nominal for dim in dims],
+            "upper": [dim.tolerance.upper for dim in dims],
+            "lower": [dim.tolerance.lower for dim in dims],
+            "a": [dim.a for dim in dims],
+        }
+        arrays: dict[str, Any] = {
+            key: np.tile(np.asarray(value, dtype=float), (size, 1)) for key, value in base.items()
+        }
+        distributions = []
+        if reviewed:
+            distributions = [rdim.distribution for rdim in self.stack.dims]
+            arrays["distribution"] = np.tile(np.arange(len(dims)), (size, 1))
+
+        for (labels, levels), level_of in zip(self.factors.values(), np.unravel_index(np.arange(size), self.shape)):
+            for j in sorted({j for changes in levels for j, _ in changes}):
+                values = [_level_value(base, distributions, j, changes) for changes in levels]
+                for key in values[0]:
+                    column = np.array([value[key] for value in values])
+                    arrays[key][:, j] = column[level_of]
+        arrays["distributions"] = distributions
+        return arrays
+
+    def evaluate(
+        self,
+        methods: Sequence[str] | None = None,
+        n: int = 0,
+        seed: int | None = None,
+        at: float = 3,
+        LL: float | None = None,
+        UL: float | None = None,
+    ) -> pd.DataFrame:
+        """
+        Evaluate every scenario with every method.
+
+        The distribution of a dimension of a reviewed stack follows the changes of
+        its nominal and tolerance unless a level gives its distribution: it moves
+        with the nominal, and a normal distribution keeps its shift (k) and its
+        standard deviation per unit of tolerance when the tolerance changes.
+
+        The closed-form methods follow the `calc` functions of the same name. With
+        `n` trials, a Monte Carlo simulation is added; it uses common random
+        numbers (`crn`), i.e. the same uniform draws of a contributor in every
+        scenario, even when its distribution varies, so the differences between
+        scenarios are not hidden by sampling noise.
+
+        Args:
+            methods (Sequence[str], optional): Among "Closed", "WC", "RSS", "MRSS" and "SixSigma" (reviewed
+                stacks). Defaults to all of them.
+            n (int, optional): Number of Monte Carlo trials, 0 for none. Defaults to 0.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+            at (float, optional): Number of standard deviations of the statistical tolerances. Defaults to 3.
+            LL (float, optional): Lower limit of the closure, to report the yield of the statistical methods.
+            UL (float, optional): Upper limit of the closure, to report the yield of the statistical methods.
+
+        Returns:
+            pd.DataFrame: One row per scenario and method, with the factor levels, the nominal, the absolute
+                bounds and (for the statistical methods) the standard deviation and yield of the closure.
+        """
+        reviewed = isinstance(self.stack, ReviewedStack)
+        if methods is None:
+            methods = CLOSED_FORM + (("SixSigma",) if reviewed else ())
+        arrays = self.arrays()
+        results = {method: _METHODS[method](arrays, at) for method in methods}
+        if n:
+            if not reviewed:
+                raise ValueError("Monte Carlo needs a ReviewedStack")
+            results["MonteCarlo"] = _monte_carlo(self.stack, arrays, n, seed, at, LL, UL)
+
+        grid = self.grid
+        frames = []
+        for method, result in results.items():
+            frame = grid.copy()
+            frame.insert(0, "Scenario", np.arange(self.size))
+            frame["Method"] = method
+            for key, value in result.items():
+                frame[key] = value
+            if LL is not None and UL is not None and "σ" in result and "Yield Prob." not in result:
+                frame["Yield Prob."] = norm.cdf(UL, result["Nominal"], result["σ"]) - norm.cdf(
+                    LL, result["Nominal"], result["σ"]
+                )
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True).sort_values(["Scenario"], kind="stable", ignore_index=True)
+
+
+def _level_value(base, distributions, j: int, changes) -> dict[str, Any]:
+    value = {key: base[key][j] for key in ("dir", "nominal", "upper", "lower", "a")}
+    if distributions:
+        value["distribution"] = j
+    for i, change in changes:
+        if i != j:
+            continue
+        if "nominal" in change:
+            value["dir"], value["nominal"] = float(np.sign(change["nominal"])), abs(change["nominal"])
+        if "tolerance" in change:
+            tolerance: Bilateral = change["tolerance"]
+            value["upper"], value["lower"] = tolerance.upper, tolerance.lower
+        if "a" in change:
+            value["a"] = change["a"]
+        if "distribution" in change:
+            value["distribution"] = len(distributions)
+            distributions.append(change["distribution"])
+    moved = any(key in value and value[key] != base[key][j] for key in ("dir", "nominal", "upper", "lower"))
+    if distributions and value["distribution"] == j and moved:
+        value["distribution"] = len(distributions)
+        distributions.append(_follow(distributions[j], base, j, value))
+    return value
+
+
+def _follow(distribution, base, j: int, value) -> Any:
+    """The distribution of dimension j moved (and for a normal one, scaled) from its base to the level `value`."""
+
+    def middle(v) -> float:
+        return v["dir"] * (v["nominal"] + (v["upper"] + v["lower"]) / 2)
+
+    old = {key: base[key][j] for key in ("dir", "nominal", "upper", "lower")}
+    T, new_T = old["upper"] - old["lower"], value["upper"] - value["lower"]
+    if T == new_T:
+        return shifted(distribution, middle(value) - middle(old))
+    # the same shift (k) and standard deviation per unit of tolerance, as when the distribution was assumed
+    return dist.Normal(
+        middle(value) + (distribution.mean - middle(old)) * new_T / T,
+        distribution.std_dev * new_T / T,
+    )
+
+
+def _abs_tols(arrays) -> tuple[np.ndarray, np.ndarray]:
+    positive = arrays["dir"] >= 0
+    return (
+        np.where(positive, arrays["lower"], -arrays["upper"]),
+        np.where(positive, arrays["upper"], -arrays["lower"]),
+    )
+
+
+def _median(arrays) -> np.ndarray:
+    return arrays["nominal"] + (arrays["lower"] + arrays["upper"]) / 2
+
+
+def _closed(arrays, at) -> dict[str, np.ndarray]:
+    nominal = (arrays["dir"] * arrays["nominal"] * arrays["a"]).sum(axis=1)
+    lower, upper = _abs_tols(arrays)
+    return {"Nominal": nominal, "Lower": nominal + lower.sum(axis=1), "Upper": nominal + upper.sum(axis=1)}
+
+
+def _symmetric(nominal, tolerance, std_dev=None) -> dict[str, np.ndarray]:
+    result = {"Nominal": nominal, "Lower": nominal - tolerance, "Upper": nominal + tolerance}
+    if std_dev is not None:
+        result["σ"] = std_dev
+    return result
+
+
+def _wc(arrays, at) -> dict[str, np.ndarray]:
+    half = (arrays["upper"] - arrays["lower"]) / 2 * arrays["a"]
+    return _symmetric((arrays["dir"] * _median(arrays) * arrays["a"]).sum(axis=1), np.abs(half).sum(axis=1))
+
+
+def _rss(arrays, at) -> dict[str, np.ndarray]:
+    half = (arrays["upper"] - arrays["lower"]) / 2 * arrays["a"]
+    return _symmetric((arrays["dir"] * _median(arrays) * arrays["a"]).sum(axis=1), np.sqrt((half**2).sum(axis=1)))
+
+
+def _mrss(arrays, at) -> dict[str, np.ndarray]:
+    half = (arrays["upper"] - arrays["lower"]) / 2 * arrays["a"]
+    t_wc = np.abs(half).sum(axis=1)
+    t_rss = np.sqrt((half**2).sum(axis=1))
+    n = arrays["a"].shape[1]
+    C_f = (0.5 * (t_wc - t_rss)) / (t_rss * (n**0.5 - 1)) + 1
+    return _symmetric((arrays["dir"] * _median(arrays) * arrays["a"]).sum(axis=1), C_f * t_rss)
+
+
+def _six_sigma(arrays, at) -> dict[str, np.ndarray]:
+    # the effective standard deviation of `Reviewed.std_dev_eff`: normal contributors, and the
+    # spread of the GD&T models about the middle of their tolerance
+    distributions = arrays["distributions"]
+    normal = np.array([isinstance(d, dist.Normal) for d in distributions])[arrays["distribution"]]
+    gdt = np.array([isinstance(d, (dist.Radial, dist.HalfNormal)) for d in distributions])[arrays["distribution"]]
+    mean = np.array([d.mean if isinstance(d, dist.Normal) else 0.0 for d in distributions])[arrays["distribution"]]
+    std_dev = np.array([d.std_dev if isinstance(d, dist.Normal) else 0.0 for d in distributions])
+    std_dev = std_dev[arrays["distribution"]]
+    moments = np.array(
+        [d.moments()[:2] if isinstance(d, (dist.Radial, dist.HalfNormal)) else (0.0, 0.0) for d in distributions]
+    )[arrays["distribution"]]
+    lower, upper = _abs_tols(arrays)
+    abs_nominal = arrays["dir"] * arrays["nominal"]
+    mean_eff = abs_nominal + (lower + upper) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        outer_shift = np.minimum(abs_nominal + upper - mean, mean - abs_nominal - lower)
+        std_dev_eff = np.where(normal, (arrays["upper"] - arrays["lower"]) * std_dev / (2 * outer_shift), 0)
+    std_dev_eff = np.where(gdt, np.sqrt(moments[..., 1] + (moments[..., 0] - mean_eff) ** 2), std_dev_eff)
+    std_dev = np.sqrt((std_dev_eff**2).sum(axis=1))
+    return _symmetric((arrays["dir"] * _median(arrays)).sum(axis=1), std_dev * at, std_dev)
+
+
+def _monte_carlo(stack: ReviewedStack, arrays, n: int, seed: int | None, at: float, LL, UL) -> dict[str, np.ndarray]:
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    distributions = arrays["distributions"]
+    table = np.empty((len(distributions), n))
+    for j, key in enumerate(crn.keys(stack)):
+        u = crn.uniforms(key, n, seed)
+        for k in np.unique(arrays["distribution"][:, j]):
+            table[k] = distributions[k].ppf(u)
+    size = arrays["a"].shape[0]
+    mean, std_dev, yields = np.empty(size), np.empty(size), np.full(size, np.nan)
+    chunk = max(1, 10**7 // n)
+    for start in range(0, size, chunk):
+        rows = slice(start, start + chunk)
+        closure = np.zeros((len(range(*rows.indices(size))), n))
+        for j in range(arrays["a"].shape[1]):
+            closure += arrays["a"][rows, j, None] * table[arrays["distribution"][rows, j]]
+        mean[rows] = closure.mean(axis=1)
+        std_dev[rows] = closure.std(axis=1, ddof=1)
+        if LL is not None and UL is not None:
+            yields[rows] = ((closure >= LL) & (closure <= UL)).mean(axis=1)
+    result = _symmetric(mean, std_dev * at, std_dev)
+    if LL is not None and UL is not None:
+        result["Yield Prob."] = yields
+    return result
+
+
+_METHODS = {"Closed": _closed, "WC": _wc, "RSS": _rss, "MRSS": _mrss, "SixSigma": _six_sigma}
@@ -0,0 +1,259 @@
+"""
+Selective assembly.
+
+Parts of some contributors are measured, sorted into bins and mated bin to
+bin, so that a large part meets a mating part that compensates it. The closure
+of the assemblies is much tighter than with random mating, at the cost of
+parts left over in bins that have no partner.
+
+The simulation works on whole populations: parts are binned with
+`np.searchsorted`, grouped by bin with a stable sort, and the assemblies of every
+bin are index ranges into the grouped populations.
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+
+from . import dist
+from .dim import Basic, Reviewed, ReviewedStack
+from .display import display_df
+from .model import sample_block
+from .utils import nround
+
+
+def assemble(
+    stack: ReviewedStack,
+    binned: Sequence[Basic | Reviewed],
+    LL: float,
+    UL: float,
+    bins: int = 3,
+    n: int = 100000,
+    rule: str = "complementary",
+    edges: str = "width",
+    gauge: float = 0,
+    seed: int | None = None,
+) -> "SelectiveAssembly":
+    """
+    Simulate the selective assembly of a stack.
+
+    `n` parts of every binned contributor are made and measured; parts measured
+    out of tolerance are scrapped. The others are sorted into `bins` bins of
+    their tolerance range, and bin i of every binned contributor is mated with
+    its matching bin of the others. The other contributors are drawn at random
+    for every assembly.
+
+    With the "complementary" rule, bins are ranked by contribution to the closure
+    (`a` times the value) for the first binned contributor and in reverse for the
+    others, so that deviations cancel, e.g. the largest bores with the largest
+    shafts in a clearance. With the "same" rule, bins are ranked by contribution
+    for every contributor.
+
+    >>> from dimstack.tolerance import Bilateral
+    >>> bore = Reviewed(Basic(10, Bilateral.symmetric(0.03), name="bore")).assume_normal_dist(3)
+    >>> shaft = Reviewed(Basic(-9.98, Bilateral.symmetric(0.03), name="shaft")).assume_normal_dist(3)
+    >>> result = assemble(ReviewedStack(dims=[bore, shaft]), [bore, shaft], LL=0.0, UL=0.04, n=100000, seed=0)
+    >>> result.yield_probability > result.random_yield_probability
+    True
+
+    Args:
+        stack (ReviewedStack): The stack.
+        binned (Sequence[Basic | Reviewed]): The contributors that are measured and binned.
+        LL (float): Lower limit of the closure.
+        UL (float): Upper limit of the closure.
+        bins (int, optional): Number of bins. Defaults to 3.
+        n (int, optional): Number of parts of every binned contributor. Defaults to 100000.
+        rule (str, optional): "complementary" or "same". Defaults to "complementary".
+        edges (str, optional): "width" for bins of equal width over the tolerance, or "count" for bins of
+            equal count in the measured population. Defaults to "width".
+        gauge (float, optional): Standard deviation of the measurement error. Defaults to 0.
+        seed (int, optional): Seed of the random number generator. Defaults to None.
+
+    Returns:
+        SelectiveAssembly: The assemblies, their yield, and the scrapped and leftover parts.
+    """
+    if rule not in ("complementary", "same"):
+        raise ValueError(f"Unknown rule {rule}")
+    if edges not in ("width", "count"):
+        raise ValueError(f"Unknown edges {edges}")
+    rng = np.random.default_rng(seed)
+    columns = [_index(stack, dim) for dim in binned]
+    rdims = [stack.dims[j] for j in columns]
+    values = sample_block(rdims, n, rng)
+    measured = values + gauge * rng.standard_normal(values.shape) if gauge else values
+
+    counts = np.zeros((len(rdims), bins), dtype=np.int64)
+    grouped = np.empty_like(values)
+    starts = np.zeros((len(rdims), bins), dtype=np.int64)
+    scrap = np.zeros(len(rdims), dtype=np.int64)
+    good = []
+    for i, rdim in enumerate(rdims):
+        lower, upper = sorted((rdim.dim.abs_lower, rdim.dim.abs_upper))
+        inside = (measured[i] >= lower) & (measured[i] <= upper)
+        scrap[i] = n - int(inside.sum())
+        good.append(values[i][inside])
+        if edges == "width":
+            inner = np.linspace(lower, upper, bins + 1)[1:-1]
+        else:
+            inner = np.quantile(measured[i][inside], np.linspace(0, 1, bins + 1)[1:-1])
+        bin_of = np.searchsorted(inner, measured[i], side="right")
+        # rank the bins by contribution to the closure
+        descending = rdim.dim.a < 0
+        if rule == "complementary" and i > 0:
+            descending = not descending
+        if descending:
+            bin_of = bins - 1 - bin_of
+        # small integers, so that the stable sort is a radix sort
+        bin_of = np.where(inside, bin_of, bins).astype(np.uint16)
+        order = np.argsort(bin_of, kind="stable")
+        counts[i] = np.bincount(bin_of, minlength=bins + 1)[:bins]
+        starts[i] = np.concatenate([[0], np.cumsum(counts[i])[:-1]])
+        grouped[i] = values[i][order]
+
+    # bin i of every binned contributor is mated: the first m_i parts of each
+    mated = counts.min(axis=0)
+    total = int(mated.sum())
+    bin_of_assembly = np.repeat(np.arange(bins), mated)
+    rank = np.arange(total) - np.repeat(np.cumsum(mated) - mated, mated)
+    closures = np.zeros(total)
+    for i, j in enumerate(columns):
+        closures += stack.dims[j].dim.a * grouped[i][starts[i][bin_of_assembly] + rank]
+    others = [j for j in range(len(stack.dims)) if j not in columns]
+    for block, j in zip(sample_block([stack.dims[j] for j in others], total, rng), others):
+        closures += stack.dims[j].dim.a * block
+
+    # the same good parts mated at random (in the order they were made), for comparison
+    random_total = min(len(parts) for parts in good)
+    random_closures = np.zeros(random_total)
+    for i, j in enumerate(columns):
+        random_closures += stack.dims[j].dim.a * good[i][:random_total]
+    for block, j in zip(sample_block([stack.dims[j] for j in others], random_total, rng), others):
+        random_closures += stack.dims[j].dim.a * block
+
+    return SelectiveAssembly(
+        stack,
+        rdims,
+        LL,
+        UL,
+        closures,
+        bin_of_assembly,
+        counts - mated,
+        scrap,
+        float(((random_closures >= LL) & (random_closures <= UL)).mean()),
+        n,
+    )
+
+
+def _index(stack: ReviewedStack, dim: Basic | Reviewed) -> int:
+    for i, rdim in enumerate(stack.dims):
+        if rdim is dim or rdim.dim is dim:
+            return i
+    raise ValueError(f"{dim} is not in {stack.name}")
+
+
+class SelectiveAssembly:
+    """
+    Result of `assemble`.
+
+    Args:
+        stack (ReviewedStack): The stack.
+        binned (list[Reviewed]): The binned contributors.
+        LL (float): Lower limit of the closure.
+        UL (float): Upper limit of the closure.
+        closures (np.ndarray): The closure of every assembly.
+        bins (np.ndarray): The bin of every assembly.
+        leftovers (np.ndarray): (binned contributors x bins) parts without a partner.
+        scrap (np.ndarray): Parts of every binned contributor measured out of tolerance.
+        random_yield_probability (float): Yield of the same parts mated at random.
+        n (int): Number of parts of every binned contributor.
+    """
+
+    def __init__(
+        self,
+        stack: ReviewedStack,
+        binned: list[Reviewed],
+        LL: float,
+        UL: float,
+        closures: np.ndarray,
+        bins: np.ndarray,
+        leftovers: np.ndarray,
+        scrap: np.ndarray,
+        random_yield_probability: float,
+        n: int,
+    ):
+        self.stack = stack
+        self.binned = binned
+        self.LL = LL
+        self.UL = UL
+        self.closures = closures
+        self.bins = bins
+        self.leftovers = leftovers
+        self.scrap = scrap
+        self.random_yield_probability = random_yield_probability
+        self.n = n
+
+    def __str__(self) -> str:
+        return (
+            f"{self.stack.name}: {self.assemblies} selective assemblies of {self.n} parts, "
+            f"yield {nround(self.yield_probability * 100, 4)}% (random {nround(self.random_yield_probability * 100, 4)}%)"
+        )
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"SELECTIVE ASSEMBLY: {self.stack.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"SELECTIVE ASSEMBLY: {self.stack.name}")
+
+    def show(self):
+        return display_df(self.dict, f"SELECTIVE ASSEMBLY: {self.stack.name}")
+
+    @property
+    def assemblies(self) -> int:
+        """Number of assemblies."""
+        return len(self.closures)
+
+    @property
+    def passed(self) -> np.ndarray:
+        """Whether every assembly is within the limits."""
+        return (self.closures >= self.LL) & (self.closures <= self.UL)
+
+    @property
+    def yield_probability(self) -> float:
+        """Fraction of the assemblies within the limits."""
+        return float(self.passed.mean()) if self.assemblies else 0.0
+
+    @property
+    def distribution(self) -> dist.Normal:
+        """Normal distribution fitted to the closures."""
+        return dist.Normal.fit(self.closures)
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        assemblies = np.bincount(self.bins, minlength=self.leftovers.shape[1])
+        good = np.bincount(self.bins, weights=self.passed, minlength=self.leftovers.shape[1])
+        rows = [
+            {
+                "Bin": str(b + 1),
+                "Assemblies": str(assemblies[b]),
+                "Yield Prob.": f"{nround(good[b] / assemblies[b] * 100, 4)}" if assemblies[b] else "",
+                **{f"Leftover {rdim.dim.name}": str(self.leftovers[i, b]) for i, rdim in enumerate(self.binned)},
+            }
+            for b in range(self.leftovers.shape[1])
+        ]
+        rows.append(
+            {
+                "Bin": "Total",
+                "Assemblies": str(self.assemblies),
+                "Yield Prob.": f"{nround(self.yield_probability * 100, 4)}",
+                **{f"Leftover {rdim.dim.name}": str(self.leftovers[i].sum()) for i, rdim in enumerate(self.binned)},
+            }
+        )
+        rows.append(
+            {
+                "Bin": "Scrap",
+                "Assemblies": "",
+                "Yield Prob.": "",
+                **{f"Leftover {rdim.dim.name}": str(self.scrap[i]) for i, rdim in enumerate(self.binned)},
+            }
+        )
+        return rows
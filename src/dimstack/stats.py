@@ -1,6 +1,10 @@
 import math
 from typing import List
 
+import numpy as np
+
+from . import kernels
+
 # "6 Sigma" equations.
 
 
@@ -68,11 +72,7 @@ def rss(args: List[float]):
     >>> rss([1, 2, 3])
     3.7416573867739413
     """
-    val = 0
-    for arg in args:
-        val += arg * arg
-    val = math.sqrt(val)
-    return val
+    return kernels.rss(args)
 
 
 def C_f(t_rss, t_wc, n):
@@ -108,6 +108,90 @@ def normal_dist(x, mean=0, std_dev=1):
     return prob_density
 
 
+class Histogram:
+    """
+    Streaming histogram with fixed bins.
+
+    Samples can be added block by block (e.g. one Monte Carlo chunk at a time);
+    only the bin counts are kept, so the memory and the size of a plot of the
+    histogram do not depend on the number of samples.
+
+    Args:
+        edges (np.ndarray): Bin edges.
+
+    >>> h = Histogram(np.array([0.0, 1.0, 2.0]))
+    >>> h.add([0.5, 1.5, 1.7, 3.0])
+    >>> h.counts.tolist(), h.n, h.overflow
+    ([1, 2], 4, 1)
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @classmethod
+    def from_range(cls, start: float, stop: float, bins: int = 100) -> "Histogram":
+        """Histogram of `bins` equal bins between start and stop."""
+        return cls(np.linspace(start, stop, bins + 1))
+
+    @classmethod
+    def from_data(cls, data, size: float | None = None, max_bins: int = 10000) -> "Histogram":
+        """
+        Histogram of data, with bins of the given size aligned on multiples of size.
+
+        Args:
+            data (np.ndarray): The samples.
+            size (float, optional): Bin size. Defaults to NumPy's automatic bins.
+            max_bins (int, optional): Largest number of bins. Defaults to 10000.
+        """
+        data = np.asarray(data, dtype=float)
+        if size is None:
+            edges = np.histogram_bin_edges(data, bins="auto")
+            if len(edges) > max_bins + 1:
+                edges = np.linspace(edges[0], edges[-1], max_bins + 1)
+        else:
+            start = math.floor(data.min() / size) * size
+            bins = min(max(math.ceil((data.max() - start) / size), 1), max_bins)
+            edges = np.linspace(start, start + max(bins * size, data.max() - start), bins + 1)
+        inst = cls(edges)
+        inst.add(data)
+        return inst
+
+    def add(self, samples) -> None:
+        """Add a block of samples."""
+        samples = np.asarray(samples, dtype=float)
+        self.counts += np.histogram(samples, bins=self.edges)[0]
+        self.underflow += int((samples < self.edges[0]).sum())
+        self.overflow += int((samples > self.edges[-1]).sum())
+
+    @property
+    def n(self) -> int:
+        """Number of samples added."""
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    @property
+    def centers(self) -> np.ndarray:
+        """Bin centers."""
+        return (self.edges[1:] + self.edges[:-1]) / 2
+
+    @property
+    def widths(self) -> np.ndarray:
+        """Bin widths."""
+        return np.diff(self.edges)
+
+    @property
+    def probability(self) -> np.ndarray:
+        """Share of the samples in every bin."""
+        return self.counts / max(self.n, 1)
+
+    @property
+    def density(self) -> np.ndarray:
+        """Probability density of every bin."""
+        return self.probability / self.widths
+
+
 if __name__ == "__main__":
     import doctest
 
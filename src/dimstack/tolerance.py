@@ -1,20 +1,62 @@
-from .utils import nround, sign_symbol
+import weakref
+from typing import TYPE_CHECKING, ClassVar
+
 import numpy as np
+from scipy.stats import norm
+
+from . import dist
+from .utils import nround, sign_symbol
+
+if TYPE_CHECKING:
+    from .dim import Basic
 
 
 class Bilateral:
     """
     Bilateral tolerancing is a method of specifying a tolerance that is symmetrical about the nominal value.
     This is the most common type of tolerancing.
+
+    Tolerances are immutable and interned: equal tolerances are the same object,
+    so a model with many dimensions keeps one instance per distinct tolerance.
+
+    >>> Bilateral.symmetric(0.1) is Bilateral(-0.1, 0.1)
+    True
     """
 
-    def __init__(self, upper: float, lower: float):
+    __slots__ = ("__weakref__", "_lower", "_upper")
+
+    _interned: ClassVar["weakref.WeakValueDictionary[tuple, Bilateral]"] = weakref.WeakValueDictionary()
+
+    def __new__(cls, upper: float, lower: float):
         if upper < lower:
-            self._upper = lower
-            self._lower = upper
-        else:
-            self._upper = upper
-            self._lower = lower
+            upper, lower = lower, upper
+        return cls._intern((type(upper), upper, type(lower), lower), _upper=upper, _lower=lower)
+
+    @classmethod
+    def _intern(cls, key: tuple, **fields):
+        """The interned instance with `key`, or a new one with `fields` set."""
+        try:
+            key = (cls, *key)
+            return cls._interned[key]
+        except TypeError:
+            key = None
+        except KeyError:
+            pass
+        self = object.__new__(cls)
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+        if key is not None:
+            cls._interned[key] = self
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (type(self), (self._upper, self._lower))
 
     def __str__(self) -> str:
         if np.abs(self._upper + self._lower) < np.finfo(float).eps:
@@ -58,6 +100,13 @@ class Bilateral:
         """
         return self._lower
 
+    @property
+    def key(self) -> tuple:
+        """
+        Hashable summary of the tolerance
+        """
+        return (self._upper, self._lower)
+
     @property
     def T(self):
         """
@@ -66,6 +115,214 @@ class Bilateral:
         return self._upper - self._lower
 
 
+class Position(Bilateral):
+    """
+    True position tolerance: a circular zone of diameter `zone` about the true
+    position of a feature, optionally with a material condition modifier.
+
+    At MMC (or LMC), the zone grows by the departure of the size of the feature
+    from its MMC (or LMC), up to `bonus`, the size tolerance of the feature. The
+    worst-case equivalent along the stack is ± half the largest zone, so the
+    tolerance works with `calc.WC`, `calc.RSS` and `calc.SixSigma` like a
+    Bilateral tolerance.
+
+    >>> t = Position(0.1, modifier="MMC", bonus=0.04)
+    >>> str(t), t.upper, t.lower
+    ('Position ⌀0.1 MMC (+0.04)', 0.07, -0.07)
+    >>> t is Position(0.1, modifier="MMC", bonus=0.04)
+    True
+
+    Args:
+        zone (float): Diameter of the tolerance zone.
+        modifier (str, optional): None (regardless of feature size), "MMC" or "LMC". Defaults to None.
+        bonus (float, optional): Largest bonus, the size tolerance of the feature. Defaults to 0.
+    """
+
+    __slots__ = ("_bonus", "_modifier", "_zone")
+
+    def __new__(cls, zone: float, modifier: str | None = None, bonus: float = 0):
+        if modifier not in (None, "MMC", "LMC"):
+            raise ValueError(f"Unknown modifier {modifier}")
+        if bonus and modifier is None:
+            raise ValueError("A bonus tolerance needs a MMC or LMC modifier")
+        half = (zone + bonus) / 2
+        return cls._intern(
+            (type(zone), zone, modifier, type(bonus), bonus),
+            _upper=half,
+            _lower=-half,
+            _zone=zone,
+            _modifier=modifier,
+            _bonus=bonus,
+        )
+
+    def __reduce__(self):
+        return (type(self), (self._zone, self._modifier, self._bonus))
+
+    def __str__(self) -> str:
+        modifier = f" {self._modifier}" if self._modifier else ""
+        bonus = f" (+{nround(self._bonus)})" if self._bonus else ""
+        return f"Position ⌀{nround(self._zone)}{modifier}{bonus}"
+
+    @property
+    def zone(self) -> float:
+        """Diameter of the tolerance zone, without bonus"""
+        return self._zone
+
+    @property
+    def modifier(self) -> str | None:
+        """Material condition modifier"""
+        return self._modifier
+
+    @property
+    def bonus(self) -> float:
+        """Largest bonus tolerance"""
+        return self._bonus
+
+    @property
+    def key(self) -> tuple:
+        return ("Position", self._zone, self._modifier, self._bonus)
+
+    def distribution(self, dim: "Basic", target_process_sigma: float = 3) -> dist.Radial:
+        """
+        Radial error model: an isotropic normal error of the position, with as many
+        parts inside the zone (without bonus) as within ± `target_process_sigma` of a
+        normal process.
+        """
+        std_dev = _rayleigh_std_dev(self._zone / 2, target_process_sigma)
+        return dist.Radial(dim.abs_median, std_dev, self._zone / 2, self._bonus)
+
+
+class Runout(Bilateral):
+    """
+    Circular or total runout tolerance, the full indicator movement `fim` of a
+    rotating feature. The runout of an eccentric feature is twice its
+    eccentricity, so the feature is displaced by at most ± fim/2 along the
+    stack, with the radial error model of a position tolerance of diameter `fim`.
+
+    Args:
+        fim (float): Full indicator movement.
+    """
+
+    __slots__ = ("_fim",)
+
+    def __new__(cls, fim: float):
+        return cls._intern((type(fim), fim), _upper=fim / 2, _lower=-fim / 2, _fim=fim)
+
+    def __reduce__(self):
+        return (type(self), (self._fim,))
+
+    def __str__(self) -> str:
+        return f"Runout {nround(self._fim)}"
+
+    @property
+    def fim(self) -> float:
+        """Full indicator movement"""
+        return self._fim
+
+    @property
+    def key(self) -> tuple:
+        return ("Runout", self._fim)
+
+    def distribution(self, dim: "Basic", target_process_sigma: float = 3) -> dist.Radial:
+        """Radial error model of the eccentricity, as for a position tolerance of diameter `fim`."""
+        return dist.Radial(dim.abs_median, _rayleigh_std_dev(self._fim / 2, target_process_sigma), self._fim / 2)
+
+
+class Profile(Bilateral):
+    """
+    Profile of a surface (or line) tolerance: a zone of width `zone` about the
+    true profile, shifted outwards by `offset` for an unequally disposed zone.
+
+    >>> t = Profile(0.2, offset=0.1)
+    >>> str(t), t.upper, t.lower
+    ('Profile 0.2 +0.1', 0.2, 0.0)
+
+    Args:
+        zone (float): Width of the tolerance zone.
+        offset (float, optional): Offset of the middle of the zone from the true profile. Defaults to 0.
+    """
+
+    __slots__ = ("_offset", "_zone")
+
+    def __new__(cls, zone: float, offset: float = 0):
+        return cls._intern(
+            (type(zone), zone, type(offset), offset),
+            _upper=offset + zone / 2,
+            _lower=offset - zone / 2,
+            _zone=zone,
+            _offset=offset,
+        )
+
+    def __reduce__(self):
+        return (type(self), (self._zone, self._offset))
+
+    def __str__(self) -> str:
+        offset = f" {sign_symbol(self._offset)}{nround(abs(self._offset))}" if self._offset else ""
+        return f"Profile {nround(self._zone)}{offset}"
+
+    @property
+    def zone(self) -> float:
+        """Width of the tolerance zone"""
+        return self._zone
+
+    @property
+    def offset(self) -> float:
+        """Offset of the middle of the zone"""
+        return self._offset
+
+    @property
+    def key(self) -> tuple:
+        return ("Profile", self._zone, self._offset)
+
+    def distribution(self, dim: "Basic", target_process_sigma: float = 3) -> dist.Normal:
+        """Normal model of the surface, centered in the zone."""
+        return dist.Normal(dim.abs_median, self._zone / (2 * target_process_sigma))
+
+
+class Flatness(Bilateral):
+    """
+    Flatness tolerance of a face that seats on a mating part. The face touches
+    its mate on its high points, so the stacked point lies between 0 and
+    `zone` from the contact plane, into the material.
+
+    Args:
+        zone (float): Width of the tolerance zone.
+    """
+
+    __slots__ = ("_zone",)
+
+    def __new__(cls, zone: float):
+        return cls._intern((type(zone), zone), _upper=zone, _lower=0 * zone, _zone=zone)
+
+    def __reduce__(self):
+        return (type(self), (self._zone,))
+
+    def __str__(self) -> str:
+        return f"Flatness {nround(self._zone)}"
+
+    @property
+    def zone(self) -> float:
+        """Width of the tolerance zone"""
+        return self._zone
+
+    @property
+    def key(self) -> tuple:
+        return ("Flatness", self._zone)
+
+    def distribution(self, dim: "Basic", target_process_sigma: float = 3) -> dist.HalfNormal:
+        """
+        Half-normal model of the form error: most of the face is near the contact
+        plane, with as many parts within the zone as within ± `target_process_sigma`
+        of a normal process.
+        """
+        return dist.HalfNormal(dim.abs_nominal, self._zone / target_process_sigma, dim.dir * self._zone)
+
+
+def _rayleigh_std_dev(radius: float, target_process_sigma: float) -> float:
+    # the fraction of an isotropic 2D normal error within `radius` is 1 - exp(-radius² / 2σ²)
+    return radius / np.sqrt(-2 * np.log(2 * norm.sf(target_process_sigma)))
+
+
 if __name__ == "__main__":
     import doctest
 
@@ -1,5 +1,9 @@
+import hashlib
+import math
 from decimal import ROUND_HALF_UP, Decimal
 
+import numpy as np
+
 DECIMALS = 5
 POSITIVE = "+"
 NEGATIVE = "-"
@@ -8,6 +12,11 @@ NEGATIVE = "-"
 def nround(number, ndigits=DECIMALS):
     """
     Always round off
+
+    Rounds half up (away from zero) on the exact binary value of the number, as
+    `Decimal.quantize` with `ROUND_HALF_UP` does. Works on scalars, keeping
+    their type, and on NumPy arrays.
+
     >>> nround(4.114, 2)
     4.11
     >>> nround(4.115, 2)
@@ -16,12 +25,47 @@ def nround(number, ndigits=DECIMALS):
     4.12
     >>> nround(-0.03401, 3)
     -0.034
+    >>> nround(np.array([4.114, 4.115, -0.125]), 2)
+    array([ 4.11,  4.12, -0.13])
     """
-    # return round(number, ndigits)
-
+    if isinstance(number, np.ndarray):
+        if number.dtype.kind in "iub":
+            return number.copy()
+        return _round_half_up(number, ndigits)
+    if isinstance(number, (int, np.integer)):
+        return number
+    value = float(number)
+    scale = 10.0**ndigits
+    scaled = abs(value) * scale
+    if not math.isfinite(scaled) or abs(value) >= 2.0**52:
+        return number
+    if scaled < 2.0**52 and abs(scaled - math.floor(scaled) - 0.5) > scaled * 4.5e-16 + 1e-12:
+        return type(number)(math.copysign(math.floor(scaled + 0.5) / scale, value))
+    # too close to a tie for the float product to decide
     # https://stackoverflow.com/questions/43851273/how-to-round-float-0-5-up-to-1-0-while-still-rounding-0-45-to-0-0-as-the-usual
-    exp = Decimal("1.{}".format(ndigits * "0")) if ndigits else Decimal("1")
-    return type(number)(Decimal(number).quantize(exp, ROUND_HALF_UP))
+    exp = Decimal("1.{}".format(ndigits * "0")) if ndigits else Decimal(1)
+    return type(number)(Decimal(value).quantize(exp, ROUND_HALF_UP))
+
+
+def _round_half_up(x: np.ndarray, ndigits: int = DECIMALS) -> np.ndarray:
+    """Round a float array half up (away from zero) like `nround`, without a `Decimal` per value.
+
+    Each value is rounded from its scaled absolute value; the few values whose
+    scaled fraction is too close to one half for the float product to decide
+    (or that are too large for it) are rounded exactly with `Decimal`.
+    """
+    x = np.asarray(x, dtype=float)
+    scale = 10.0**ndigits
+    with np.errstate(invalid="ignore"):
+        scaled = np.abs(x) * scale
+        small = np.abs(x) < 2.0**52
+        out = np.where(small, np.copysign(np.floor(scaled + 0.5) / scale, x), x)
+        tie = np.abs(scaled - np.floor(scaled) - 0.5) <= scaled * 4.5e-16 + 1e-12
+        exact = small & (tie | (scaled >= 2.0**52))
+    if exact.any():
+        quantum = Decimal("1.{}".format(ndigits * "0")) if ndigits else Decimal(1)
+        out[exact] = [float(Decimal(value).quantize(quantum, ROUND_HALF_UP)) for value in x[exact].tolist()]
+    return out
 
 
 def sign(x):
@@ -60,6 +104,20 @@ def sign_symbol(x):
         return NEGATIVE
 
 
+def digest(key) -> str:
+    """Return a stable content hash of a `key` tuple (e.g. `Stack.key`).
+
+    The hash only depends on the content, so it is the same in every process
+    and every session.
+
+    >>> digest((1.0, "a")) == digest((1.0, "a"))
+    True
+    >>> digest((1.0, "a")) == digest((1.0, "b"))
+    False
+    """
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
 if __name__ == "__main__":
     import doctest
 
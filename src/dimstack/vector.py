@@ -0,0 +1,408 @@
+"""
+2D and 3D vector-loop tolerance stacks.
+
+A vector loop is a chain of rigid transforms from a datum frame to the
+feature whose position is the closure. Every link is a translation along, or
+a rotation about, an axis of the current frame by the value of a contributor,
+or a fixed transform. The closure is the position of the end of the chain
+along the `measure` direction of the datum frame.
+
+The loop is solved for a whole block of trials at once: the rotation matrix
+of the current frame is held as (axes x axes x trials) arrays and every link
+updates it with a few array operations, in chunks of trials. The Jacobian of
+the closure with respect to the contributors is batched the same way, from
+the frame of every link (a translation moves the end along its axis, a
+rotation swings the end about its axis), and linearizes the loop for the
+WC, RSS and 6 Sigma analyses.
+"""
+
+from typing import Any, Sequence
+
+import numpy as np
+
+from . import dist
+from .dim import Basic, Reviewed
+from .display import display_df
+from .model import sample_block
+from .tolerance import Bilateral
+from .utils import nround
+
+CHUNK = 2**16
+
+
+class Translation:
+    """
+    Translation of the frame along an axis of the current frame by the value of a contributor.
+
+    Args:
+        dim (Basic | Reviewed): The length.
+        axis (Sequence[float], optional): The direction, in the current frame. Defaults to x.
+    """
+
+    __slots__ = ("axis", "dim")
+
+    def __init__(self, dim: Basic | Reviewed, axis: Sequence[float] = (1, 0, 0)):
+        self.dim = dim
+        self.axis = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+
+    def __str__(self) -> str:
+        return f"Translation {_name(self.dim)} along {self.axis.tolist()}"
+
+
+class Rotation:
+    """
+    Rotation of the frame about an axis of the current frame by the value of a contributor.
+
+    In a planar loop, rotations are about the normal of the plane and `axis` is ignored.
+
+    Args:
+        dim (Basic | Reviewed): The angle.
+        axis (Sequence[float], optional): The axis, in the current frame. Defaults to z.
+        degrees (bool, optional): Whether the angle is in degrees. Defaults to False (radians).
+    """
+
+    __slots__ = ("axis", "dim", "scale")
+
+    def __init__(self, dim: Basic | Reviewed, axis: Sequence[float] = (0, 0, 1), degrees: bool = False):
+        self.dim = dim
+        self.axis = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+        self.scale = np.pi / 180 if degrees else 1.0
+
+    def __str__(self) -> str:
+        return f"Rotation {_name(self.dim)} about {self.axis.tolist()}"
+
+
+class Fixed:
+    """
+    A fixed (nominal, exact) transform of the frame.
+
+    Args:
+        matrix (np.ndarray): Homogeneous transform, 3x3 in a planar loop or 4x4 in a spatial loop.
+    """
+
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = np.asarray(matrix, dtype=float)
+
+    def __str__(self) -> str:
+        return f"Fixed {self.matrix.tolist()}"
+
+
+Link = Translation | Rotation | Fixed
+
+
+def vector(length: Basic | Reviewed, angle: Basic | Reviewed, degrees: bool = False) -> list[Link]:
+    """
+    A vector dimension: a length in the direction of an angle from the x axis of the current frame.
+
+    The angle also turns the frame, so the next link is relative to the vector.
+
+    Args:
+        length (Basic | Reviewed): The length.
+        angle (Basic | Reviewed): The angle, about z.
+        degrees (bool, optional): Whether the angle is in degrees. Defaults to False (radians).
+
+    Returns:
+        list[Link]: The rotation and the translation.
+    """
+    return [Rotation(angle, degrees=degrees), Translation(length)]
+
+
+class Loop:
+    """
+    A 2D or 3D vector loop.
+
+    Contributors are pooled by identity, in the order of their first link, so a
+    dimension used by several links takes the same value in all of them. The
+    value of a contributor is its absolute value; its sensitivity `a` is not
+    used, the loop is the function.
+
+    >>> from dimstack.tolerance import Bilateral
+    >>> arm = Reviewed(Basic(100, Bilateral.symmetric(0.1), name="arm")).assume_normal_dist(3)
+    >>> angle = Reviewed(Basic(30, Bilateral.symmetric(0.5), name="angle")).assume_normal_dist(3)
+    >>> loop = Loop(vector(arm, angle, degrees=True), measure=(0, 1))
+    >>> [rdim.dim.name for rdim in loop.dims]
+    ['angle', 'arm']
+    >>> round(float(loop.closure(np.array([[30.0], [100.0]]))[0]), 6)
+    50.0
+    >>> [round(float(j), 6) for j in loop.jacobian()]
+    [1.511499, 0.5]
+
+    Args:
+        links (Sequence[Link | Sequence[Link]]): The links, from the datum frame to the feature.
+        measure (Sequence[float], optional): Direction of the closure in the datum frame; two
+            components for a planar loop, three for a spatial loop. Defaults to x in 3D.
+        name (str, optional): The name of the loop. Defaults to "Loop".
+        description (str, optional): The description of the loop. Defaults to "".
+    """
+
+    def __init__(
+        self,
+        links: Sequence[Link | Sequence[Link]],
+        measure: Sequence[float] = (1, 0, 0),
+        name: str = "Loop",
+        description: str = "",
+    ):
+        self.links: list[Link] = []
+        for link in links:
+            self.links.extend([link] if isinstance(link, (Translation, Rotation, Fixed)) else link)
+        self.measure = np.asarray(measure, dtype=float)
+        self.space = len(self.measure)
+        if self.space not in (2, 3):
+            raise ValueError(f"A loop is planar or spatial, not {self.space}D")
+        self.name = name
+        self.description = description
+
+        self.dims: list[Reviewed] = []
+        self._columns: list[int | None] = []
+        columns: dict[int, int] = {}
+        for link in self.links:
+            if isinstance(link, Fixed):
+                if link.matrix.shape != (self.space + 1, self.space + 1):
+                    raise ValueError(f"{link} is not a {self.space}D homogeneous transform")
+                self._columns.append(None)
+                continue
+            if isinstance(link, Translation) and len(link.axis) < self.space:
+                raise ValueError(f"{link} is not a {self.space}D direction")
+            key = id(link.dim.dim if isinstance(link.dim, Reviewed) else link.dim)
+            if key not in columns:
+                columns[key] = len(self.dims)
+                self.dims.append(link.dim if isinstance(link.dim, Reviewed) else link.dim.review())
+            self._columns.append(columns[key])
+
+    def __str__(self) -> str:
+        return f"{self.name}: {len(self.links)} links, {len(self.dims)} contributors ({self.space}D)"
+
+    def _repr_html_(self):
+        return display_df(self.dict, f"VECTOR LOOP: {self.name}", dispmode="html")
+
+    def _display_(self):
+        return display_df(self.dict, f"VECTOR LOOP: {self.name}")
+
+    def show(self):
+        return display_df(self.dict, f"VECTOR LOOP: {self.name}")
+
+    @property
+    def dict(self) -> list[dict[str, Any]]:
+        means = self.means
+        jacobian = self.jacobian()
+        std_devs = np.array([np.sqrt(rdim.distribution.moments()[1]) for rdim in self.dims])
+        variance = (jacobian * std_devs) ** 2
+        share = variance / variance.sum() if variance.sum() > 0 else variance
+        return [
+            {
+                "Dim.": rdim.dim.name,
+                "Mean": nround(float(mean)),
+                "σ": nround(float(std_dev)),
+                "Sensitivity": nround(float(j)),
+                "Variance Contribution": f"{nround(float(s) * 100, 2)}%",
+            }
+            for rdim, mean, std_dev, j, s in zip(self.dims, means, std_devs, jacobian, share)
+        ]
+
+    @property
+    def means(self) -> np.ndarray:
+        """Mean value of every contributor."""
+        return np.array([rdim.distribution.moments()[0] for rdim in self.dims], dtype=float)
+
+    def closure(self, values: np.ndarray) -> np.ndarray:
+        """
+        Closure of the loop for a block of trials.
+
+        Args:
+            values (np.ndarray): (contributors x trials) values, in the order of `dims`.
+
+        Returns:
+            np.ndarray: The closure of every trial.
+        """
+        values = np.asarray(values, dtype=float)
+        return np.concatenate(
+            [self._solve(values[:, start : start + CHUNK])[0] for start in range(0, values.shape[1], CHUNK)]
+        )
+
+    def jacobian(self, values: np.ndarray | None = None) -> np.ndarray:
+        """
+        Sensitivities of the closure to the contributors.
+
+        Args:
+            values (np.ndarray, optional): (contributors x trials) values. Defaults to the means.
+
+        Returns:
+            np.ndarray: (trials x contributors) sensitivities, or (contributors,) at the means.
+        """
+        if values is None:
+            return self.jacobian(self.means[:, None])[0]
+        values = np.asarray(values, dtype=float)
+        return np.concatenate(
+            [
+                self._solve(values[:, start : start + CHUNK], jacobian=True)[1]
+                for start in range(0, values.shape[1], CHUNK)
+            ]
+        )
+
+    def sample(self, n: int, seed: int | None = None) -> np.ndarray:
+        """
+        Simulate the loop.
+
+        Args:
+            n (int): Number of trials.
+            seed (int, optional): Seed of the random number generator. Defaults to None.
+
+        Returns:
+            np.ndarray: The closure of every trial.
+        """
+        rng = np.random.default_rng(seed)
+        return np.concatenate(
+            [self._solve(sample_block(self.dims, min(CHUNK, n - start), rng))[0] for start in range(0, n, CHUNK)]
+        )
+
+    def _solve(self, values: np.ndarray, jacobian: bool = False) -> tuple[np.ndarray, np.ndarray | None]:
+        k, n = self.space, values.shape[1]
+        # rotation of the current frame (row x column x trial) and position of its origin (axis x trial)
+        frame = np.zeros((k, k, n))
+        for i in range(k):
+            frame[i, i] = 1
+        origin = np.zeros((k, n))
+        # moving the end along a vector, or swinging it about an axis through a point, for every link
+        moves: list[tuple[int, np.ndarray, np.ndarray | None, float]] = []
+
+        for link, column in zip(self.links, self._columns):
+            if isinstance(link, Fixed):
+                origin = origin + np.einsum("rcn,c->rn", frame, link.matrix[:k, k])
+                frame = np.einsum("rcn,cd->rdn", frame, link.matrix[:k, :k])
+                continue
+            x = values[column]
+            if isinstance(link, Translation):
+                direction = np.einsum("rcn,c->rn", frame, link.axis[:k])
+                origin = origin + direction * x
+                if jacobian:
+                    moves.append((column, direction, None, 1.0))
+                continue
+            theta = link.scale * x
+            if jacobian:
+                axis = np.array([0.0, 0.0, 1.0]) if k == 2 else link.axis
+                moves.append((column, np.einsum("rcn,c->rn", frame, axis) if k == 3 else None, origin, link.scale))
+            frame = self._rotate(frame, link.axis, np.cos(theta), np.sin(theta))
+
+        closure = self.measure @ origin
+        if not jacobian:
+            return closure, None
+        result = np.zeros((n, len(self.dims)))
+        for column, direction, pivot, scale in moves:
+            if pivot is None:
+                result[:, column] += self.measure @ direction
+                continue
+            arm = origin - pivot
+            if k == 2:
+                swing = np.stack([-arm[1], arm[0]])
+            else:
+                swing = np.cross(direction, arm, axis=0)
+            result[:, column] += scale * (self.measure @ swing)
+        return closure, result
+
+    def _rotate(self, frame: np.ndarray, axis: np.ndarray, c: np.ndarray, s: np.ndarray) -> np.ndarray:
+        if self.space == 2:
+            i, j = 0, 1
+        else:
+            basis = np.flatnonzero(np.abs(axis) == 1)
+            if not len(basis):
+                # Rodrigues: R·(c·I + s·[w]x + (1 - c)·w·wᵀ)
+                cross = np.cross(axis, np.eye(3))
+                turned = np.einsum("rcn,dc->rdn", frame, cross)
+                along = np.einsum("rcn,c->rn", frame, axis)
+                return c * frame + s * turned + (1 - c) * along[:, None, :] * axis[None, :, None]
+            m = int(basis[0])
+            i, j = (m + 1) % 3, (m + 2) % 3
+            if axis[m] < 0:
+                s = -s
+        frame = frame.copy()
+        first, second = frame[:, i].copy(), frame[:, j]
+        frame[:, i] = c * first + s * second
+        frame[:, j] = c * second - s * first
+        return frame
+
+
+def _name(dim: Basic | Reviewed) -> str:
+    return (dim.dim if isinstance(dim, Reviewed) else dim).name
+
+
+def WC(self: Loop) -> Basic:
+    """
+    Linearized worst-case of a vector loop: the closure at the middle of the
+    tolerances, ± the sum of the tolerances weighted by the magnitude of the
+    sensitivities there.
+    """
+    lower = np.array([rdim.dim.abs_lower for rdim in self.dims])
+    upper = np.array([rdim.dim.abs_upper for rdim in self.dims])
+    middle = ((lower + upper) / 2)[:, None]
+    jacobian = self.jacobian(middle)[0]
+    return Basic(
+        nom=float(self.closure(middle)[0]),
+        tol=Bilateral.symmetric(float(np.abs(jacobian) @ ((upper - lower) / 2))),
+        name=f"{self.name} - WC Analysis",
+        desc="(linearized vector loop)",
+    )
+
+
+def RSS(self: Loop) -> Basic:
+    """
+    Linearized RSS of a vector loop: the closure at the middle of the
+    tolerances, ± the root sum square of the tolerances weighted by the
+    sensitivities there.
+    """
+    lower = np.array([rdim.dim.abs_lower for rdim in self.dims])
+    upper = np.array([rdim.dim.abs_upper for rdim in self.dims])
+    middle = ((lower + upper) / 2)[:, None]
+    jacobian = self.jacobian(middle)[0]
+    return Basic(
+        nom=float(self.closure(middle)[0]),
+        tol=Bilateral.symmetric(float(np.sqrt(((jacobian * (upper - lower) / 2) ** 2).sum()))),
+        name=f"{self.name} - RSS Analysis",
+        desc="(linearized vector loop, assuming inputs with Normal Dist. & uniform SD)",
+    )
+
+
+def SixSigma(self: Loop, at: float = 3) -> Reviewed:
+    """
+    Linearized "6 Sigma" analysis of a vector loop: the closure at the means of
+    the contributors, with the standard deviation of the first-order (delta
+    method) propagation of their distributions.
+    """
+    means = self.means
+    std_devs = np.array([np.sqrt(rdim.distribution.moments()[1]) for rdim in self.dims])
+    mean = float(self.closure(means[:, None])[0])
+    std_dev = float(np.sqrt(((self.jacobian(means[:, None])[0] * std_devs) ** 2).sum()))
+    return Reviewed(
+        Basic(
+            nom=mean,
+            tol=Bilateral.symmetric(std_dev * at),
+            name=f"{self.name} - '6 Sigma' Analysis",
+            desc="(linearized vector loop, assuming Normal Dist.)",
+        ),
+        distribution=dist.Normal(mean, std_dev),
+    ).assume_normal_dist(at)
+
+
+def MonteCarlo(self: Loop, n: int = 100000, seed: int | None = None, at: float = 3) -> Reviewed:
+    """
+    Monte Carlo simulation of a vector loop, solved exactly for every trial.
+
+    Args:
+        n (int, optional): Number of trials. Defaults to 100000.
+        seed (int, optional): Seed of the random number generator. Defaults to None.
+        at (float, optional): Number of standard deviations of the resulting tolerance. Defaults to 3.
+
+    Returns:
+        Reviewed: The simulated loop result.
+    """
+    fit = dist.Normal.fit(self.sample(n, seed))
+    return Reviewed(
+        Basic(
+            nom=fit.mean,
+            tol=Bilateral.symmetric(fit.std_dev * at),
+            name=f"{self.name} - Monte Carlo Analysis",
+            desc=f"(n={n})",
+        ),
+        distribution=fit,
+    )
@@ -0,0 +1,154 @@
+import unittest
+
+import numpy as np
+
+import dimstack as ds
+
+
+def cartridge():
+    bearing = ds.dim.Basic(nom=12, tol=ds.tol.Bilateral.symmetric(0.01), name="bearing").review().assume_normal_dist(3)
+    spacer = ds.dim.Basic(nom=-4, tol=ds.tol.Bilateral.symmetric(0.02), name="spacer").review().assume_normal_dist(3)
+    return ds.assembly.SubAssembly(name="cartridge", dims=[bearing, spacer])
+
+
+class Hierarchy(unittest.TestCase):
+    def test_matches_flat_stack(self):
+        sub = cartridge()
+        housing = ds.dim.Basic(nom=-7.9, tol=ds.tol.Bilateral.symmetric(0.03), name="housing").review()
+        housing.assume_normal_dist(3)
+        top = ds.assembly.SubAssembly(name="top", dims=[sub, housing])
+
+        nested = top.evaluate()
+        inner = ds.calc.SixSigma(ds.dim.ReviewedStack(dims=sub.dims))
+        flat = ds.calc.SixSigma(ds.dim.ReviewedStack(dims=[inner, housing]))
+
+        self.assertAlmostEqual(nested.distribution.mean, flat.distribution.mean)
+        self.assertAlmostEqual(nested.distribution.std_dev, flat.distribution.std_dev)
+
+    def test_result_is_memoized(self):
+        sub = cartridge()
+        top = ds.assembly.SubAssembly(name="top", dims=[sub, sub.dims[0]])
+
+        first = top.evaluate()
+        self.assertIs(top.evaluate(), first)
+        self.assertEqual(sub.evaluations, 1)
+        self.assertEqual(top.evaluations, 1)
+
+    def test_only_downstream_recomputed(self):
+        left = cartridge()
+        right = cartridge()
+        top = ds.assembly.SubAssembly(name="top", dims=[left, right], method=ds.calc.WC)
+        before = top.evaluate()
+
+        left.dims[1].dim.nominal = 4.1
+        after = top.evaluate()
+
+        self.assertEqual(left.evaluations, 2)
+        self.assertEqual(right.evaluations, 1)
+        self.assertEqual(top.evaluations, 2)
+        self.assertAlmostEqual(after.abs_nominal - before.abs_nominal, -0.1)
+
+    def test_shared_sample_block(self):
+        shared = cartridge()
+        a = ds.assembly.SubAssembly(name="a", dims=[shared])
+        b = ds.assembly.SubAssembly(name="b", dims=[shared])
+        top = ds.assembly.SubAssembly(name="top", dims=[a, b])
+
+        samples = top.sample(100000, seed=1)
+        expected = shared.sample(100000, seed=1)
+        # both parents see the same draws (perfect correlation), so the standard deviation doubles (the variance x4)
+        self.assertAlmostEqual(np.std(samples), 2 * np.std(expected), 6)
+
+    def test_deep_tree_reevaluation(self):
+        leaves = [ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.01), name=f"{i}").review() for i in range(4**5)]
+        level = [ds.assembly.SubAssembly(name=f"leaf {i}", dims=leaves[i * 4 : i * 4 + 4]) for i in range(4**4)]
+        subs = list(level)
+        while len(level) > 1:
+            level = [ds.assembly.SubAssembly(dims=level[i * 4 : i * 4 + 4]) for i in range(len(level) // 4)]
+            subs += level
+        top = level[0]
+        top.evaluate()
+
+        leaves[0].dim.nominal = 1.001
+        result = top.evaluate()
+
+        self.assertAlmostEqual(result.distribution.mean, 4**5 + 0.001)
+        # only the path from the leaf to the top is evaluated again
+        self.assertEqual(sum(sub.evaluations for sub in subs), len(subs) + 5)
+
+
+def normal(nom, tol, name):
+    return ds.dim.Basic(nom=nom, tol=ds.tol.Bilateral.symmetric(tol), name=name).review().assume_normal_dist(3)
+
+
+class Operators(unittest.TestCase):
+    def assertMatchesSimulation(self, operator, n=10**6, error=0.0):
+        mean, variance = operator.moments()
+        samples = operator.sample(n, seed=0)
+        self.assertAlmostEqual(mean, samples.mean(), delta=(5 / np.sqrt(n) + error) * samples.std())
+        self.assertAlmostEqual(np.sqrt(variance) / samples.std(), 1, delta=0.01 + error)
+
+    def test_max_min(self):
+        a, b = normal(10, 0.03, "a"), normal(10.01, 0.06, "b")
+        self.assertTrue(
+            np.all(
+                ds.assembly.Max(dims=[a, b]).sample(1000, seed=0)
+                >= a.sample(1000, random_state=np.random.default_rng(0))
+            )
+        )
+        # Clark's moments are exact for the max of two normals
+        self.assertMatchesSimulation(ds.assembly.Max(dims=[a, b]))
+        self.assertMatchesSimulation(ds.assembly.Min(dims=[a, b]))
+        # the max of the max is not normal, so more paths are approximate
+        self.assertMatchesSimulation(ds.assembly.Max(dims=[a, b, normal(10.02, 0.03, "c")]), error=0.01)
+
+    def test_shared_contributor(self):
+        a, b, base = normal(10, 0.03, "a"), normal(10.01, 0.06, "b"), normal(-5, 0.3, "base")
+        paths = [ds.assembly.SubAssembly(dims=[a, base]), ds.assembly.SubAssembly(dims=[b, base])]
+        shared = ds.assembly.Max(dims=paths)
+        # max(a + base, b + base) = max(a, b) + base
+        mean, variance = shared.moments()
+        inner_mean, inner_variance = ds.assembly.Max(dims=[a, b]).moments()
+        self.assertAlmostEqual(mean, inner_mean - 5)
+        self.assertAlmostEqual(variance, inner_variance + 0.1**2)
+        self.assertMatchesSimulation(shared)
+
+    def test_clearance(self):
+        bore, shaft = normal(10, 0.03, "bore"), normal(-9.995, 0.03, "shaft")
+        fit = ds.assembly.Clearance(dims=[bore, shaft])
+        samples = fit.sample(100000, seed=0)
+        self.assertTrue(np.all(samples >= 0))
+        # about a third of the fits interfere
+        self.assertAlmostEqual((samples == 0).mean(), 0.36, delta=0.01)
+        self.assertMatchesSimulation(fit)
+        self.assertMatchesSimulation(ds.assembly.Clearance(dims=[bore, shaft], takeup="random"))
+        self.assertMatchesSimulation(ds.assembly.Clearance(dims=[bore, shaft], takeup=0.5))
+        with self.assertRaises(ValueError):
+            ds.assembly.Clearance(dims=[bore, shaft], takeup="center")
+
+    def test_in_sub_assembly(self):
+        a, b, c = normal(10, 0.03, "a"), normal(10.01, 0.06, "b"), normal(-5, 0.03, "c")
+        top = ds.assembly.SubAssembly(name="top", dims=[ds.assembly.Max(dims=[a, b]), c])
+        result = top.evaluate()
+        mean, variance = top.dims[0].moments()
+        self.assertAlmostEqual(result.distribution.mean, mean - 5)
+        self.assertAlmostEqual(result.distribution.std_dev, np.sqrt(variance + 0.01**2))
+        samples = top.sample(10**5, seed=0)
+        self.assertAlmostEqual(samples.mean(), mean - 5, delta=0.001)
+        self.assertEqual(len(top.dict), 2)
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            ds.assembly.Operator("operator", "", [normal(10, 0.03, "a")])
+
+    def test_vectorized(self):
+        # see benchmarks/bench_assembly.py for a million trials
+        dims = [normal(10 + i * 0.001, 0.03, f"{i}") for i in range(20)]
+        samples = ds.assembly.Max(dims=dims).sample(10**4, seed=0)
+        self.assertEqual(samples.shape, (10**4,))
+        rng = np.random.default_rng(0)
+        self.assertTrue(np.all(samples >= dims[0].sample(10**4, random_state=rng)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+import dimstack as ds
+
+
+def stack(n=20):
+    return ds.dim.ReviewedStack(
+        name="stack",
+        dims=[ds.dim.Basic(nom=i + 1, tol=ds.tol.Bilateral.symmetric(0.1)).review() for i in range(n)],
+    )
+
+
+class Evaluate(unittest.IsolatedAsyncioTestCase):
+    async def test_matches_sync(self):
+        result = await ds.calc.aevaluate(stack(), ds.calc.RSS)
+        self.assertAlmostEqual(result.tolerance.upper, ds.calc.RSS(stack()).tolerance.upper)
+
+    async def test_identical_requests_are_coalesced(self):
+        reports = []
+        first = asyncio.create_task(
+            ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=100000, seed=1, progress=lambda *r: reports.append(r))
+        )
+        second = asyncio.create_task(ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=100000, seed=1))
+        other = asyncio.create_task(ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=100000, seed=2))
+        first, second, other = await asyncio.gather(first, second, other)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(reports[-1], (20, 20))
+        self.assertEqual(ds.calc._INFLIGHT, {})
+
+    async def test_cancel(self):
+        reports = []
+        task = asyncio.create_task(
+            ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=2000000, progress=lambda *r: reports.append(r))
+        )
+        while not reports:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.2)
+        self.assertLess(len(reports), 20)
+        self.assertEqual(ds.calc._INFLIGHT, {})
+
+    async def test_request_after_cancel(self):
+        task = asyncio.create_task(ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=2000000, seed=1))
+        await asyncio.sleep(0.01)
+        (evaluation,) = ds.calc._INFLIGHT.values()
+        evaluation.cancel()
+        # the cancelled computation is registered until its done callback runs, and is not joined
+        result = await ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=2000000, seed=1)
+        self.assertEqual(result.dim.name, "stack - Monte Carlo Analysis")
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(ds.calc._INFLIGHT, {})
+
+    async def test_completion_is_reported(self):
+        first, late, cheap = [], [], []
+        task = asyncio.create_task(
+            ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=200000, seed=1, progress=lambda *r: first.append(r))
+        )
+        while not first:
+            await asyncio.sleep(0.001)
+        await ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=200000, seed=1, progress=lambda *r: late.append(r))
+        await task
+        await ds.calc.aevaluate(stack(), ds.calc.RSS, progress=lambda *r: cheap.append(r))
+        self.assertEqual(first[-1], (20, 20))
+        self.assertEqual(late[-1], (20, 20))
+        self.assertEqual(cheap, [(1, 1)])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ds.cache.enable(Path(tmp) / "results.sqlite")
+            try:
+                for _ in range(2):
+                    hit = []
+                    await ds.calc.aevaluate(
+                        stack(), ds.calc.MonteCarlo, n=1000, seed=1, progress=lambda *r, hit=hit: hit.append(r)
+                    )
+                    self.assertEqual(hit[-1][0], hit[-1][1])
+                self.assertEqual(ds.cache.stats()["hits"], 1)
+            finally:
+                ds.cache.disable()
+
+    async def test_cheap_requests_do_not_wait(self):
+        # see benchmarks/bench_async.py for their latency
+        heavy = [
+            asyncio.create_task(ds.calc.aevaluate(stack(), ds.calc.MonteCarlo, n=1000000, seed=seed))
+            for seed in range(3)
+        ]
+        await ds.calc.aevaluate(stack(3), ds.calc.RSS)
+        self.assertFalse(all(task.done() for task in heavy))
+        await asyncio.gather(*heavy)
+
+
+if __name__ == "__main__":
+    unittest.main()
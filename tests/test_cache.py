@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import dimstack as ds
+
+
+def stack():
+    return ds.dim.ReviewedStack(
+        name="stack",
+        dims=[ds.dim.Basic(nom=i + 1, tol=ds.tol.Bilateral.symmetric(0.1)).review() for i in range(5)],
+    )
+
+
+class ResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ds.cache.enable(Path(self.tmp.name) / "results.sqlite")
+
+    def tearDown(self):
+        ds.cache.disable()
+        self.tmp.cleanup()
+
+    def test_hit(self):
+        first = ds.calc.MonteCarlo(stack(), n=1000, seed=1)
+        second = ds.calc.MonteCarlo(stack(), n=1000, seed=1)
+        self.assertEqual(first.distribution.mean, second.distribution.mean)
+        self.assertNotEqual(first.dim.id, second.dim.id)
+        self.assertEqual(ds.cache.stats()["hits"], 1)
+        self.assertEqual(ds.cache.stats()["misses"], 1)
+
+    def test_content_changes_miss(self):
+        changed = stack()
+        ds.calc.MonteCarlo(changed, n=1000, seed=1)
+        changed.dims[0].dim.tolerance = ds.tol.Bilateral.symmetric(0.2)
+        ds.calc.MonteCarlo(changed, n=1000, seed=1)
+        ds.calc.MonteCarlo(changed, n=1000, seed=2)
+        self.assertEqual(ds.cache.stats()["misses"], 3)
+        self.assertEqual(ds.cache.stats()["entries"], 3)
+
+    def test_not_cached(self):
+        ds.calc.MonteCarlo(stack(), n=1000)
+        ds.calc.Moments(stack(), func=lambda x: x.sum(axis=0))
+        self.assertEqual(ds.cache.stats()["entries"], 0)
+
+    def test_eviction(self):
+        ds.cache.disable()
+        self.cache = ds.cache.enable(Path(self.tmp.name) / "small.sqlite", max_bytes=20000)
+        for seed in range(3):
+            ds.calc.MonteCarlo(stack(), n=1000, seed=seed)
+            # seed 0 is used again before every new result
+            ds.calc.MonteCarlo(stack(), n=1000, seed=0)
+        stats = ds.cache.stats()
+        self.assertGreater(stats["evictions"], 0)
+        self.assertLessEqual(stats["bytes"], 20000)
+        # the least recently used results are evicted first
+        hits = stats["hits"]
+        ds.calc.MonteCarlo(stack(), n=1000, seed=2)
+        ds.calc.MonteCarlo(stack(), n=1000, seed=0)
+        self.assertEqual(ds.cache.stats()["hits"], hits + 2)
+        ds.calc.MonteCarlo(stack(), n=1000, seed=1)
+        self.assertEqual(ds.cache.stats()["hits"], hits + 2)
+
+    def test_persistent(self):
+        ds.calc.Moments(stack())
+        ds.cache.disable()
+        ds.cache.enable(self.cache.path)
+        ds.calc.Moments(stack())
+        self.assertEqual(ds.cache.stats()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -62,5 +62,17 @@ class Negative(unittest.TestCase):
         self.assertAlmostEqual(c.abs_lower, -1.0)
 
 
+class ZeroNominal(unittest.TestCase):
+    def test_zero_nominal_contributes(self):
+        # a zero-nominal dimension (dir 0) varies like any other in WC, RSS and MRSS
+        d1 = ds.dim.Basic(nom=10, tol=ds.tolerance.Bilateral.symmetric(0.3), name="a")
+        d2 = ds.dim.Basic(nom=0, tol=ds.tolerance.Bilateral.symmetric(0.4), name="b")
+        stack = ds.dim.Stack(name="zero", dims=[d1, d2])
+        self.assertAlmostEqual(ds.calc.WC(stack).tolerance.upper, 0.7)
+        self.assertAlmostEqual(ds.calc.RSS(stack).tolerance.upper, 0.5)
+        # C_f = 0.5 * (0.7 - 0.5) / (0.5 * (sqrt(2) - 1)) + 1
+        self.assertAlmostEqual(ds.calc.MRSS(stack).tolerance.upper, 0.5 * (0.2 / (2 * 0.5 * (2**0.5 - 1)) + 1))
+
+
 if __name__ == "__main__":
     unittest.main()
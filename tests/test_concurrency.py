@@ -0,0 +1,73 @@
+import concurrent.futures
+import threading
+import unittest
+
+import dimstack as ds
+from dimstack.display import DisplayMode
+
+THREADS = 16
+ROUNDS = 4
+
+
+def build(i):
+    return ds.dim.Stack(
+        name=f"stack {i}",
+        dims=[ds.dim.Basic(nom=(-1) ** j * (j + 1), tol=ds.tol.Bilateral.symmetric(0.01 * (i + 1))) for j in range(10)],
+    )
+
+
+def job(i):
+    with ds.dim.id_scope(), ds.display.context(DisplayMode.STRING):
+        stack = build(i)
+        result = ds.calc.RSS(stack)
+        ds.plot.StackPlot().add(stack).add(result)
+        return [dim.id for dim in stack.dims], stack.show(), result.tolerance.upper
+
+
+class Threads(unittest.TestCase):
+    def test_global_ids_are_unique(self):
+        ids = []
+        lock = threading.Lock()
+
+        def allocate():
+            local = [ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.1)).id for _ in range(1000)]
+            with lock:
+                ids.extend(local)
+
+        threads = [threading.Thread(target=allocate) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(ids)), THREADS * 1000)
+
+    def test_build_evaluate_render(self):
+        expected = {i: job(i) for i in range(THREADS)}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=THREADS) as pool:
+            futures = {pool.submit(job, i % THREADS): i % THREADS for i in range(THREADS * ROUNDS)}
+            for future in concurrent.futures.as_completed(futures):
+                ids, table, upper = future.result()
+                self.assertEqual(ids, list(range(10)))
+                self.assertEqual(table, expected[futures[future]][1])
+                self.assertAlmostEqual(upper, expected[futures[future]][2])
+
+    def test_display_mode_is_context_local(self):
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def render(dispmode):
+            with ds.display.context(dispmode):
+                barrier.wait()
+                results[dispmode] = ds.display.current_mode()
+
+        threads = [threading.Thread(target=render, args=(m,)) for m in (DisplayMode.STRING, DisplayMode.DF)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {DisplayMode.STRING: DisplayMode.STRING, DisplayMode.DF: DisplayMode.DF})
+        self.assertEqual(ds.display.current_mode(), ds.display.DISPLAY_MODE)
+
+
+if __name__ == "__main__":
+    unittest.main()
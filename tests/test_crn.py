@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+from scipy.stats import norm, truncnorm
+
+import dimstack as ds
+
+
+def gap(tol, name="gap"):
+    housing = ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(tol), name="housing")
+    shaft = ds.dim.Basic(nom=-9.8, tol=ds.tol.Bilateral.symmetric(0.05), name="shaft")
+    spacer = ds.dim.Basic(nom=-0.2, tol=ds.tol.Bilateral.symmetric(0.02), name="spacer")
+    dims = [ds.dim.Reviewed(dim).assume_normal_dist(3) for dim in (housing, shaft, spacer)]
+    return ds.dim.ReviewedStack(name=name, dims=dims)
+
+
+def reject_ppm(stack, LL, UL):
+    mean = sum(rdim.dim.a * rdim.distribution.mean for rdim in stack.dims)
+    std_dev = sum((rdim.dim.a * rdim.distribution.std_dev) ** 2 for rdim in stack.dims) ** 0.5
+    return (1 - norm.cdf(UL, mean, std_dev) + norm.cdf(LL, mean, std_dev)) * 1e6
+
+
+class InverseCDF(unittest.TestCase):
+    def test_ppf(self):
+        q = np.linspace(0.01, 0.99, 25)
+        for distribution in [
+            ds.dist.Uniform(-1, 2),
+            ds.dist.Normal(1, 0.2),
+            ds.dist.from_moments(0, 1, 0.8, 1.5),
+        ]:
+            np.testing.assert_allclose(distribution.cdf(distribution.ppf(q)), q, atol=1e-9)
+
+    def test_screened_ppf(self):
+        # the quantiles of the screened parts, as drawn by `sample`
+        distribution = ds.dist.NormalScreened(1, 0.2, 0.9, 1.3)
+        q = np.linspace(0, 1, 25)
+        expected = truncnorm.ppf(q, -0.5, 1.5, loc=1, scale=0.2)
+        np.testing.assert_allclose(distribution.ppf(q), expected, atol=1e-9)
+
+    def test_streams(self):
+        np.testing.assert_array_equal(ds.crn.uniforms(("shaft", 0), 100), ds.crn.uniforms(("shaft", 0), 100))
+        self.assertFalse(np.array_equal(ds.crn.uniforms(("shaft", 0), 100), ds.crn.uniforms(("shaft", 1), 100)))
+        self.assertFalse(np.array_equal(ds.crn.uniforms("shaft", 100, seed=1), ds.crn.uniforms("shaft", 100)))
+        u = ds.crn.uniforms("shaft", 100000)
+        self.assertTrue(((u > 0) & (u < 1)).all())
+        self.assertAlmostEqual(u.mean(), 0.5, delta=0.005)
+
+    def test_repeated_keys(self):
+        stack = gap(0.1)
+        stack.dims.append(stack.dims[1])
+        self.assertEqual(ds.crn.keys(stack)[1:], [("shaft", 0), ("spacer", 0), ("shaft", 1)])
+
+
+class Paired(unittest.TestCase):
+    def test_compare(self):
+        LL, UL = -0.1, 0.1
+        stacks = [gap(0.12, "baseline"), gap(0.1, "tighter")]
+        results = ds.crn.compare(stacks, LL, UL, n=50000, seed=3)
+        self.assertEqual(list(results["Stack"]), ["baseline", "tighter"])
+        self.assertEqual(results["Reject PPM Δ"].iloc[0], 0)
+        self.assertTrue(np.isnan(results["Variance Reduction"].iloc[0]))
+
+        expected = reject_ppm(stacks[1], LL, UL) - reject_ppm(stacks[0], LL, UL)
+        low, high = results["Reject PPM Δ CI"].iloc[1]
+        self.assertLess(low, expected)
+        self.assertGreater(high, expected)
+        # the shared shaft and spacer draws make the paired difference much less noisy
+        self.assertGreater(results["Variance Reduction"].iloc[1], 1.5)
+
+    def test_simulate(self):
+        stack = gap(0.1)
+        closure = ds.crn.simulate(stack, n=100000, seed=1)
+        mc = ds.calc.MonteCarlo(stack, n=100000, seed=1)
+        self.assertAlmostEqual(closure.mean(), mc.distribution.mean, delta=0.001)
+        self.assertAlmostEqual(closure.std(), mc.distribution.std_dev, delta=0.001)
+        np.testing.assert_array_equal(closure, ds.crn.simulate(gap(0.1), n=100000, seed=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
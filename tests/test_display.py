@@ -0,0 +1,76 @@
+import unittest
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+import dimstack as ds
+from dimstack.display import DisplayMode
+
+
+def stack(n=20):
+    return ds.dim.Stack(
+        name="stack",
+        dims=[
+            ds.dim.Basic(nom=(-1) ** i * (i * 0.1 + 1) if i % 3 else i, tol=ds.tol.Bilateral(0.01 * i, -0.02))
+            for i in range(n)
+        ],
+    )
+
+
+class Rounding(unittest.TestCase):
+    def test_array_matches_decimal(self):
+        values = np.concatenate([np.arange(-400, 400) / 8, np.random.default_rng(0).normal(0, 10, 1000)])
+        for ndigits in [0, 2, 5]:
+            expected = [float(Decimal(v).quantize(Decimal(1).scaleb(-ndigits), ROUND_HALF_UP)) for v in values.tolist()]
+            np.testing.assert_array_equal(ds.utils.nround(values, ndigits), expected)
+            self.assertEqual([ds.utils.nround(v, ndigits) for v in values.tolist()], expected)
+
+    def test_keeps_type(self):
+        self.assertIs(type(ds.utils.nround(np.float64(1.234567))), np.float64)
+        self.assertEqual(ds.utils.nround(3, 2), 3)
+        np.testing.assert_array_equal(ds.utils.nround(np.array([1, 2])), [1, 2])
+
+
+class Formatting(unittest.TestCase):
+    def test_format_number_is_nround(self):
+        values = [4.114, 4.115, 4.116, -0.03401, 0.125, -0.125, 2.675, 12, None]
+        expected = [str(ds.utils.nround(v, 2)) if v is not None else "" for v in values]
+        self.assertEqual(ds.display.format_number(values, 2), expected)
+        self.assertEqual(ds.display.format_number(np.array([1, 2])), ["1", "2"])
+
+    def test_columns_match_rows(self):
+        basic = stack()
+        self.assertEqual(
+            ds.display.display_df(basic.columns, dispmode=DisplayMode.STRING),
+            ds.display.display_df(basic.dict, dispmode=DisplayMode.STRING),
+        )
+        reviewed = ds.dim.ReviewedStack(dims=[dim.review() for dim in basic.dims])
+        reviewed.dims[0].distribution = ds.dist.Uniform(0, 1)
+        self.assertEqual(
+            ds.display.display_df(reviewed.columns, dispmode=DisplayMode.STRING),
+            ds.display.display_df(reviewed.dict, dispmode=DisplayMode.STRING),
+        )
+
+    def test_string_matches_pandas(self):
+        rows = stack().dict
+        expected = ds.display.display_df(rows, dispmode=DisplayMode.DF).to_string(index=False)
+        self.assertEqual(ds.display.display_df(rows, dispmode="string"), expected)
+
+    def test_missing_cells(self):
+        rows = [{"Name": "a", "Value": 1.5}, {"Name": "b"}, {"Value": np.nan}]
+        self.assertEqual(
+            ds.display.display_df(rows, dispmode=DisplayMode.STRING), "Name Value\n   a   1.5\n   b   NaN\n NaN   NaN"
+        )
+        columns = {"Value": np.array([1.0, np.nan])}
+        self.assertEqual(ds.display.display_df(columns, dispmode=DisplayMode.STRING), "Value\n  1.0\n  NaN")
+
+    def test_pagination(self):
+        styler = ds.display.display_df(stack(25).columns, "STACK", dispmode=DisplayMode.HTML, page=1, page_size=10)
+        self.assertEqual(len(styler.data), 10)
+        self.assertEqual(styler.caption, "STACK (rows 11-20 of 25)")
+        styler = ds.display.display_df(stack(25).columns, "STACK", dispmode=DisplayMode.HTML, page_size=None)
+        self.assertEqual(len(styler.data), 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
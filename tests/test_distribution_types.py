@@ -53,5 +53,41 @@ class NegativeDist(unittest.TestCase):
         self.assertAlmostEqual(float(rdim.yield_probability), 0.9973, 4)
 
 
+class RadialDist(unittest.TestCase):
+    def test_moments_and_cdf(self):
+        for radial in (dimstack.dist.Radial(1, 0.01, 0.02), dimstack.dist.Radial(-1, 0.01, 0.02, bonus=0.03)):
+            x = radial.sample(10**6, random_state=0)
+            mean, variance, _, kurtosis = radial.moments()
+            self.assertAlmostEqual(x.mean(), mean, delta=1e-4)
+            self.assertAlmostEqual(x.var() / variance, 1, delta=0.01)
+            self.assertAlmostEqual(((x - mean) ** 4).mean() / x.var() ** 2 - 3, kurtosis, delta=0.02)
+            q = np.array([0.01, 0.25, 0.5, 0.9])
+            np.testing.assert_allclose(radial.ppf(q), np.quantile(x, q), atol=1e-4)
+            self.assertAlmostEqual(radial.cdf(np.quantile(x, 0.25)), 0.25, delta=0.002)
+            # outside the largest zone
+            self.assertEqual(radial.pdf(radial.mean + 0.04), 0)
+
+    def test_no_truncation(self):
+        # a zone much wider than the error: the component of an isotropic normal error is normal
+        radial = dimstack.dist.Radial(0, 0.01, 1)
+        self.assertAlmostEqual(radial.moments()[1], 0.01**2)
+        self.assertAlmostEqual(radial.moments()[3], 0)
+        self.assertAlmostEqual(radial.cdf(0.01), 0.8413447, 5)
+
+
+class Screened(unittest.TestCase):
+    def test_sample(self):
+        # exactly n parts, all inside the screen, with the moments of the truncated normal
+        screened = dimstack.dist.NormalScreened(10, 0.1, 9.9, 10.25)
+        x = screened.sample(200000, random_state=np.random.default_rng(0))
+        self.assertEqual(x.shape, (200000,))
+        self.assertTrue(np.all((x >= 9.9) & (x <= 10.25)))
+        mean, variance, skewness, _ = screened.moments()
+        self.assertAlmostEqual(x.mean(), mean, delta=0.001)
+        self.assertAlmostEqual(x.var() / variance, 1, delta=0.01)
+        self.assertGreater(skewness, 0)
+        self.assertGreater(x.mean(), 10)
+
+
 if __name__ == "__main__":
     unittest.main()
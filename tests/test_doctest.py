@@ -2,16 +2,28 @@ import unittest
 import doctest
 
 import dimstack.dim
+import dimstack.interval
 import dimstack.stats
 import dimstack.tolerance
 import dimstack.utils
 
 
 def load_tests(loader, tests, ignore):
+    tests.addTests(doctest.DocTestSuite(dimstack.assembly))
+    tests.addTests(doctest.DocTestSuite(dimstack.calc))
+    tests.addTests(doctest.DocTestSuite(dimstack.crn))
     tests.addTests(doctest.DocTestSuite(dimstack.dim))
+    tests.addTests(doctest.DocTestSuite(dimstack.display))
+    tests.addTests(doctest.DocTestSuite(dimstack.drift))
+    tests.addTests(doctest.DocTestSuite(dimstack.interval))
+    tests.addTests(doctest.DocTestSuite(dimstack.optimize))
+    tests.addTests(doctest.DocTestSuite(dimstack.pareto))
+    tests.addTests(doctest.DocTestSuite(dimstack.scenario))
+    tests.addTests(doctest.DocTestSuite(dimstack.selective))
     tests.addTests(doctest.DocTestSuite(dimstack.stats))
     tests.addTests(doctest.DocTestSuite(dimstack.tolerance))
     tests.addTests(doctest.DocTestSuite(dimstack.utils))
+    tests.addTests(doctest.DocTestSuite(dimstack.vector))
 
     return tests
 
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+import dimstack as ds
+
+
+def gap():
+    housing = ds.dim.Reviewed(ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.1), name="housing"))
+    shaft = ds.dim.Reviewed(ds.dim.Basic(nom=-9.8, tol=ds.tol.Bilateral.symmetric(0.05), name="shaft"))
+    for rdim in (housing, shaft):
+        rdim.assume_normal_dist(3)
+    return ds.dim.ReviewedStack(name="gap", dims=[housing, shaft]), housing, shaft
+
+
+class Models(unittest.TestCase):
+    def test_linear(self):
+        rng = np.random.default_rng(0)
+        offsets = ds.drift.Linear(0.5).offsets(2, 3, 4, rng)
+        np.testing.assert_array_equal(offsets[0, 1], [0, 0.5, 1, 1.5])
+        offsets = ds.drift.Linear(1, reset=6).offsets(2, 3, 4, rng)
+        np.testing.assert_array_equal(offsets.ravel(), [0, 1, 2, 3, 4, 5, 0, 1, 2, 3, 4, 5])
+
+    def test_batch(self):
+        offsets = ds.drift.Batch(0.01).offsets(500, 20, 4, np.random.default_rng(0))
+        self.assertEqual(offsets.shape, (500, 20, 1))
+        self.assertAlmostEqual(offsets.std(), 0.01, delta=0.0005)
+
+
+class Sequence(unittest.TestCase):
+    def test_stationary(self):
+        stack, *_ = gap()
+        result = ds.drift.simulate(stack, {}, LL=0.05, UL=0.35, lots=5, lot_size=2000, trials=20, seed=0)
+        mc = ds.calc.MonteCarlo(stack, n=200000, seed=0)
+        self.assertAlmostEqual(result.distribution.mean, mc.distribution.mean, delta=0.001)
+        self.assertAlmostEqual(result.distribution.std_dev, mc.distribution.std_dev, delta=0.001)
+        np.testing.assert_allclose(result.lot_yield_probabilities, result.yield_probability, atol=0.01)
+
+    def test_wear(self):
+        stack, housing, _ = gap()
+        result = ds.drift.simulate(
+            stack,
+            {housing: ds.drift.Linear(-0.0001)},
+            LL=0.05,
+            UL=0.35,
+            lots=4,
+            lot_size=1000,
+            trials=50,
+            window=200,
+            seed=0,
+        )
+        # the closure drifts by -0.1 over a lot, then the tool is reset
+        lot = result.closures.mean(axis=0)[0]
+        self.assertAlmostEqual(lot[-100:].mean() - lot[:100].mean(), -0.09, delta=0.003)
+        start, worst = result.worst_window
+        # the last parts before a reset
+        self.assertGreaterEqual(start % 1000, 780)
+        self.assertLess(worst, result.yield_probability)
+        self.assertGreater(
+            result.distribution.std_dev, ds.calc.MonteCarlo(stack, n=100000, seed=0).distribution.std_dev
+        )
+
+    def test_batches(self):
+        stack, _, shaft = gap()
+        drifts = {shaft: [ds.drift.Batch(0.02), ds.drift.Linear(0.00001, reset=500)]}
+        result = ds.drift.simulate(stack, drifts, LL=0.05, UL=0.35, lots=6, lot_size=1000, trials=200, seed=1)
+        means = result.closures.mean(axis=2)
+        # lot to lot offsets, constant within a lot
+        self.assertAlmostEqual(means.std(), 0.02, delta=0.002)
+        self.assertEqual(result.window_yield_probabilities.shape, (6000 - 1000 + 1,))
+        self.assertEqual(len(result.dict), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
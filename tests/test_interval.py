@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+import dimstack as ds
+from dimstack.interval import Interval, worst_case
+
+
+class Arithmetic(unittest.TestCase):
+    def test_contains_samples(self):
+        rng = np.random.default_rng(0)
+        x = Interval([0.5, -1.0, 1.0], [1.5, 2.0, 4.0])
+
+        def func(x):
+            return x[0] * np.sin(x[1]) / x[2] + np.sqrt(x[2]) - np.abs(x[1]) ** 2 + np.maximum(x[0], x[1])
+
+        enclosure = func(x)
+        points = x.lower[:, None] + x.width[:, None] * rng.random((3, 100000))
+        values = func(points)
+        self.assertTrue(np.all(enclosure.contains(values)))
+
+    def test_trigonometric_extrema(self):
+        self.assertEqual(float(np.sin(Interval(0, 3)).upper), 1.0)
+        self.assertEqual(float(np.cos(Interval(3, 4)).lower), -1.0)
+        self.assertEqual(float(np.cos(Interval(-1, 1)).upper), 1.0)
+
+    def test_division_by_zero(self):
+        self.assertEqual(float((1 / Interval(-1, 1)).upper), np.inf)
+
+
+class WorstCase(unittest.TestCase):
+    def test_linear_matches_WC(self):
+        dims = [
+            ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.unequal(0.05, 0), name="a"),
+            ds.dim.Basic(nom=-2, tol=ds.tol.Bilateral.symmetric(0.1), name="b"),
+            ds.dim.Basic(nom=0.5, tol=ds.tol.Bilateral.symmetric(0.02), name="c"),
+        ]
+        stack = ds.dim.Stack(name="linear", dims=dims)
+        linear = ds.calc.WC(stack)
+        nonlinear = ds.calc.WC(stack, func=lambda x: x[0] + x[1] + x[2])
+
+        self.assertAlmostEqual(nonlinear.abs_lower, linear.abs_lower)
+        self.assertAlmostEqual(nonlinear.abs_upper, linear.abs_upper)
+
+    def test_extreme_combination(self):
+        result = worst_case(lambda x: x[0] * x[1] - x[2], [1, -1, 0], [2, 3, 1])
+
+        self.assertAlmostEqual(result.lower, -3)
+        self.assertAlmostEqual(result.upper, 6)
+        np.testing.assert_allclose(result.argmin, [2, -1, 1])
+        np.testing.assert_allclose(result.argmax, [2, 3, 0])
+        self.assertTrue(result.tight)
+
+    def test_interior_extreme(self):
+        result = worst_case(lambda x: np.sin(x[0]) * x[1], [1, 1], [2, 2])
+
+        self.assertAlmostEqual(result.upper, 2)
+        self.assertAlmostEqual(result.argmax[0], np.pi / 2, 4)
+        self.assertTrue(result.tight)
+
+    def test_many_contributors(self):
+        n = 60
+        w = np.random.default_rng(0).normal(size=n)
+
+        def func(x):
+            return sum(w[i] * x[i] for i in range(n)) + x[0] * x[1] - x[5] ** 2
+
+        # see benchmarks/bench_interval.py for the time taken
+        result = worst_case(func, np.ones(n), np.ones(n) * 1.1)
+
+        corners = np.where(np.random.default_rng(1).random((n, 20000)) < 0.5, 1.0, 1.1)
+        values = func(corners)
+        self.assertLessEqual(result.lower, values.min())
+        self.assertGreaterEqual(result.upper, values.max())
+        self.assertLessEqual(float(result.bound.lower), result.lower)
+        self.assertGreaterEqual(float(result.bound.upper), result.upper)
+
+
+if __name__ == "__main__":
+    unittest.main()
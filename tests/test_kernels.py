@@ -0,0 +1,75 @@
+import math
+import unittest
+
+import numpy as np
+
+import dimstack as ds
+from dimstack import _npkernels
+
+BACKENDS = [_npkernels] + ([ds.kernels] if ds.kernels.BACKEND != "numpy" else [])
+
+
+def columns(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.choice([-1.0, 0.0, 1.0], n),
+        rng.normal(0, 10, n),
+        rng.uniform(0, 0.2, n),
+        rng.choice([1.0, -1.0, 0.5, 1.7], n),
+    )
+
+
+def python_reduce(dir, median, half, a):
+    nominal = sum([d * m * s for d, m, s in zip(dir, median, a)])
+    t_wc = sum([abs(h * s) for h, s in zip(half, a)])
+    squares = 0
+    for h, s in zip(half, a):
+        squares += (h * s) * (h * s)
+    return nominal, t_wc, math.sqrt(squares)
+
+
+class Parity(unittest.TestCase):
+    def test_reduce(self):
+        for n in [0, 1, 7, 1000]:
+            expected = python_reduce(*(c.tolist() for c in columns(n)))
+            for backend in BACKENDS:
+                self.assertEqual(backend.reduce(*columns(n)), expected)
+
+    def test_rss(self):
+        x = np.random.default_rng(1).normal(size=1000)
+        expected = math.sqrt(sum([v * v for v in x.tolist()]))
+        for backend in BACKENDS:
+            self.assertEqual(backend.rss(x), expected)
+
+    def test_segment_reduce(self):
+        offsets = np.array([0, 3, 3, 10, 40])
+        cols = columns(40)
+        expected = np.array([python_reduce(*(c[i:j].tolist() for c in cols)) for i, j in zip(offsets, offsets[1:])]).T
+        for backend in BACKENDS:
+            np.testing.assert_allclose(np.array(backend.segment_reduce(*cols, offsets)), expected, rtol=1e-13)
+
+    def test_accumulate(self):
+        x = np.random.default_rng(2).normal(size=100)
+        for backend in BACKENDS:
+            out = np.ones(100)
+            backend.accumulate(out, 1.5, x)
+            np.testing.assert_array_equal(out, 1 + 1.5 * x)
+
+    def test_batch(self):
+        stacks = [
+            ds.dim.Stack(
+                dims=[ds.dim.Basic(nom=(-1) ** i * (i + 1), tol=ds.tol.Bilateral(0.1, -0.01 * j)) for i in range(j + 2)]
+            )
+            for j in range(10)
+        ]
+        stacks.append(ds.dim.ReviewedStack(dims=[dim.review() for dim in stacks[-1].dims]))
+        result = ds.calc.batch(stacks)
+        for i, stack in enumerate(stacks):
+            self.assertAlmostEqual(result["nominal"][i], ds.calc.WC(stack).nominal * ds.calc.WC(stack).dir)
+            self.assertAlmostEqual(result["WC"][i], ds.calc.WC(stack).tolerance.upper)
+            self.assertAlmostEqual(result["RSS"][i], ds.calc.RSS(stack).tolerance.upper)
+            self.assertAlmostEqual(result["MRSS"][i], ds.calc.MRSS(stack).tolerance.upper)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -117,6 +117,15 @@ class MITCalc(unittest.TestCase):
         # self.assertEqual(dimstack.utils.nround(spec.C_pk), 1.98617) # temporarily removed 20230623
         self.assertEqual(dimstack.utils.nround(spec.R, 1), 0.0)
 
+    def test_MonteCarlo(self):
+        eval = dimstack.calc.MonteCarlo(stack, n=200000, seed=0, at=4.5)
+        mean = sum(rdim.distribution.mean for rdim in stack.dims)
+        std_dev = dimstack.stats.rss([rdim.distribution.std_dev for rdim in stack.dims])
+
+        self.assertAlmostEqual(eval.distribution.mean, mean, 3)
+        self.assertAlmostEqual(eval.distribution.std_dev, std_dev, 3)
+        self.assertEqual(len(eval.distribution.data), 200000)
+
 
 if __name__ == "__main__":
     unittest.main()
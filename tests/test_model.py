@@ -0,0 +1,140 @@
+import unittest
+
+import numpy as np
+from scipy.stats import norm
+
+import dimstack as ds
+
+
+def reviewed(nom, tol, name):
+    return ds.dim.Basic(nom=nom, tol=ds.tol.Bilateral.symmetric(tol), name=name).review().assume_normal_dist(3)
+
+
+class SharedDimensions(unittest.TestCase):
+    def setUp(self):
+        self.shaft = reviewed(10, 0.03, "shaft")
+        self.bore = reviewed(-10.05, 0.03, "bore")
+        self.cover = reviewed(-2, 0.02, "cover")
+        self.fit = ds.dim.ReviewedStack(name="fit", dims=[self.shaft, self.bore])
+        self.length = ds.dim.ReviewedStack(name="length", dims=[self.shaft, self.cover])
+
+        self.model = ds.model.Model()
+        self.model.add(self.fit, LL=-0.09, UL=-0.01)
+        self.model.add(self.length, LL=7.97, UL=8.03)
+
+    def test_pool(self):
+        self.assertEqual(len(self.model.dims), 3)
+        self.assertEqual(self.model.sensitivities.shape, (2, 3))
+        self.assertEqual(self.model.sensitivities.nnz, 4)
+        self.assertEqual(self.model.column(self.shaft), 0)
+
+    def test_per_requirement_yield(self):
+        result = self.model.yield_probability(n=200000, seed=0)
+        for i, stack in enumerate([self.fit, self.length]):
+            analytic = ds.calc.SixSigma(stack)
+            spec = ds.dim.Requirement("", "", analytic.distribution, self.model.LL[i], self.model.UL[i])
+            self.assertAlmostEqual(result.yield_probabilities[i], spec.yield_probability, 2)
+
+    def test_joint_yield(self):
+        closures = self.model.closures(100000, seed=1)
+        ok = (closures >= np.array(self.model.LL)[:, None]) & (closures <= np.array(self.model.UL)[:, None])
+        result = self.model.yield_probability(n=100000, seed=1, chunk=100000)
+
+        self.assertAlmostEqual(result.joint_yield_probability, ok.all(axis=0).mean())
+        self.assertLessEqual(result.joint_yield_probability, result.yield_probabilities.min())
+
+    def test_identical_requirements_are_not_independent(self):
+        model = ds.model.Model()
+        model.add(ds.dim.ReviewedStack(dims=[self.shaft]), LL=9.99, UL=10.01)
+        model.add(ds.dim.ReviewedStack(dims=[self.shaft]), LL=9.99, UL=10.01)
+        result = model.yield_probability(n=100000, seed=2)
+
+        expected = norm.cdf(1) - norm.cdf(-1)
+        self.assertAlmostEqual(result.joint_yield_probability, result.yield_probabilities[0])
+        self.assertAlmostEqual(result.joint_yield_probability, expected, 2)
+        self.assertLess(result.independent_yield_probability, result.joint_yield_probability)
+
+
+class SparseEngine(unittest.TestCase):
+    stack = ds.dim.Stack(
+        name="sensitivities",
+        dims=[
+            ds.dim.Basic(nom=0.875, tol=ds.tol.Bilateral.symmetric(0.010), a=-0.5146, name="A"),
+            ds.dim.Basic(nom=1.625, tol=ds.tol.Bilateral.unequal(0.02, -0.01), a=0.1567, name="B"),
+            ds.dim.Basic(nom=-1.700, tol=ds.tol.Bilateral.symmetric(0.012), a=0.4180, name="C"),
+            ds.dim.Basic(nom=0.875, tol=ds.tol.Bilateral.symmetric(0.010), a=-1.000, name="D"),
+            ds.dim.Basic(nom=-2.625, tol=ds.tol.Bilateral.unequal(0, -0.02), a=-0.0540, name="E"),
+            ds.dim.Basic(nom=7.875, tol=ds.tol.Bilateral.symmetric(0.030), a=0.4372, name="F"),
+            ds.dim.Basic(nom=4.125, tol=ds.tol.Bilateral.symmetric(0.010), a=1.000, name="G"),
+        ],
+    )
+
+    def setUp(self):
+        self.model = ds.model.Model()
+        self.model.add(self.stack, LL=-0.1, UL=0.2)
+        self.model.add(ds.dim.Stack(name="partial", dims=self.stack.dims[2:6]), LL=0, UL=10)
+
+    def test_closed_form_parity(self):
+        for method in ["WC", "RSS", "MRSS"]:
+            results = getattr(self.model, method)()
+            for result, stack in zip(results, self.model.stacks):
+                expected = getattr(ds.calc, method)(stack)
+                self.assertAlmostEqual(result.abs_nominal, expected.abs_nominal)
+                self.assertAlmostEqual(result.tolerance.T, expected.tolerance.T)
+
+    def test_SixSigma_parity(self):
+        stack = ds.dim.ReviewedStack(name="unit sensitivity", dims=[reviewed(1, 0.1, "a"), reviewed(-0.5, 0.05, "b")])
+        model = ds.model.Model()
+        model.add(stack, LL=0.3, UL=0.7)
+
+        result = model.SixSigma(at=4.5)[0]
+        expected = ds.calc.SixSigma(stack, at=4.5)
+        self.assertAlmostEqual(result.distribution.mean, expected.distribution.mean)
+        self.assertAlmostEqual(result.distribution.std_dev, expected.distribution.std_dev)
+
+    def test_MonteCarlo(self):
+        results = self.model.MonteCarlo(n=100000, seed=3)
+        for result, sixsigma in zip(results, self.model.SixSigma()):
+            self.assertAlmostEqual(result.distribution.mean, sixsigma.distribution.mean, 3)
+            self.assertAlmostEqual(result.distribution.std_dev, sixsigma.distribution.std_dev, 3)
+
+    def test_zero_nominal(self):
+        # a zero nominal (e.g. a GD&T contributor) has no direction but still varies
+        stack = ds.dim.ReviewedStack(name="zero", dims=[reviewed(10, 0.1, "a"), reviewed(0, 0.1, "b")])
+        model = ds.model.Model()
+        model.add(stack, LL=9.9, UL=10.1)
+        self.assertAlmostEqual(model.WC()[0].tolerance.T, ds.calc.WC(stack).tolerance.T)
+        self.assertAlmostEqual(model.RSS()[0].tolerance.T, ds.calc.RSS(stack).tolerance.T)
+        six_sigma = model.SixSigma()[0]
+        self.assertAlmostEqual(six_sigma.distribution.std_dev, ds.calc.SixSigma(stack).distribution.std_dev)
+        monte_carlo = model.MonteCarlo(n=100000, seed=0)[0]
+        self.assertAlmostEqual(monte_carlo.distribution.std_dev / six_sigma.distribution.std_dev, 1, delta=0.01)
+        self.assertAlmostEqual(monte_carlo.distribution.mean, 10, delta=0.001)
+        expected = norm.cdf(0.1 / six_sigma.distribution.std_dev) * 2 - 1
+        self.assertAlmostEqual(model.yield_probability(n=100000, seed=0).joint_yield_probability, expected, 2)
+
+    def test_MonteCarlo_large_nominal(self):
+        # a micrometre of variation on a kilometre closure
+        stack = ds.dim.ReviewedStack(name="long", dims=[reviewed(10**6, 3e-6, "a"), reviewed(-0.5, 3e-6, "b")])
+        model = ds.model.Model()
+        model.add(stack, LL=0, UL=2 * 10**6)
+        result = model.MonteCarlo(n=100000, seed=0, chunk=7000)[0]
+        closures = model.closures(100000, 0)[0]
+        self.assertAlmostEqual(result.distribution.std_dev / closures.std(), 1, delta=0.02)
+        self.assertAlmostEqual(result.distribution.std_dev / np.sqrt(2e-12), 1, delta=0.02)
+
+    def test_large_model(self):
+        rng = np.random.default_rng(0)
+        pool = [reviewed(1 + i % 7, 0.01, f"{i}") for i in range(5000)]
+        model = ds.model.Model()
+        for i in range(500):
+            dims = [pool[j] for j in rng.choice(len(pool), 30, replace=False)]
+            model.add(ds.dim.ReviewedStack(name=f"{i}", dims=dims), LL=0, UL=1000)
+
+        # see benchmarks/bench_model.py for the time taken
+        for results in (model.WC(), model.RSS(), model.SixSigma(), model.MonteCarlo(n=1000, seed=0)):
+            self.assertEqual(len(results), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+from scipy.stats import kurtosis, skew
+
+import dimstack as ds
+
+
+def uniform(nom, tol, name):
+    return ds.dim.Basic(nom=nom, tol=ds.tol.Bilateral.symmetric(tol), name=name).review(
+        ds.dist.Uniform(nom - tol, nom + tol)
+    )
+
+
+class DistributionMoments(unittest.TestCase):
+    def test_analytic_moments(self):
+        rng = np.random.default_rng(0)
+        for distribution in [
+            ds.dist.Uniform(1, 3),
+            ds.dist.Normal(2, 0.5),
+            ds.dist.NormalScreened(2, 0.5, 1.5, 3),
+            ds.dist.Johnson("SU", 0.5, 3, 0, 1),
+            ds.dist.Johnson("SB", 0.5, 1.5, 0, 1),
+        ]:
+            x = distribution.sample(1000000, random_state=rng)
+            expected = (x.mean(), x.var(), skew(x), kurtosis(x))
+            for value, sampled in zip(distribution.moments(), expected):
+                self.assertAlmostEqual(value, sampled, 1)
+
+    def test_from_moments(self):
+        self.assertIsInstance(ds.dist.from_moments(1, 0.04), ds.dist.Normal)
+        for skewness, kurt, family in [(0, -0.6, "SB"), (0.5, 0.2, "SB"), (1.3, 3.4, "SU"), (-0.4, 1.5, "SU")]:
+            fitted = ds.dist.from_moments(1, 0.04, skewness, kurt)
+            self.assertEqual(fitted.family, family)
+            for value, expected in zip(fitted.moments(), (1, 0.04, skewness, kurt)):
+                self.assertAlmostEqual(value, expected, 6)
+
+
+class MomentsMethod(unittest.TestCase):
+    stack = ds.dim.ReviewedStack(
+        name="uniform", dims=[uniform(1, 0.1, "a"), uniform(2, 0.1, "b"), uniform(-0.5, 0.05, "c")]
+    )
+
+    def test_linear_uniform_stack(self):
+        result = ds.calc.Moments(self.stack)
+        simulated = ds.calc.MonteCarlo(self.stack, n=1000000, seed=0).distribution.data
+        lower, upper = np.quantile(simulated, [0.00135, 0.99865])
+
+        self.assertAlmostEqual(result.dim.abs_nominal, 2.5)
+        self.assertAlmostEqual(result.dim.abs_lower, lower, 2)
+        self.assertAlmostEqual(result.dim.abs_upper, upper, 2)
+        # a normal approximation would overstate the spread
+        self.assertLess(result.dim.tolerance.T, 6 * simulated.std())
+
+    def test_negative_stack(self):
+        stack = ds.dim.ReviewedStack(name="negative", dims=[uniform(-1, 0.1, "a"), uniform(-2, 0.1, "b")])
+        result = ds.calc.Moments(stack)
+        self.assertAlmostEqual(result.dim.abs_nominal, -3)
+        self.assertAlmostEqual(result.dim.abs_lower + result.dim.abs_upper, -6)
+
+    def test_matches_linear_func(self):
+        linear = ds.calc.Moments(self.stack)
+        explicit = ds.calc.Moments(self.stack, func=lambda x: x[0] + x[1] + x[2])
+        self.assertAlmostEqual(linear.dim.abs_lower, explicit.dim.abs_lower, 6)
+        self.assertAlmostEqual(linear.dim.abs_upper, explicit.dim.abs_upper, 6)
+
+    def test_second_order(self):
+        def func(x):
+            return x[0] * x[1] - x[2]
+
+        result = ds.calc.Moments(self.stack, func=func)
+        rng = np.random.default_rng(1)
+        y = func(np.array([rdim.sample(1000000, random_state=rng) for rdim in self.stack.dims]))
+        mean, variance, skewness, _ = result.distribution.moments()
+
+        self.assertAlmostEqual(mean, y.mean(), 3)
+        self.assertAlmostEqual(variance, y.var(), 4)
+        self.assertAlmostEqual(skewness, skew(y), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
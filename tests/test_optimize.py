@@ -0,0 +1,138 @@
+import unittest
+
+import numpy as np
+from scipy.optimize import approx_fprime
+from scipy.stats import norm
+
+import dimstack as ds
+
+
+def shifted(nom, tol, shift, name):
+    dim = ds.dim.Basic(nom=nom, tol=ds.tol.Bilateral.symmetric(tol), name=name)
+    return ds.dim.Reviewed(dim).assume_normal_dist_shifted(3, shift)
+
+
+def large_model(contributors=100, requirements=10, seed=0):
+    rng = np.random.default_rng(seed)
+    dims = [
+        shifted(rng.choice([-1, 1]) * rng.uniform(1, 10), rng.uniform(0.01, 0.05), rng.uniform(-0.5, 0.5), f"d{i}")
+        for i in range(contributors)
+    ]
+    model = ds.model.Model()
+    for r in range(requirements):
+        stack = [dims[i] for i in rng.choice(contributors, 20, replace=False)]
+        nominal = sum(rdim.dim.dir * rdim.dim.nominal for rdim in stack)
+        model.add(ds.dim.ReviewedStack(name=f"r{r}", dims=stack), nominal - 0.08, nominal + 0.08)
+    return model, dims
+
+
+class Normal(unittest.TestCase):
+    def test_single_stack(self):
+        housing = shifted(10, 0.1, 0.2, "housing")
+        shaft = shifted(-9.8, 0.05, -0.3, "shaft")
+        model = ds.model.Model()
+        model.add(ds.dim.ReviewedStack(name="gap", dims=[housing, shaft]), 0.1, 0.3)
+        result = ds.optimize.center(model, {housing.dim: (9.9, 10.1)})
+        # the closure is centered: housing mean - shaft mean = 0.2
+        mean = result.nominals[0] + 0.2 * 0.1 + (-9.8 - 0.3 * 0.05)
+        self.assertAlmostEqual(mean, 0.2, places=5)
+        self.assertGreater(result.joint_yield_probability, result.joint_yield_probability_before)
+
+    def test_bounds(self):
+        housing = shifted(10, 0.1, 0.2, "housing")
+        shaft = shifted(-9.8, 0.05, 0, "shaft")
+        model = ds.model.Model()
+        model.add(ds.dim.ReviewedStack(name="gap", dims=[housing, shaft]), 0.1, 0.3)
+        result = ds.optimize.center(model, {housing: (9.99, 10.1)})
+        self.assertAlmostEqual(result.nominals[0], 9.99)
+        with self.assertRaises(ValueError):
+            ds.optimize.center(model, {shaft: (-1, 1)})
+
+    def test_zero_nominal(self):
+        housing = shifted(10, 0.1, 0, "housing")
+        offset = shifted(0, 0.02, 0, "offset")
+        model = ds.model.Model()
+        model.add(ds.dim.ReviewedStack(name="gap", dims=[housing, offset]), 10.05, 10.15)
+        result = ds.optimize.center(model, {offset: (0, 0.2)})
+        self.assertAlmostEqual(result.nominals[0], 0.1, places=4)
+        self.assertGreater(result.joint_yield_probability, result.joint_yield_probability_before)
+
+        result.apply()
+        self.assertEqual(offset.dim.dir, 1)
+        self.assertAlmostEqual(offset.dim.abs_nominal, result.nominals[0])
+        self.assertAlmostEqual(offset.distribution.mean, result.nominals[0])
+        yields = model.yield_probability(n=20000, seed=1)
+        self.assertAlmostEqual(yields.joint_yield_probability, result.joint_yield_probability, delta=0.02)
+
+    def test_gradient(self):
+        model, _ = large_model()
+        moments = np.array([rdim.distribution.moments()[:2] for rdim in model.dims])
+        objective = ds.optimize._NormalObjective(
+            model.sensitivities @ moments[:, 0],
+            np.sqrt(model.sensitivities.multiply(model.sensitivities) @ moments[:, 1]),
+            model.sensitivities.toarray(),
+            np.array(model.LL),
+            np.array(model.UL),
+        )
+        shift = np.random.default_rng(1).normal(0, 0.01, len(model.dims))
+        for fun in [objective.log_yield, objective.reject]:
+            numeric = approx_fprime(shift, lambda x, fun=fun: fun(x)[0], 1e-7)
+            np.testing.assert_allclose(fun(shift)[1], numeric, rtol=1e-3, atol=1e-3 * np.abs(numeric).max())
+
+    def test_hundred_contributors(self):
+        model, _ = large_model()
+        adjustable = {
+            rdim: sorted([rdim.dim.dir * rdim.dim.nominal * 0.99, rdim.dim.dir * rdim.dim.nominal * 1.01])
+            for rdim in model.dims
+        }
+        self.assertGreater(len(adjustable), 80)
+        # see benchmarks/bench_optimize.py for the time taken
+        result = ds.optimize.center(model, adjustable)
+        # every requirement is centered, the best that shifting nominals can do
+        variances = np.array([rdim.distribution.moments()[1] for rdim in model.dims])
+        std_devs = np.sqrt(model.sensitivities.multiply(model.sensitivities) @ variances)
+        np.testing.assert_allclose(result.yield_probabilities, 2 * norm.cdf(0.08 / std_devs) - 1, rtol=1e-6)
+        self.assertGreater(result.joint_yield_probability, result.joint_yield_probability_before)
+        ppm = ds.optimize.center(model, adjustable, objective="ppm")
+        self.assertLessEqual((1 - ppm.yield_probabilities).sum(), (1 - result.yield_probabilities).sum() + 1e-9)
+
+
+class Simulation(unittest.TestCase):
+    def test_uniform(self):
+        housing = ds.dim.Reviewed(ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.1), name="housing"))
+        housing.distribution = ds.dist.Uniform(10.0, 10.1)
+        shaft = shifted(-9.8, 0.05, 0, "shaft")
+        model = ds.model.Model()
+        model.add(ds.dim.ReviewedStack(name="gap", dims=[housing, shaft]), 0.12, 0.28)
+        result = ds.optimize.center(model, {housing: (9.9, 10.1)})
+        self.assertEqual(result.method, "simulation")
+        # the uniform housing is centered at 10 - 0.05
+        self.assertAlmostEqual(result.nominals[0], 9.95, delta=0.005)
+        self.assertGreater(result.joint_yield_probability, result.joint_yield_probability_before)
+
+        result.apply()
+        self.assertAlmostEqual(housing.dim.nominal, result.nominals[0])
+        self.assertAlmostEqual(housing.distribution.lower, result.nominals[0])
+        yields = model.yield_probability(n=20000, seed=1)
+        self.assertAlmostEqual(yields.joint_yield_probability, result.joint_yield_probability, delta=0.02)
+
+    def test_gdt(self):
+        face = ds.dim.Basic(nom=10, tol=ds.tol.Flatness(0.04), name="face").review()
+        hole = ds.dim.Basic(nom=-9.9, tol=ds.tol.Position(0.1, "MMC", 0.02), name="hole").review()
+        model = ds.model.Model()
+        model.add(ds.dim.ReviewedStack(name="gap", dims=[face, hole]), 0.15, 0.25)
+        result = ds.optimize.center(model, {face: (9.9, 10.1), hole: (-10, -9.8)})
+        self.assertGreater(result.joint_yield_probability, result.joint_yield_probability_before)
+
+        edge, mean = face.distribution.edge, hole.distribution.mean
+        result.apply()
+        self.assertIsInstance(face.distribution, ds.dist.HalfNormal)
+        self.assertIsInstance(hole.distribution, ds.dist.Radial)
+        self.assertAlmostEqual(face.distribution.edge - edge, result.nominals[0] - result.start[0])
+        self.assertAlmostEqual(hole.distribution.mean - mean, result.nominals[1] - result.start[1])
+        yields = model.yield_probability(n=20000, seed=1)
+        self.assertAlmostEqual(yields.joint_yield_probability, result.joint_yield_probability, delta=0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
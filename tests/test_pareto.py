@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+from scipy.stats import norm
+
+import dimstack as ds
+
+
+def stack(contributors=4, seed=0):
+    rng = np.random.default_rng(seed)
+    dims = []
+    for i in range(contributors):
+        dim = ds.dim.Basic(
+            nom=rng.choice([-1, 1]) * rng.uniform(1, 10), tol=ds.tol.Bilateral.symmetric(0.05), name=f"d{i}"
+        )
+        dims.append(ds.dim.Reviewed(dim).assume_normal_dist(3))
+    return ds.dim.ReviewedStack(name="gap", dims=dims)
+
+
+def explorer(rstack, limit=0.1):
+    nominal = sum(rdim.dim.dir * rdim.dim.nominal for rdim in rstack.dims)
+    costs = {rdim: ds.pareto.reciprocal(1, 0.01 * (i % 3 + 1)) for i, rdim in enumerate(rstack.dims)}
+    bounds = {rdim: (0.005, 0.1) for rdim in rstack.dims}
+    return ds.pareto.Explorer(rstack, nominal - limit, nominal + limit, costs, bounds)
+
+
+def dominated(cost, ppm, by_cost, by_ppm):
+    return ((by_cost <= cost) & (by_ppm <= ppm) & ((by_cost < cost) | (by_ppm < ppm))).any()
+
+
+class Front(unittest.TestCase):
+    def test_non_dominated(self):
+        rng = np.random.default_rng(0)
+        cost, ppm = rng.random(500), rng.random(500)
+        front = set(ds.pareto.non_dominated(cost, ppm).tolist())
+        for i in range(500):
+            self.assertEqual(i in front, not dominated(cost[i], ppm[i], cost, ppm))
+
+    def test_evaluate(self):
+        rstack = stack()
+        exp = explorer(rstack)
+        tolerances = np.array([[0.05, 0.05, 0.05, 0.05], [0.1, 0.05, 0.025, 0.05]])
+        cost, ppm = exp.evaluate(tolerances)
+        self.assertAlmostEqual(cost[0], 4 + 0.01 * (1 + 2 + 3 + 1) / 0.05)
+        # the processes keep their capability: σ = t / 3
+        for t, result in zip(tolerances, ppm):
+            std_dev = np.sqrt(((t / 3) ** 2).sum())
+            self.assertAlmostEqual(result, 2 * norm.sf(0.1 / std_dev) * 1e6, places=6)
+
+    def test_grid(self):
+        exp = explorer(stack())
+        front = exp.grid(levels=8, workers=2)
+        self.assertEqual(front.evaluated, 8**4)
+        values = np.array([np.geomspace(0.005, 0.1, 8)] * 4)
+        index = np.indices((8,) * 4).reshape(4, -1)
+        cost, ppm = exp.evaluate(np.stack([values[j, i] for j, i in enumerate(index)], axis=1))
+        for c, p in zip(front.cost, front.ppm):
+            self.assertFalse(dominated(c, p, cost, ppm))
+        self.assertTrue(np.all(np.diff(front.cost) > 0))
+        self.assertTrue(np.all(np.diff(front.ppm) < 0))
+
+        choice = front.cheapest(1000)
+        self.assertEqual(sorted(choice), [0, 1, 2, 3])
+        with self.assertRaises(ValueError):
+            front.cheapest(-1)
+
+    def test_evolve(self):
+        exp = explorer(stack())
+        grid = exp.grid(levels=8)
+        front = exp.evolve(population=2048, generations=20, seed=1)
+        # the continuous search matches the candidates of the coarse grid (up to the spacing of the front)
+        for c, p in zip(grid.cost, grid.ppm):
+            if p > 1:
+                self.assertTrue(((front.cost <= c * 1.01) & (front.ppm <= p * 1.05)).any())
+
+    def test_dozens_of_contributors(self):
+        # see benchmarks/bench_pareto.py for the full population
+        exp = explorer(stack(40), limit=0.3)
+        front = exp.evolve(population=512, generations=10, seed=0)
+        self.assertGreater(len(front.tolerances), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+
+import numpy as np
+
+import dimstack as ds
+
+
+def stack(n):
+    return ds.dim.Stack(
+        name="long",
+        dims=[
+            ds.dim.Basic(nom=(-1) ** i * (1 + i % 3), tol=ds.tol.Bilateral.unequal(0.02, -0.01), name=f"{i}")
+            for i in range(n)
+        ],
+    )
+
+
+class Batched(unittest.TestCase):
+    def test_trace_count(self):
+        plot = ds.plot.StackPlot().add_stack(stack(1000))
+        self.assertEqual(len(plot.fig.data), 3)
+        self.assertEqual(plot.fig.data[0].type, "scatter")
+
+        plot = ds.plot.StackPlot().add_stack(stack(2000))
+        self.assertEqual(plot.fig.data[0].type, "scattergl")
+
+    def test_matches_per_dimension_traces(self):
+        s = stack(10)
+        single = ds.plot.StackPlot().add_stack(s, batch=False)
+        batched = ds.plot.StackPlot().add_stack(s, batch=True)
+
+        self.assertAlmostEqual(batched.start_pos, single.start_pos)
+        ends = [trace.x[1] for trace in single.fig.data[0::3]]
+        np.testing.assert_allclose(batched.fig.data[1].x, ends)
+        lower = [trace.x[1] for trace in single.fig.data[1::3]]
+        upper = [trace.x[1] for trace in single.fig.data[2::3]]
+        np.testing.assert_allclose(batched.fig.data[2].x[0::3].astype(float), lower)
+        np.testing.assert_allclose(batched.fig.data[2].x[1::3].astype(float), upper)
+
+    def test_reviewed_stack(self):
+        s = ds.dim.ReviewedStack(name="reviewed", dims=[dim.review() for dim in stack(200).dims])
+        plot = ds.plot.StackPlot().add_reviewed_stack(s)
+        self.assertEqual(len(plot.fig.data), 4)
+        self.assertEqual(len(plot.fig.to_html(include_plotlyjs=False)) < 2_000_000, True)
+
+    def test_reviewed_stack_data(self):
+        rng = np.random.default_rng(0)
+        dims = [dim.review() for dim in stack(200).dims]
+        for rdim in dims[:3]:
+            rdim.distribution = ds.dist.Normal.fit(rng.normal(rdim.dim.abs_nominal, 0.005, 1000))
+        s = ds.dim.ReviewedStack(name="reviewed", dims=dims)
+        batched = ds.plot.StackPlot().add_reviewed_stack(s)
+        single = ds.plot.StackPlot().add_reviewed_stack(s, batch=False)
+        histograms = [trace for trace in batched.fig.data if trace.name.endswith(" Data")]
+        self.assertEqual(len(histograms), 3)
+        expected = [trace for trace in single.fig.data if trace.name.endswith(" Data")]
+        for histogram, reference in zip(histograms, expected):
+            self.assertEqual(histogram.name, reference.name)
+            self.assertEqual(histogram.legendgroup, batched.fig.data[0].legendgroup)
+            np.testing.assert_allclose(histogram.x, reference.x)
+
+
+class AdaptiveGrid(unittest.TestCase):
+    def test_point_budget(self):
+        plot = ds.plot.StackPlot().add_distribution(ds.dist.Normal(100, 10), "wide", None, 0, 200, start_pos=0)
+        self.assertLessEqual(len(plot.fig.data[0].x), ds.plot.StackPlot.PDF_POINTS)
+
+        plot = ds.plot.StackPlot().add_distribution(ds.dist.Normal(1, 0.002), "narrow", None, 0.99, 1.01, start_pos=0)
+        self.assertGreater(len(plot.fig.data[0].x), 100)
+
+    def test_accuracy(self):
+        for distribution, start, stop in [
+            (ds.dist.Normal(0, 1), -6, 6),
+            (ds.dist.Uniform(0, 1), -0.5, 1.5),
+            (ds.dist.NormalScreened(0, 1, -1, 2), -3, 3),
+        ]:
+            x, pdf = ds.plot.pdf_grid(distribution, start, stop, 200)
+            dense = np.linspace(start, stop, 100000)
+            error = np.abs(np.interp(dense, x, pdf) - distribution.pdf(dense)).max()
+            self.assertLess(error, 1e-3 * distribution.pdf(dense).max())
+
+    def test_limits_included(self):
+        x, _ = ds.plot.pdf_grid(ds.dist.Normal(0, 1), -5, 5, 200, limits=(-1.2345, 2.5))
+        self.assertIn(-1.2345, x)
+        self.assertIn(2.5, x)
+
+    def test_shared_grid(self):
+        first = ds.plot.pdf_grid(ds.dist.Normal(3, 0.1), 2.5, 3.5)
+        second = ds.plot.pdf_grid(ds.dist.Normal(3, 0.1), 2.5, 3.5)
+        self.assertIs(first, second)
+
+
+class Histograms(unittest.TestCase):
+    def test_streaming_counts(self):
+        rng = np.random.default_rng(0)
+        data = rng.normal(size=100000)
+        histogram = ds.stats.Histogram.from_range(-3, 3, 60)
+        for block in np.split(data, 10):
+            histogram.add(block)
+
+        np.testing.assert_array_equal(histogram.counts, np.histogram(data, bins=histogram.edges)[0])
+        self.assertEqual(histogram.n, len(data))
+        self.assertAlmostEqual(
+            (histogram.density * histogram.widths).sum() + (histogram.underflow + histogram.overflow) / histogram.n, 1
+        )
+
+    def test_fitted_data_is_binned(self):
+        sizes = []
+        for n in [1000, 1000000]:
+            data = np.random.default_rng(1).normal(1, 0.01, n)
+            rdim = ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.03), name="a").review(ds.dist.Normal.fit(data))
+            plot = ds.plot.StackPlot().add(rdim)
+            bars = [trace for trace in plot.fig.data if trace.type == "bar"]
+            self.assertEqual(len(bars), 1)
+            self.assertAlmostEqual(sum(bars[0].y), 1)
+            sizes.append(len(plot.fig.to_html(include_plotlyjs=False)))
+        self.assertLess(sizes[1], 2 * sizes[0])
+
+    def test_simulation_overlay(self):
+        stack = ds.dim.ReviewedStack(
+            name="s",
+            dims=[ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.1), name=f"{i}").review() for i in range(3)],
+        )
+        simulated = ds.calc.MonteCarlo(stack, n=200000, seed=0)
+        plot = ds.plot.StackPlot().add_simulation(simulated, ds.calc.SixSigma(stack), bins=50)
+
+        self.assertEqual([trace.type for trace in plot.fig.data], ["bar", "scatter"])
+        self.assertEqual(len(plot.fig.data[0].x), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
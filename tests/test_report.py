@@ -0,0 +1,92 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import dimstack as ds
+
+
+def stacks():
+    basic = ds.dim.Stack(
+        name="gap",
+        dims=[
+            ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.1), name="housing"),
+            ds.dim.Basic(nom=-9.5, tol=ds.tol.Bilateral.symmetric(0.05), name="shaft"),
+        ],
+    )
+    reviewed = ds.dim.ReviewedStack(
+        name="gap reviewed",
+        dims=[
+            ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.1), name="housing").review().assume_normal_dist(3),
+            ds.dim.Basic(nom=-9.5, tol=ds.tol.Bilateral.symmetric(0.05), name="shaft").review().assume_normal_dist(3),
+        ],
+    )
+    return basic, reviewed
+
+
+class Bundle(unittest.TestCase):
+    def test_pages_and_index(self):
+        basic, reviewed = stacks()
+        calls = []
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = ds.report.generate(
+                [basic, (reviewed, 0.2, 0.8)], tmp, processes=0, progress=lambda *args: calls.append(args)
+            )
+            self.assertEqual(sorted(page.name for page in pages), ["gap-reviewed.html", "gap.html"])
+            self.assertEqual([call[:2] for call in calls], [(1, 2), (2, 2)])
+
+            index = (Path(tmp) / "index.html").read_text(encoding="utf-8")
+            self.assertIn('href="gap.html"', index)
+            self.assertIn('href="gap-reviewed.html"', index)
+            self.assertTrue((Path(tmp) / ds.report.PLOTLYJS).exists())
+
+            page = (Path(tmp) / "gap-reviewed.html").read_text(encoding="utf-8")
+            self.assertIn("REQUIREMENT: gap reviewed", page)
+            self.assertIn(f'src="{ds.report.PLOTLYJS}"', page)
+
+    def test_large_stack_is_not_paginated(self):
+        dims = [ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.01), name=f"d{i}") for i in range(700)]
+        with tempfile.TemporaryDirectory() as tmp:
+            ds.report.generate([ds.dim.Stack(name="long", dims=dims)], tmp, processes=0)
+            page = (Path(tmp) / "long.html").read_text(encoding="utf-8")
+            self.assertIn(">d699<", page)
+            self.assertNotIn("rows 1-", page)
+
+    def test_names_are_escaped(self):
+        basic, _ = stacks()
+        basic.name = "gap <b>"
+        basic.description = "<script>alert(1)</script>"
+        with tempfile.TemporaryDirectory() as tmp:
+            (page,) = ds.report.generate([basic], tmp, processes=0)
+            html = page.read_text(encoding="utf-8")
+            self.assertIn("<h1>gap &lt;b&gt;</h1>", html)
+            self.assertIn("&lt;script&gt;alert(1)&lt;/script&gt;", html)
+            # the tables and the figure are not escaped
+            self.assertIn("<table", html)
+            self.assertIn(f'src="{ds.report.PLOTLYJS}"', html)
+            index = (Path(tmp) / "index.html").read_text(encoding="utf-8")
+            self.assertIn(">gap &lt;b&gt;</a>", index)
+
+    def test_unchanged_stacks_are_skipped(self):
+        basic, reviewed = stacks()
+        with tempfile.TemporaryDirectory() as tmp:
+            ds.report.generate([basic, reviewed], tmp, processes=0)
+            self.assertEqual(ds.report.generate([basic, reviewed], tmp, processes=0), [])
+
+            basic.dims[0].tolerance = ds.tol.Bilateral.symmetric(0.2)
+            pages = ds.report.generate([basic, reviewed], tmp, processes=0)
+            self.assertEqual([page.name for page in pages], ["gap.html"])
+
+            manifest = json.loads((Path(tmp) / ds.report.MANIFEST).read_text(encoding="utf-8"))
+            self.assertEqual(set(manifest), {"gap", "gap-reviewed"})
+
+    def test_process_pool(self):
+        basic, reviewed = stacks()
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = ds.report.generate([basic, reviewed], tmp, processes=2)
+            self.assertEqual(len(pages), 2)
+            self.assertTrue(all(page.exists() for page in pages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import itertools
+import unittest
+
+import numpy as np
+
+import dimstack as ds
+
+TOLS = [ds.tol.Bilateral.symmetric(t) for t in (0.05, 0.1, 0.2)]
+NOMINALS = [-4.8, -4.9]
+
+
+def stack():
+    d1 = ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.1), name="housing")
+    d2 = ds.dim.Basic(nom=-5, tol=ds.tol.Bilateral.unequal(0.05, -0.02), name="shaft")
+    d3 = ds.dim.Basic(nom=-4.9, tol=ds.tol.Bilateral.symmetric(0.04), a=0.5, name="spacer")
+    return ds.dim.ReviewedStack(
+        name="gap",
+        dims=[ds.dim.Reviewed(d1), ds.dim.Reviewed(d2), ds.dim.Reviewed(d3, ds.dist.Uniform(-5.0, -4.8))],
+    )
+
+
+def variant(base, tol, nom, spacer):
+    _, d2, d3 = [rdim.dim for rdim in base.dims]
+    # the housing and shaft distributions are assumed again, like those of the base stack
+    dims = [
+        ds.dim.Reviewed(ds.dim.Basic(nom=10, tol=tol, name="housing")),
+        ds.dim.Reviewed(ds.dim.Basic(nom=nom, tol=d2.tolerance, name="shaft")),
+        ds.dim.Reviewed(d3, spacer),
+    ]
+    return ds.dim.ReviewedStack(name="gap", dims=dims)
+
+
+class Broadcast(unittest.TestCase):
+    def setUp(self):
+        self.stack = stack()
+        self.spacers = {"uniform": self.stack.dims[2].distribution, "normal": ds.dist.Normal(-4.9, 0.01)}
+        d1, _, d3 = [rdim.dim for rdim in self.stack.dims]
+        self.scenarios = (
+            ds.scenario.Scenarios(self.stack)
+            .vary("housing", d1, TOLS)
+            .vary("shaft", self.stack.dims[1], NOMINALS, field="nominal")
+            .vary("spacer", d3, self.spacers, field="distribution")
+        )
+
+    def test_grid(self):
+        self.assertEqual(self.scenarios.size, 12)
+        grid = self.scenarios.grid
+        self.assertEqual(list(grid.columns), ["housing", "shaft", "spacer"])
+        self.assertEqual(list(grid.iloc[1]), [str(TOLS[0]), str(NOMINALS[0]), "normal"])
+
+    def test_closed_form(self):
+        results = self.scenarios.evaluate(LL=0.05, UL=0.35)
+        self.assertEqual(len(results), 12 * 5)
+        combos = itertools.product(TOLS, NOMINALS, self.spacers.values())
+        for i, (tol, nom, spacer) in enumerate(combos):
+            expected = variant(self.stack, tol, nom, spacer)
+            rows = results[results["Scenario"] == i].set_index("Method")
+            for method in ["Closed", "WC", "RSS", "MRSS", "SixSigma"]:
+                dim = getattr(ds.calc, method)(expected)
+                dim = getattr(dim, "dim", dim)
+                self.assertAlmostEqual(rows.loc[method, "Nominal"], dim.dir * dim.nominal, places=12)
+                self.assertAlmostEqual(rows.loc[method, "Lower"], dim.abs_lower, places=12)
+                self.assertAlmostEqual(rows.loc[method, "Upper"], dim.abs_upper, places=12)
+            six_sigma = ds.calc.SixSigma(expected)
+            self.assertAlmostEqual(rows.loc["SixSigma", "σ"], six_sigma.distribution.std_dev, places=12)
+
+    def test_monte_carlo(self):
+        results = self.scenarios.evaluate(methods=[], n=20000, seed=1, LL=0.05, UL=0.35)
+        combos = itertools.product(TOLS, NOMINALS, self.spacers.values())
+        for i, (tol, nom, spacer) in enumerate(combos):
+            expected = ds.calc.MonteCarlo(variant(self.stack, tol, nom, spacer), n=20000, seed=2)
+            row = results[results["Scenario"] == i].iloc[0]
+            self.assertAlmostEqual(row["Nominal"], expected.distribution.mean, delta=0.002)
+            self.assertAlmostEqual(row["σ"], expected.distribution.std_dev, delta=0.002)
+
+    def test_common_random_numbers(self):
+        # the shaft nominal moves every simulated closure by the same amount
+        results = self.scenarios.evaluate(methods=[], n=1000, seed=1)
+        first = results[results["shaft"] == str(NOMINALS[0])]
+        last = results[results["shaft"] == str(NOMINALS[1])]
+        np.testing.assert_allclose(first["Nominal"].to_numpy() - last["Nominal"].to_numpy(), 0.1)
+        np.testing.assert_allclose(first["σ"].to_numpy(), last["σ"].to_numpy())
+
+    def test_distributions_follow_levels(self):
+        results = self.scenarios.evaluate(methods=["WC"], n=100000, seed=1).set_index(["Scenario", "Method"])
+        for i in range(self.scenarios.size):
+            # the distributions are centered in the tolerances, like the WC nominal
+            wc, monte_carlo = results.loc[(i, "WC")], results.loc[(i, "MonteCarlo")]
+            self.assertAlmostEqual(wc["Nominal"], monte_carlo["Nominal"], delta=0.001)
+        # a wider housing tolerance widens the simulated closure
+        sigma = results.xs("MonteCarlo", level="Method").groupby("housing")["σ"].mean()
+        self.assertLess(sigma[str(TOLS[0])], sigma[str(TOLS[-1])])
+
+    def test_rescale_unknown_distribution(self):
+        with self.assertRaises(ValueError):
+            self.scenarios.vary("spacer tol", self.stack.dims[2], TOLS)
+        # unless the level gives the distribution
+        levels = [{"tolerance": t, "distribution": ds.dist.Normal(-4.9, t.upper / 3)} for t in TOLS]
+        self.scenarios.vary("spacer tol", self.stack.dims[2], levels)
+
+    def test_gdt_six_sigma(self):
+        def gdt(nominal):
+            hole = ds.dim.Basic(nom=-20, tol=ds.tol.Position(0.1, "MMC", 0.04), name="hole").review()
+            face = ds.dim.Basic(nom=nominal, tol=ds.tol.Flatness(0.02), name="face").review()
+            return ds.dim.ReviewedStack(name="gdt", dims=[hole, face])
+
+        base = gdt(20.2)
+        scenarios = ds.scenario.Scenarios(base).vary("face", base.dims[1], [20.2, 20.3], field="nominal")
+        results = scenarios.evaluate(methods=["SixSigma"]).set_index("Scenario")
+        for i, nominal in enumerate([20.2, 20.3]):
+            expected = ds.calc.SixSigma(gdt(nominal))
+            self.assertAlmostEqual(results.loc[i, "Nominal"], expected.dim.abs_nominal, places=12)
+            self.assertAlmostEqual(results.loc[i, "σ"], expected.distribution.std_dev, places=12)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.scenarios.vary("other", ds.dim.Basic(nom=1, tol=TOLS[0]), TOLS)
+        with self.assertRaises(ValueError):
+            self.scenarios.vary("housing", self.stack.dims[1], TOLS[:2])
+        with self.assertRaises(ValueError):
+            self.scenarios.vary("finish", self.stack.dims[1], [{"color": "red"}])
+
+
+class Scale(unittest.TestCase):
+    def test_many_scenarios(self):
+        # see benchmarks/bench_scenario.py for ten thousand scenarios
+        base = stack()
+        scenarios = ds.scenario.Scenarios(base)
+        tols = [ds.tol.Bilateral.symmetric(t) for t in np.linspace(0.01, 0.2, 6)]
+        for i, rdim in enumerate(base.dims[:2]):
+            scenarios.vary(f"tol {i}", rdim, tols)
+        # the uniform spacer is not rescaled with its tolerance
+        spacers = {
+            str(t): {"tolerance": t, "distribution": ds.dist.Uniform(-4.9 - t.upper, -4.9 + t.upper)} for t in tols
+        }
+        scenarios.vary("tol 2", base.dims[2], spacers)
+        self.assertEqual(scenarios.size, 6**3)
+        results = scenarios.evaluate(LL=0.05, UL=0.35)
+        self.assertEqual(len(results), scenarios.size * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+import dimstack as ds
+
+
+def spindle():
+    bore = ds.dim.Reviewed(ds.dim.Basic(nom=10, tol=ds.tol.Bilateral.symmetric(0.03), name="bore"))
+    shaft = ds.dim.Reviewed(ds.dim.Basic(nom=-9.98, tol=ds.tol.Bilateral.symmetric(0.03), name="shaft"))
+    spacer = ds.dim.Reviewed(ds.dim.Basic(nom=1, tol=ds.tol.Bilateral.symmetric(0.003), name="spacer"))
+    for rdim in (bore, shaft, spacer):
+        rdim.assume_normal_dist(3)
+    return ds.dim.ReviewedStack(name="spindle", dims=[bore, shaft, spacer]), bore, shaft
+
+
+class Binning(unittest.TestCase):
+    def test_inventory(self):
+        stack, bore, shaft = spindle()
+        result = ds.selective.assemble(stack, [bore, shaft], LL=1.0, UL=1.04, bins=4, n=200000, seed=0)
+        # every part is assembled, left over or scrapped
+        for i in range(2):
+            self.assertEqual(result.assemblies + result.leftovers[i].sum() + result.scrap[i], 200000)
+        # a bin is mated until one of the parts runs out
+        self.assertTrue((result.leftovers.min(axis=0) == 0).all())
+        self.assertEqual(np.bincount(result.bins).sum(), result.assemblies)
+        self.assertEqual(len(result.dict), 4 + 2)
+
+    def test_complementary(self):
+        stack, bore, shaft = spindle()
+        kwargs = {"LL": 1.0, "UL": 1.04, "bins": 4, "n": 200000, "seed": 0}
+        complementary = ds.selective.assemble(stack, [bore, shaft], **kwargs)
+        same = ds.selective.assemble(stack, [bore, shaft], rule="same", **kwargs)
+        random_std = np.sqrt(2 * 0.01**2 + 0.001**2)
+        # each bin of width 0.015 leaves about a bin's spread in the closure
+        self.assertLess(complementary.closures.std(), random_std / 2)
+        self.assertGreater(same.closures.std(), random_std)
+        self.assertGreater(complementary.yield_probability, complementary.random_yield_probability)
+        self.assertAlmostEqual(complementary.closures.mean(), 1.02, delta=0.001)
+
+    def test_equal_count(self):
+        stack, bore, shaft = spindle()
+        shaft.distribution = ds.dist.Normal(-9.985, 0.008)
+        width = ds.selective.assemble(stack, [bore, shaft], LL=1.0, UL=1.04, bins=5, n=100000, seed=1)
+        count = ds.selective.assemble(stack, [bore, shaft], LL=1.0, UL=1.04, bins=5, n=100000, edges="count", seed=1)
+        self.assertLess(count.leftovers.sum(), width.leftovers.sum())
+
+    def test_gauge(self):
+        stack, bore, shaft = spindle()
+        kwargs = {"LL": 1.0, "UL": 1.04, "bins": 6, "n": 100000, "seed": 2}
+        exact = ds.selective.assemble(stack, [bore, shaft], **kwargs)
+        noisy = ds.selective.assemble(stack, [bore, shaft], gauge=0.005, **kwargs)
+        self.assertGreater(noisy.closures.std(), exact.closures.std())
+
+    def test_matched_parts(self):
+        # see benchmarks/bench_selective.py for ten million parts
+        stack, bore, shaft = spindle()
+        result = ds.selective.assemble(stack, [bore, shaft], LL=1.0, UL=1.04, bins=4, n=10**5, seed=0)
+        self.assertGreater(result.assemblies, 0.99 * 10**5)
+
+
+if __name__ == "__main__":
+    unittest.main()
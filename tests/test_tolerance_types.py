@@ -1,5 +1,8 @@
+import pickle
 import unittest
 
+import numpy as np
+
 import dimstack
 
 
@@ -27,6 +30,17 @@ class FlippedBilateral(unittest.TestCase):
         self.assertEqual(str(t), "± 0.005")
 
 
+class InternedBilateral(unittest.TestCase):
+    def test_InternedBilateral(self):
+        t = dimstack.tolerance.Bilateral.symmetric(0.005)
+        self.assertIs(dimstack.tolerance.Bilateral.unequal(upper=-0.005, lower=0.005), t)
+        self.assertIsNot(dimstack.tolerance.Bilateral.symmetric(5), dimstack.tolerance.Bilateral.symmetric(5.0))
+        self.assertEqual(str(dimstack.tolerance.Bilateral.symmetric(5)), "± 5")
+        with self.assertRaises(AttributeError):
+            t._upper = 1
+        self.assertFalse(hasattr(t, "__dict__"))
+
+
 class AbsRelPosNeg(unittest.TestCase):
     def test_Positive_Abs(self):
         d = dimstack.dim.Basic(
@@ -75,5 +89,77 @@ class AbsRelPosNeg(unittest.TestCase):
         self.assertAlmostEqual(d.rel_lower, 0.3)
 
 
+class GDT(unittest.TestCase):
+    def test_interned(self):
+        t = dimstack.tol.Position(0.1, modifier="MMC", bonus=0.04)
+        self.assertIs(dimstack.tol.Position(0.1, modifier="MMC", bonus=0.04), t)
+        self.assertIsNot(dimstack.tol.Position(0.1, modifier="LMC", bonus=0.04), t)
+        self.assertIsNot(dimstack.tol.Bilateral.symmetric(0.07), dimstack.tol.Position(0.14))
+        self.assertIs(pickle.loads(pickle.dumps(t)), t)
+        self.assertIs(pickle.loads(pickle.dumps(dimstack.tol.Flatness(0.02))), dimstack.tol.Flatness(0.02))
+        with self.assertRaises(AttributeError):
+            t._bonus = 1
+        self.assertFalse(hasattr(t, "__dict__"))
+        with self.assertRaises(ValueError):
+            dimstack.tol.Position(0.1, bonus=0.04)
+        with self.assertRaises(ValueError):
+            dimstack.tol.Position(0.1, modifier="RFS")
+
+    def test_worst_case_equivalents(self):
+        tolerances = {
+            dimstack.tol.Position(0.1, modifier="MMC", bonus=0.04): (0.07, -0.07),
+            dimstack.tol.Runout(0.05): (0.025, -0.025),
+            dimstack.tol.Profile(0.2, offset=-0.05): (0.05, -0.15),
+            dimstack.tol.Flatness(0.02): (0.02, 0),
+        }
+        for t, (upper, lower) in tolerances.items():
+            self.assertAlmostEqual(t.upper, upper)
+            self.assertAlmostEqual(t.lower, lower)
+        dims = [dimstack.dim.Basic(nom=10 - 3 * i, tol=t, name=str(t)) for i, t in enumerate(tolerances)]
+        wc = dimstack.calc.WC(dimstack.dim.Stack(dims=dims))
+        self.assertAlmostEqual(wc.tolerance.T / 2, 0.07 + 0.025 + 0.1 + 0.01)
+
+    def test_statistical_models(self):
+        position = dimstack.dim.Basic(nom=-20, tol=dimstack.tol.Position(0.1, "MMC", 0.04), name="hole").review()
+        self.assertIsInstance(position.distribution, dimstack.dist.Radial)
+        flatness = dimstack.dim.Basic(nom=-5, tol=dimstack.tol.Flatness(0.02), name="face").review()
+        self.assertIsInstance(flatness.distribution, dimstack.dist.HalfNormal)
+        # the face is seated on its high points: the error is into the material, up to the zone
+        x = flatness.sample(10000, random_state=0)
+        self.assertTrue(np.all((x <= -5) & (x >= -5.02)))
+        self.assertGreater(np.mean(x > -5.005), 0.5)
+        # with a 3σ target, as many parts are within the zone (without bonus) as within ± 3σ
+        position = dimstack.dim.Reviewed(position.dim).assume_tolerance_dist(3)
+        x, y = position.distribution.std_dev * np.random.default_rng(0).standard_normal((2, 10**6))
+        self.assertAlmostEqual(np.mean(np.hypot(x, y) <= 0.05), 0.9973, delta=0.0005)
+        self.assertAlmostEqual(position.yield_probability, 1)
+        # Bilateral tolerances keep the normal assumption
+        plain = dimstack.dim.Basic(nom=1, tol=dimstack.tol.Bilateral.symmetric(0.1), name="plain").review()
+        self.assertIsInstance(plain.distribution, dimstack.dist.Normal)
+
+    def test_six_sigma(self):
+        runout = dimstack.dim.Basic(nom=30, tol=dimstack.tol.Runout(0.06), name="runout").review()
+        runout.assume_tolerance_dist(3)
+        profile = dimstack.dim.Basic(nom=-29, tol=dimstack.tol.Profile(0.1), name="profile").review()
+        profile.assume_tolerance_dist(3)
+        stack = dimstack.dim.ReviewedStack(dims=[runout, profile])
+        result = dimstack.calc.SixSigma(stack)
+        simulated = dimstack.calc.MonteCarlo(stack, n=10**6, seed=0)
+        self.assertAlmostEqual(result.distribution.mean, 1)
+        self.assertAlmostEqual(result.distribution.std_dev / simulated.distribution.std_dev, 1, delta=0.01)
+
+    def test_block_sampling(self):
+        def stack(tol):
+            return [dimstack.dim.Basic(nom=10, tol=tol, name=str(i)).review() for i in range(50)]
+
+        # see benchmarks/bench_tolerance.py for the time taken
+        rng = np.random.default_rng(0)
+        bilateral = dimstack.model.sample_block(stack(dimstack.tol.Bilateral.symmetric(0.05)), 10**5, rng)
+        rdims = stack(dimstack.tol.Position(0.1, "MMC", 0.02))
+        block = dimstack.model.sample_block(rdims, 10**5, rng)
+        self.assertEqual(block.shape, bilateral.shape)
+        self.assertAlmostEqual(block.var(axis=1).mean() / rdims[0].distribution.moments()[1], 1, delta=0.01)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+from scipy.spatial.transform import Rotation as R
+
+import dimstack as ds
+
+
+def normal(nom, tol, name):
+    return ds.dim.Basic(nom=nom, tol=ds.tol.Bilateral.symmetric(tol), name=name).review().assume_normal_dist(3)
+
+
+def spatial(links=30, seed=0):
+    rng = np.random.default_rng(seed)
+    chain = []
+    for i in range(links):
+        if i % 2:
+            axis = rng.normal(size=3) if i % 3 else np.eye(3)[rng.integers(3)] * rng.choice([-1, 1])
+            chain.append(ds.vector.Rotation(normal(rng.uniform(-1, 1), 0.003, f"θ{i}"), axis=axis))
+        else:
+            chain.append(ds.vector.Translation(normal(rng.uniform(5, 20), 0.05, f"L{i}"), axis=rng.normal(size=3)))
+    return ds.vector.Loop(chain, measure=(0, 0, 1), name="spatial")
+
+
+def reference(loop, values):
+    # the same loop, one trial at a time with homogeneous transforms
+    closures = []
+    for trial in values.T:
+        transform = np.eye(4)
+        for link, column in zip(loop.links, loop._columns):
+            step = np.eye(4)
+            if isinstance(link, ds.vector.Translation):
+                step[:3, 3] = trial[column] * link.axis
+            elif isinstance(link, ds.vector.Rotation):
+                step[:3, :3] = R.from_rotvec(link.scale * trial[column] * link.axis).as_matrix()
+            else:
+                step = link.matrix
+            transform = transform @ step
+        closures.append(loop.measure @ transform[:3, 3])
+    return np.array(closures)
+
+
+class Loops(unittest.TestCase):
+    def test_planar_vectors(self):
+        # the end of two vectors: x = a·cos(α) + b·cos(α + β)
+        a, alpha = normal(50, 0.1, "a"), normal(30, 0.2, "alpha")
+        b, beta = normal(80, 0.1, "b"), normal(-45, 0.2, "beta")
+        loop = ds.vector.Loop([ds.vector.vector(a, alpha, True), ds.vector.vector(b, beta, True)], measure=(1, 0))
+        self.assertEqual([rdim.dim.name for rdim in loop.dims], ["alpha", "a", "beta", "b"])
+        values = np.array([[30.0, 30.5], [50.0, 49.9], [-45.0, -44.0], [80.0, 80.1]])
+        r = np.radians
+        expected = values[1] * np.cos(r(values[0])) + values[3] * np.cos(r(values[0] + values[2]))
+        np.testing.assert_allclose(loop.closure(values), expected)
+
+    def test_spatial_matches_transforms(self):
+        loop = spatial(12)
+        fixed = np.eye(4)
+        fixed[:3, :3] = R.from_euler("xyz", [10, 20, 30], degrees=True).as_matrix()
+        fixed[:3, 3] = [1, 2, 3]
+        loop = ds.vector.Loop(loop.links[:6] + [ds.vector.Fixed(fixed)] + loop.links[6:], measure=(0.6, 0, 0.8))
+        values = loop.means[:, None] + np.random.default_rng(0).normal(0, 0.1, (len(loop.dims), 50))
+        np.testing.assert_allclose(loop.closure(values), reference(loop, values), atol=1e-9)
+
+    def test_jacobian(self):
+        loop = spatial(12)
+        values = loop.means[:, None] + np.random.default_rng(1).normal(0, 0.1, (len(loop.dims), 5))
+        jacobian = loop.jacobian(values)
+        step = 1e-6
+        for j in range(len(loop.dims)):
+            up, down = values.copy(), values.copy()
+            up[j] += step
+            down[j] -= step
+            np.testing.assert_allclose(
+                jacobian[:, j], (loop.closure(up) - loop.closure(down)) / (2 * step), rtol=1e-5, atol=1e-6
+            )
+
+    def test_shared_contributor(self):
+        length = normal(10, 0.1, "length")
+        loop = ds.vector.Loop([ds.vector.Translation(length), ds.vector.Translation(length)], measure=(1, 0, 0))
+        self.assertEqual(len(loop.dims), 1)
+        self.assertAlmostEqual(loop.jacobian()[0], 2)
+        self.assertAlmostEqual(ds.vector.RSS(loop).tolerance.T / 2, 0.2)
+
+    def test_analyses(self):
+        loop = spatial(10)
+        six_sigma = ds.vector.SixSigma(loop)
+        monte_carlo = ds.vector.MonteCarlo(loop, n=200000, seed=0)
+        self.assertAlmostEqual(six_sigma.distribution.mean, monte_carlo.distribution.mean, delta=0.01)
+        self.assertAlmostEqual(six_sigma.distribution.std_dev / monte_carlo.distribution.std_dev, 1, delta=0.02)
+        wc, rss = ds.vector.WC(loop), ds.vector.RSS(loop)
+        self.assertGreater(wc.tolerance.T, rss.tolerance.T)
+        self.assertAlmostEqual(wc.nominal, rss.nominal)
+        self.assertEqual(len(loop.dict), len(loop.dims))
+
+    def test_sample(self):
+        # see benchmarks/bench_vector.py for a million trials
+        loop = spatial(30)
+        closures = loop.sample(10**4, seed=0)
+        self.assertEqual(closures.shape, (10**4,))
+        np.testing.assert_array_equal(closures, loop.sample(10**4, seed=0))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ds.vector.Loop([ds.vector.Fixed(np.eye(4))], measure=(1, 0))
+        with self.assertRaises(ValueError):
+            ds.vector.Loop([], measure=(1, 0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()